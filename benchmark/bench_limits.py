@@ -0,0 +1,95 @@
+""" Benchmark of the pass / fail evaluation of the Voltage / Current Accuracy data.
+
+    Compares the vectorized datatoGraph.evaluateLimits against the former per point loop over
+    condition.iloc[i], on synthetic sweeps growing up to 10^6 points. The former loop is only run up
+    to 10^5 points since it takes minutes beyond that.
+
+    Run from the root of the repository:
+        python benchmark/bench_limits.py
+
+"""
+
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data import datatoGraph
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+LOOP_LIMIT = 10**5
+POINTS_PER_KEY = 100
+GAIN, OFFSET = 0.0005, 0.001
+
+
+def sweep(points):
+    """Synthetic data.csv frame with POINTS_PER_KEY voltage steps for every current key"""
+    rng = np.random.default_rng(0)
+    key = np.arange(points) // POINTS_PER_KEY
+    Vset = np.tile(np.linspace(1, 30, POINTS_PER_KEY), points // POINTS_PER_KEY + 1)[:points]
+    error = rng.normal(0, 0.15, points)
+    return pd.DataFrame({"key": key, "Voltage Set (PS)": Vset, "Volt Meas_Err(%)": error})
+
+
+def loop(frame):
+    """Former evaluation, grouping by key and building the condition list point by point"""
+    grouped_df = frame.groupby("key")
+    conditionC = pd.Series(dtype=object)
+    upperC = pd.Series(dtype=float)
+
+    for x in grouped_df.groups:
+        group = grouped_df.get_group(x)
+        VsetS = group["Voltage Set (PS)"]
+        errorS = group["Volt Meas_Err(%)"]
+        upper = (GAIN * VsetS + OFFSET) * 100
+        condition1 = upper < errorS
+        condition2 = -upper > errorS
+
+        boolList = []
+        for i in range(condition1.count()):
+            if condition1.iloc[i] | condition2.iloc[i]:
+                boolList.append("FAIL")
+            else:
+                boolList.append("PASS")
+
+        upperC = pd.concat([upperC, upper])
+        conditionC = pd.concat([conditionC, pd.Series(boolList)])
+
+    return upperC.to_numpy(), conditionC.to_numpy()
+
+
+def vectorized(frame):
+    upper, condition = datatoGraph.evaluateLimits(
+        frame["Voltage Set (PS)"], frame["Volt Meas_Err(%)"], GAIN, OFFSET
+    )
+    groups = frame.groupby("key", sort=True).indices
+    return upper, condition, groups
+
+
+def timeit(function, frame, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function(frame)
+        best = min(best, perf_counter() - start)
+
+    return best, result
+
+
+if __name__ == "__main__":
+    print(f"{'points':>10} {'loop (s)':>12} {'vectorized (s)':>16} {'speedup':>10}")
+
+    for points in SIZES:
+        frame = sweep(points)
+        t_vec, (upper, condition, _) = timeit(vectorized, frame)
+
+        if points <= LOOP_LIMIT:
+            t_loop, (upper_loop, condition_loop) = timeit(loop, frame, repeat=1)
+            assert np.allclose(upper, upper_loop) and (condition == condition_loop).all()
+            print(f"{points:>10} {t_loop:>12.4f} {t_vec:>16.4f} {t_loop / t_vec:>9.0f}x")
+        else:
+            print(f"{points:>10} {'-':>12} {t_vec:>16.4f} {'-':>10}")
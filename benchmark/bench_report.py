@@ -0,0 +1,125 @@
+""" Benchmark of the generation of the Voltage / Current Accuracy Excel report.
+
+    Compares the streaming xlreport against the former writer, which went through pd.ExcelWriter,
+    aligned rows 8 to 200 of columns 4 to 200 cell by cell and set column widths letter by letter.
+    Both write the same synthetic report in a temporary folder.
+
+    Run from the root of the repository:
+        python benchmark/bench_report.py
+
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from matplotlib import pyplot as plt
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.xlreport import xlreport
+
+SIZES = [10, 100, 1000, 10000, 50000]
+
+
+def report(points):
+    """Synthetic error, Instrument Data and config DataFrames of a run with the given number of points"""
+    rng = np.random.default_rng(0)
+    columns = [
+        "Voltage Set (PS)", "Current Set (EL)", "Current set (PS)", "Mode", "Voltage Rdbk",
+        "Current Rdbk", "Voltage Meas", "Current Meas", "Volt Rdbk_Err", "Volt Rdbk_Err(%)",
+        "Curr Rdbk_Err", "Curr Rdbk_Err(%)", "Volt Meas_Err", "Volt Meas_Err(%)", "Curr Meas_Err",
+        "Curr Meas_Err(%)", "+-V_EboundMeas", "Measure", "+-V_EboundRdbk", "Readback",
+    ]
+    error = pd.DataFrame(rng.normal(size=(points, len(columns))), columns=columns)
+    error["Mode"] = "Voltage"
+    error["Measure"] = np.where(rng.random(points) > 0.99, "FAIL", "PASS")
+    error["Readback"] = "PASS"
+
+    instrument = pd.DataFrame(
+        {"Instruments Used: ": ["PSU", "DMM", "ELoad"], "SCPI Version": ["1999.0"] * 3}
+    )
+    config = pd.DataFrame([[f"Parameter{n}", n] for n in range(30)], columns=["Parameter", "Value"])
+    return error, instrument, config
+
+
+def legacy(path, df1, df2, df4):
+    """Former xlreport.run, taking the DataFrames instead of reading them from csv files"""
+    A = xlreport()
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        df1.to_excel(writer, sheet_name="Data", index=False, startrow=7, startcol=3)
+        df2.to_excel(writer, sheet_name="Data", index=False)
+        df4.to_excel(writer, sheet_name="Data", index=False, startrow=7)
+        wb = writer.book
+        ws = wb["Data"]
+
+        for cellref in ["U9:U" + str(ws.max_row), "W9:W" + str(ws.max_row)]:
+            ws.conditional_formatting.add(
+                cellref,
+                FormulaRule(
+                    formula=[f'NOT(ISERROR(SEARCH("PASS",{cellref})))'],
+                    stopIfTrue=True, fill=A.green_fill, font=A.green_font,
+                ),
+            )
+            ws.conditional_formatting.add(
+                cellref,
+                FormulaRule(
+                    formula=[f'NOT(ISERROR(SEARCH("FAIL",{cellref})))'],
+                    stopIfTrue=True, fill=A.red_fill, font=A.red_font,
+                ),
+            )
+
+        for x in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+            ws.column_dimensions[x].width = 16
+        for row in range(1, 5):
+            ws.cell(row=row, column=1).alignment = Alignment(horizontal="left")
+        for row in range(8, 201):
+            for col in range(4, 201):
+                ws.cell(row=row, column=col).alignment = Alignment(horizontal="center")
+
+        ws.cell(row=7, column=4).value = "Time Generated: "
+        ws.cell(row=7, column=5).value = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        img = openpyxl.drawing.image.Image("images/Chart.png")
+        img.anchor = "X1"
+        ws.add_image(img)
+
+        wb.save(path)
+
+
+def streaming(path, df1, df2, df4):
+    A = xlreport()
+    A.path = path
+    A.run(df1, df2, df4)
+
+
+def timeit(function, path, frames):
+    start = perf_counter()
+    function(path, *frames)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        os.makedirs("images")
+        plt.plot([0, 1], [0, 1])
+        plt.savefig("images/Chart.png")
+
+        print(f"{'points':>8} {'former (s)':>12} {'streaming (s)':>15} {'speedup':>9}")
+        for points in SIZES:
+            frames = report(points)
+            t_legacy = timeit(legacy, "legacy.xlsx", frames)
+            t_stream = timeit(streaming, "streaming.xlsx", frames)
+
+            ws = openpyxl.load_workbook("streaming.xlsx", read_only=True)["Data"]
+            assert sum(1 for _ in ws.iter_rows()) == 8 + max(points, len(frames[2]))
+
+            print(f"{points:>8} {t_legacy:>12.3f} {t_stream:>15.3f} {t_legacy / t_stream:>8.1f}x")
@@ -0,0 +1,312 @@
+""" End-to-end benchmark of the DUT Tests against the simulated Instruments of library/Simulator.py.
+
+    Every DUT Test is run the way a campaign runs it, through the drivers, the SessionPool and the
+    simulated bus, followed by its analysis and its Excel report. The Voltage / Current Accuracy tests
+    are run at several grid sizes, the other tests have a fixed number of points. For every run it
+    reports:
+
+        points/s    points measured per second of wall time, including the simulated bus latency,
+                    integration time of the DMMs and the delays of the test
+        trans/pt    bus transactions (writes and queries received by the Instruments) per point
+        cpu/pt      host CPU time per point in ms, the simulated Instruments run in the same process
+        analysis    seconds taken by datatoGraph / datatoCSV_Regulation
+        report      seconds taken by instrumentData and the Excel report
+
+    The results are saved to benchmark/results/<commit>.json, so that a later commit can be compared
+    against them with --compare.
+
+    Run from the root of the repository:
+        python benchmark/bench_sweep.py
+        python benchmark/bench_sweep.py --sizes 10 100 --tests "Voltage Accuracy A" --compare 1a2b3c4d5e6f
+
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import types
+from time import perf_counter, process_time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library.SessionPool import SessionPool
+from src.data import configData, datatoCSV_Regulation, datatoGraph, instrumentData
+from src.DUT_Test import (
+    CurrentMeasurement,
+    LoadRegulation,
+    ProgrammingSpeedTest,
+    RiseFallTime,
+    VisaResourceManager,
+    VoltageMeasurement,
+)
+from src.xlreport import xlreport, xlreport_Regulation
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS = os.path.join(ROOT, "benchmark", "results")
+SIZES = [10, 50, 200]
+
+CONFIG = {
+    "Instrument": "Keysight",
+    "PSU": "USB0::PSU::INSTR", "ELoad": "USB0::LOAD::INSTR", "DMM_V": "USB0::DMMV::INSTR",
+    "DMM_I": "USB0::DMMI::INSTR", "DMM": "USB0::DMMV::INSTR", "OSC": "USB0::OSC::INSTR",
+    "PSU_Channel": 1, "ELoad_Channel": 1, "OSC_Channel": 1,
+    "Prog_Accuracy_Gain": 0.05, "Prog_Accuracy_Offset": 5,
+    "Rdbk_Accuracy_Gain": 0.05, "Rdbk_Accuracy_Offset": 5,
+    "Error_Gain": 0.05, "Error_Offset": 5, "shuntResistance": 0.01,
+    "VoltageSense": "INT", "VoltageRes": "SLOW", "CurrentSense": "INT", "CurrentRes": "SLOW",
+    "setFunction": "Current", "Range": "Auto", "Aperture": "1", "AutoZero": "ON", "InputZ": "10M",
+    "UpTime": "50", "DownTime": "50", "SweepMode": "Step", "Terminal": "10A",
+    "V_Rating": 30, "I_Rating": 5, "P_Rating": 150,
+    "Channel_CouplingMode": "DC", "Trigger_Mode": "EDGE", "Trigger_CouplingMode": "DC",
+    "Trigger_SweepMode": "NORMAL", "Trigger_SlopeMode": "POS", "TimeScale": 0.001, "VerticalScale": 1,
+    "I_Step": 1, "V_Settling_Band": 0.1, "T_Settling_Band": 0.001,
+    "V_Upper": 10, "V_Lower": 1, "Upper_Bound": 90, "Lower_Bound": 10,
+}
+
+# name: (test method, keys of the Instruments, keys overriding CONFIG, points of a fixed size test)
+TESTS = {
+    "Voltage Accuracy A": (
+        VoltageMeasurement.executeVoltageMeasurementA, ("ELoad", "PSU", "DMM_V", "DMM_I"), {}, None,
+    ),
+    "Voltage Accuracy B": (
+        VoltageMeasurement.executeVoltageMeasurementB, ("ELoad", "PSU", "DMM"), {}, None,
+    ),
+    "Current Accuracy A": (
+        CurrentMeasurement.executeCurrentMeasurementA,
+        ("ELoad", "PSU", "DMM_V", "DMM_I"),
+        {"setFunction": "Voltage"},
+        None,
+    ),
+    "Current Accuracy B": (
+        CurrentMeasurement.executeCurrentMeasurementB,
+        ("ELoad", "PSU", "DMM"),
+        {"setFunction": "Voltage", "DMM": "USB0::DMMI::INSTR"},
+        None,
+    ),
+    "Load Regulation (CV) A": (
+        LoadRegulation.executeCV_LoadRegulationA, ("ELoad", "PSU", "DMM"), {}, 2,
+    ),
+    "Load Regulation (CV) B": (
+        LoadRegulation.executeCV_LoadRegulationB, ("ELoad", "PSU", "DMM"), {}, 5,
+    ),
+    "Load Regulation (CC) A": (
+        LoadRegulation.executeCC_LoadRegulationA,
+        ("ELoad", "PSU", "DMM"),
+        {"setFunction": "Voltage"},
+        2,
+    ),
+    "Load Regulation (CC) B": (
+        LoadRegulation.executeCC_LoadRegulationB,
+        ("ELoad", "PSU", "DMM"),
+        {"setFunction": "Voltage"},
+        2,
+    ),
+    "Transient Recovery Time": (RiseFallTime.execute, ("ELoad", "PSU", "OSC"), {}, 1),
+    "Programming Speed": (ProgrammingSpeedTest.execute, ("PSU", "OSC"), {}, 1),
+}
+
+
+def grid(points):
+    """Sweep of two currents by points / 2 voltages, with step sizes exact in binary"""
+    voltages = max(1, points // 2)
+    return {
+        "minCurrent": 0.5, "maxCurrent": 1, "current_step_size": 0.5,
+        "minVoltage": 1, "maxVoltage": 1 + 0.25 * (voltages - 1),
+        "voltage_step_size": 0.25, "voltage_stepsize": 0.25,
+    }
+
+
+def transactions(rm):
+    return sum(resource.transactions for resource in rm.resources.values())
+
+
+def analyse(name, dict, result):
+    """Analysis of the result the same way as Campaign.complete
+
+    Returns:
+        Returns the data and the report class of the run, or None if the test has no report.
+    """
+    if "Accuracy" in name:
+        flag_VI = 1 if name.startswith("Voltage") else 2
+        graph = datatoGraph(result, flag_VI=flag_VI)
+        compare = graph.scatterCompareVoltage if flag_VI == 1 else graph.scatterCompareCurrent
+        data = compare(
+            float(dict["Prog_Accuracy_Gain"]),
+            float(dict["Prog_Accuracy_Offset"]),
+            float(dict["Rdbk_Accuracy_Gain"]),
+            float(dict["Rdbk_Accuracy_Offset"]),
+        )
+        return data, xlreport, ("DMM_V" if flag_VI == 1 else "DMM_I")
+
+    if result is not None:
+        return datatoCSV_Regulation(*result).data, xlreport_Regulation, "DMM"
+
+    return None
+
+
+def report(dict, analysed, path):
+    data, cls, DMM = analysed
+    instrument = instrumentData(dict["PSU"], dict[DMM], dict["ELoad"])
+    A = cls()
+    A.path = path
+    A.run(data, instrument.data, configData(dict).data)
+
+
+def bench(name, size):
+    """Run one DUT Test on freshly opened simulated Instruments and measure it"""
+    method, keys, overrides, fixed = TESTS[name]
+    dict = {**CONFIG, **grid(size), **overrides}
+
+    SessionPool.closeAll()
+    rm = SessionPool.resourceManager()
+    rm.wire(dict)
+    flag, args = VisaResourceManager().openRM(*[dict[key] for key in keys])
+    if flag == 0:
+        raise IOError("VISA IO ERROR " + "".join(str(item) for item in args))
+
+    namespace = types.SimpleNamespace(infoList=[], dataList=[])
+    sent = transactions(rm)
+    wall, cpu = perf_counter(), process_time()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = method(namespace, dict)
+    wall, cpu = perf_counter() - wall, process_time() - cpu
+    sent = transactions(rm) - sent
+
+    if fixed is not None:
+        points = len(result[0]) if isinstance(result, tuple) else fixed
+    else:
+        points = len(result)
+
+    entry = {
+        "test": name,
+        "points": points,
+        "seconds": round(wall, 4),
+        "points_per_s": round(points / wall, 3),
+        "transactions_per_point": round(sent / points, 2),
+        "cpu_ms_per_point": round(1000 * cpu / points, 3),
+        "analysis_s": None,
+        "report_s": None,
+    }
+
+    start = perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        analysed = analyse(name, dict, result)
+    if analysed is not None:
+        entry["analysis_s"] = round(perf_counter() - start, 4)
+        start = perf_counter()
+        report(dict, analysed, "report.xlsx")
+        entry["report_s"] = round(perf_counter() - start, 4)
+
+    SessionPool.closeAll()
+    return entry
+
+
+def commit():
+    """Short hash of HEAD, followed by -dirty if the working tree has uncommitted changes"""
+    try:
+        head = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return head + ("-dirty" if dirty else "")
+
+
+def load(reference):
+    """Results of an earlier run, given as a commit, a file name in benchmark/results or a path"""
+    for path in (reference, os.path.join(RESULTS, reference), os.path.join(RESULTS, reference + ".json")):
+        if os.path.isfile(path):
+            with open(path) as file:
+                return json.load(file)
+    raise FileNotFoundError(f"No benchmark results found for {reference!r} in {RESULTS}")
+
+
+def ratio(new, old):
+    if not new or not old:
+        return "-"
+    return f"{new / old:.2f}x"
+
+
+def header(compare=False):
+    print(
+        f"{'test':<24} {'points':>6} {'points/s':>9} {'trans/pt':>9} {'cpu/pt ms':>10} "
+        f"{'analysis s':>11} {'report s':>9}" + (f" {'points/s':>9} {'cpu/pt':>7}" if compare else "")
+    )
+
+
+def row(entry, old=None, compare=False):
+    """Print the measurements of a run, followed by its ratios to the baseline if compared"""
+    line = (
+        f"{entry['test']:<24} {entry['points']:>6} {entry['points_per_s']:>9.2f} "
+        f"{entry['transactions_per_point']:>9.1f} {entry['cpu_ms_per_point']:>10.2f} "
+        f"{entry['analysis_s'] if entry['analysis_s'] is not None else '-':>11} "
+        f"{entry['report_s'] if entry['report_s'] is not None else '-':>9}"
+    )
+    if compare and old is None:
+        line += f" {'-':>9} {'-':>7}"
+    elif compare:
+        line += (
+            f" {ratio(entry['points_per_s'], old['points_per_s']):>9}"
+            f" {ratio(entry['cpu_ms_per_point'], old['cpu_ms_per_point']):>7}"
+        )
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of the DUT Tests on simulated Instruments")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="points of the accuracy sweeps")
+    parser.add_argument("--tests", nargs="+", default=list(TESTS), choices=list(TESTS), metavar="TEST")
+    parser.add_argument("--compare", help="commit or results file to compare against")
+    parser.add_argument("--no-save", action="store_true", help="do not save the results")
+    args = parser.parse_args(argv)
+
+    baseline = load(args.compare) if args.compare else None
+    previous = {}
+    if baseline is not None:
+        previous = {(entry["test"], entry["points"]): entry for entry in baseline["results"]}
+        print(f"compared against {baseline['commit']} ({baseline['time']})")
+
+    SessionPool.visa_library = "@simulator"
+    header(baseline is not None)
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        cwd = os.getcwd()
+        os.chdir(folder)
+        os.makedirs("images")
+        try:
+            for name in args.tests:
+                sizes = args.sizes if TESTS[name][3] is None else [TESTS[name][3]]
+                for size in sizes:
+                    entry = bench(name, size)
+                    results.append(entry)
+                    row(entry, previous.get((name, entry["points"])), baseline is not None)
+        finally:
+            os.chdir(cwd)
+
+    record = {
+        "commit": commit(),
+        "time": f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S}",
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "results": results,
+    }
+    if not args.no_save:
+        os.makedirs(RESULTS, exist_ok=True)
+        path = os.path.join(RESULTS, record["commit"] + ".json")
+        with open(path, "w") as file:
+            json.dump(record, file, indent=2)
+        print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
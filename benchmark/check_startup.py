@@ -0,0 +1,75 @@
+""" Import time budget of the GUI.
+
+    Imports main_GUI in a fresh interpreter with -X importtime and fails if it takes longer than the
+    budget, or if it loads one of the stacks that are only needed once a test runs. The slowest
+    imports are listed to find what broke the budget. The build scripts run this check before
+    freezing the app.
+
+    Run from the root of the repository:
+        python benchmark/check_startup.py [--budget MILLISECONDS]
+
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stacks loaded by the methods using them, which must not be imported with the window
+LAZY = ["pandas", "numpy", "matplotlib", "openpyxl", "pyvisa", "src.DUT_Test", "src.data", "src.xlreport"]
+
+PROBE = "import sys, main_GUI; print(','.join(m for m in %r if m in sys.modules))" % LAZY
+
+
+def importTimes(stderr):
+    """Parse the -X importtime output into (cumulative microseconds, module) pairs"""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times.append((int(cumulative), module.strip()))
+
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0].strip())
+    parser.add_argument("--budget", type=float, default=300, help="budget in milliseconds")
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        print(process.stderr)
+        return 1
+
+    times = importTimes(process.stderr)
+    total = dict((module, cumulative) for cumulative, module in times).get("main_GUI", 0) / 1000
+    loaded = [module for module in process.stdout.strip().split(",") if module]
+
+    print(f"import main_GUI: {total:.0f} ms (budget {args.budget:.0f} ms)")
+    for cumulative, module in sorted(times, reverse=True)[1:8]:
+        print(f"    {cumulative / 1000:8.1f} ms  {module}")
+
+    failed = False
+    if total > args.budget:
+        print("FAIL: import time is over budget")
+        failed = True
+    if loaded:
+        print("FAIL: imported at startup instead of on first use: " + ", ".join(loaded))
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
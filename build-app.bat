@@ -1,11 +1,15 @@
 @echo off
 set "SCRIPT_DIR=%~dp0"
 
+echo Checking the startup import time
+python "%SCRIPT_DIR%benchmark\check_startup.py" || exit /b 1
+
+rem --onedir starts without unpacking the whole bundle to a temporary folder on every launch
 echo Building app DUT-test
-pyinstaller --name=DUT-test --onefile --windowed "%SCRIPT_DIR%main_GUI.py"
+pyinstaller --name=DUT-test --onedir --windowed --noconfirm --exclude-module=tkinter "%SCRIPT_DIR%main_GUI.py"
 
 set "src_img_path=%SCRIPT_DIR%images\GUI"
-set "dst_img_path=%SCRIPT_DIR%dist\images"
+set "dst_img_path=%SCRIPT_DIR%dist\DUT-test\images\GUI"
 
 echo Downloading images from '%src_img_path%' -> '%dst_img_path%'
 xcopy /E /I /Y "%src_img_path%" "%dst_img_path%"
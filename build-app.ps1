@@ -1,11 +1,17 @@
 # Get the directory of the script
 $ScriptDir = Split-Path -Parent $MyInvocation.MyCommand.Definition
 
+Write-Host "Checking the startup import time"
+python "$ScriptDir\benchmark\check_startup.py"
+if ($LASTEXITCODE -ne 0) { exit 1 }
+
+# --onedir starts without unpacking the whole bundle to a temporary folder on every launch
 Write-Host "Building app DUT-test"
-pyinstaller --name=DUT-test --onefile --windowed "$ScriptDir\main_GUI.py"
+pyinstaller --name=DUT-test --onedir --windowed --noconfirm --exclude-module=tkinter "$ScriptDir\main_GUI.py"
 
 $srcImgPath = Join-Path -Path $ScriptDir -ChildPath "images\GUI"
-$dstImgPath = Join-Path -Path $ScriptDir -ChildPath "dist\images"
+$dstImgPath = Join-Path -Path $ScriptDir -ChildPath "dist\DUT-test\images\GUI"
+New-Item -ItemType Directory -Force -Path (Split-Path -Parent $dstImgPath) | Out-Null
 
 Write-Host "Downloading images from '$srcImgPath' -> '$dstImgPath'"
 Copy-Item -Recurse -Force $srcImgPath $dstImgPath
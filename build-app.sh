@@ -1,10 +1,14 @@
 SCRIPT_DIR=$(cd -- "$(dirname -- "${BASH_SOURCE[0]}")" &>/dev/null && pwd)
 
+echo "Checking the startup import time"
+python "$SCRIPT_DIR"/benchmark/check_startup.py || exit 1
+
+# --onedir starts without unpacking the whole bundle to a temporary folder on every launch
 echo "Building app DUT-test"
-pyinstaller --name=DUT-test --onefile --windowed "$SCRIPT_DIR"/main_GUI.py
+pyinstaller --name=DUT-test --onedir --windowed --noconfirm --exclude-module=tkinter "$SCRIPT_DIR"/main_GUI.py
 
 src_img_path="$SCRIPT_DIR"/images/GUI
-dst_img_path="$SCRIPT_DIR"/dist/images
+dst_img_path="$SCRIPT_DIR"/dist/DUT-test/images
 
 echo "Downloading images from '$src_img_path' -> '$dst_img_path'"
 
@@ -0,0 +1,161 @@
+"""Library containing the awaitable (asyncio) variant of the Sessions and Subsystems of the Instrument Libraries.
+
+    Every method of the Instrument Libraries is a blocking self.instr.write / query of its Session, so a
+    thread can only wait for one transaction at a time. The AsyncSession below runs the transactions of
+    every Instrument on a thread of its own, and the AsyncSubsystem turns the methods of any Subsystem
+    class into coroutines run on the thread of its Instrument. A single event loop can then await the
+    transactions of the PSU, ELoad, DMMs and Oscilloscope at the same time, while the transactions of
+    one Instrument are still sent one after another in the order they were awaited:
+
+        Voltage, Trigger = AsyncSubsystem.wrap(Voltage, Trigger)
+
+        async def setup(address):
+            await Voltage(address).setNPLC(10)
+            await Trigger(address).setSource("BUS")
+
+        AsyncSession.run(setup(DMM_V), setup(DMM_I))
+
+    Test benches with different VISA Addresses do not share any thread, so the coroutines of several
+    benches can be run by the same event loop in one process. The transactions go through the Session
+    of the SessionPool, so the shadow register, the tracing and the simulated backend apply as usual.
+    The threads are stopped by AsyncSession.shutdown once the test, or the campaign, is over.
+
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from library.SessionPool import SessionPool
+
+
+class AsyncSession(object):
+    """Awaitable transactions of the Session of one Instrument
+
+    Attributes:
+        VISA_ADDRESS: String containing the VISA Address of the Instrument.
+        instr: Session of the Instrument in the SessionPool.
+        executors: Dictionary mapping every VISA Address to the single thread running its transactions.
+        clock: VirtualClock of a dry run (see src/estimate.py), the transactions are then run at once and
+            run() runs the coroutines one after another in simulated time.
+
+    """
+
+    executors = {}
+    clock = None
+    lock = threading.Lock()
+
+    def __init__(self, VISA_ADDRESS):
+        self.VISA_ADDRESS = VISA_ADDRESS
+        self.instr = SessionPool.open(VISA_ADDRESS)
+
+    @classmethod
+    def executor(cls, VISA_ADDRESS):
+        """Return the thread of an Instrument, creating it on first use"""
+        with cls.lock:
+            executor = cls.executors.get(VISA_ADDRESS)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="instrument")
+                cls.executors[VISA_ADDRESS] = executor
+
+            return executor
+
+    async def call(self, function, *args, **kwargs):
+        """Run a blocking function communicating with this Instrument on its thread
+
+        Returns:
+            Returns the value returned by the function.
+        """
+        if self.clock is not None:
+            return function(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor(self.VISA_ADDRESS), functools.partial(function, *args, **kwargs)
+        )
+
+    async def write(self, command):
+        return await self.call(self.instr.write, command)
+
+    async def query(self, command):
+        return await self.call(self.instr.query, command)
+
+    async def read_binary(self, command, datatype="d", is_big_endian=True):
+        """Query a binary block, e.g. FETC? of a DMM in FORM REAL,64"""
+        return await self.call(
+            self.instr.query_binary_values, command, datatype=datatype, is_big_endian=is_big_endian
+        )
+
+    async def read_stb(self):
+        return await self.call(self.instr.read_stb)
+
+    @classmethod
+    def run(cls, *coroutines):
+        """Run coroutines at the same time from blocking code, e.g. the DUT Tests
+
+        Must not be called from a running event loop, which awaits asyncio.gather instead.
+
+        Returns:
+            Returns a list containing the value returned by every coroutine, in the order they were given.
+        """
+        if cls.clock is not None:
+            return cls.clock.parallel([functools.partial(asyncio.run, coroutine) for coroutine in coroutines])
+
+        async def gather():
+            return await asyncio.gather(*coroutines)
+
+        return asyncio.run(gather())
+
+    @classmethod
+    def shutdown(cls, *VISA_ADDRESSES):
+        """Stop the threads of the given Instruments, or of every Instrument if no address is given
+
+        A thread is created again by the next transaction of its Instrument.
+        """
+        with cls.lock:
+            for VISA_ADDRESS in VISA_ADDRESSES or list(cls.executors):
+                executor = cls.executors.pop(VISA_ADDRESS, None)
+                if executor is not None:
+                    executor.shutdown()
+
+
+class AsyncSubsystem(object):
+    """Awaitable variant of a Subsystem of an Instrument Library
+
+    Every method of the Subsystem is returned as a coroutine function run on the thread of the
+    Instrument, e.g. await AsyncSubsystem(Voltage, DMM).setNPLC(10).
+
+    Attributes:
+        subsystem: Instance of the Subsystem class for the Instrument.
+        session: AsyncSession of the Instrument.
+
+    """
+
+    def __init__(self, Subsystem, VISA_ADDRESS):
+        self.subsystem = Subsystem(VISA_ADDRESS)
+        self.session = AsyncSession(VISA_ADDRESS)
+
+    def __getattr__(self, name):
+        if name in ("subsystem", "session"):
+            raise AttributeError(name)
+
+        method = getattr(self.subsystem, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await self.session.call(method, *args, **kwargs)
+
+        return call
+
+    @classmethod
+    def wrap(cls, *Subsystems):
+        """Return the awaitable variant of every Subsystem class, to be called with a VISA Address
+
+        The Subsystems a library does not have (None or a MissingSubsystem) are returned as they are.
+        """
+        return tuple(
+            Subsystem if not Subsystem else functools.partial(cls, Subsystem) for Subsystem in Subsystems
+        )
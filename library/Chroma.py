@@ -11,6 +11,8 @@
 
 import pyvisa
 
+from library.SessionPool import SessionPool
+
 
 class Subsystem(object):
     """Parent Class for every SCPI Commands Subsystem
@@ -26,19 +28,17 @@ class Subsystem(object):
     def __init__(self, VISA_ADDRESS):
         """Initialize the instance where the Instrument is ready to receive commands
 
-        Object rm is created where the backend will find the shared VISA Library. VISA_Address are given as arguements to declare
-        which resources (in this case the instruments) to use.
+        The session is shared with the other Subsystems of the Instrument, see library/SessionPool.py.
+        VISA_Address are given as arguements to declare which resources (in this case the instruments) to use.
 
         Args:
             VISA_ADDRESS: String Literal of VISA Address of the Instrument
         """
 
         self.VISA_ADDRESS = VISA_ADDRESS
-        # ResourceManager Setup
-        rm = pyvisa.ResourceManager()
         try:
             # Visa Address is found under Keysight Connection Expert
-            self.instr = rm.open_resource(self.VISA_ADDRESS)
+            self.instr = SessionPool.open(self.VISA_ADDRESS)
 
         except pyvisa.VisaIOError as e:
             print(e.args)
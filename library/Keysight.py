@@ -9,8 +9,11 @@
 
 """
 
+import numpy as np
 import pyvisa
 
+from library.SessionPool import SessionPool
+
 
 class Subsystem(object):
     """Parent Class for every SCPI Commands Subsystem
@@ -26,19 +29,17 @@ class Subsystem(object):
     def __init__(self, VISA_ADDRESS):
         """Initialize the instance where the Instrument is ready to receive commands
 
-        Object rm is created where the backend will find the shared VISA Library. VISA_Address are given as arguements to declare
-        which resources (in this case the instruments) to use.
+        The session is shared with the other Subsystems of the Instrument, see library/SessionPool.py.
+        VISA_Address are given as arguements to declare which resources (in this case the instruments) to use.
 
         Args:
             VISA_ADDRESS: String Literal of VISA Address of the Instrument
         """
 
         self.VISA_ADDRESS = VISA_ADDRESS
-        # ResourceManager Setup
-        rm = pyvisa.ResourceManager()
         try:
             # Visa Address is found under Keysight Connection Expert
-            self.instr = rm.open_resource(self.VISA_ADDRESS)
+            self.instr = SessionPool.open(self.VISA_ADDRESS)
 
         except pyvisa.VisaIOError as e:
             print(e.args)
@@ -239,6 +240,19 @@ class Data(Subsystem):
         return self.instr.query("DATA:POIN? NVMEM")
 
 
+class Digital(Subsystem):
+    """Child Class for Digital Subsystem"""
+
+    def __init__(self, VISA_ADDRESS):
+        super().__init__(VISA_ADDRESS)
+
+    def setPinFunction(self, PinNumber, function):
+        self.instr.write(f"DIG:PIN{PinNumber}:FUNC {function}")
+
+    def setPinPolarity(self, PinNumber, polarity):
+        self.instr.write(f"DIG:PIN{PinNumber}:POL {polarity}")
+
+
 class Display(Subsystem):
     """Child Class for Display Subsystem"""
 
@@ -281,6 +295,20 @@ class Fetch(Subsystem):
         elif len(args) == 2:
             return self.instr.query(f"FETC:{args[0]}:{args[1]}? (@{ChannelNumber})")
 
+    def queryBinary(self, datatype="d", is_big_endian=True):
+        return self.instr.query_binary_values(
+            "FETC?", datatype=datatype, is_big_endian=is_big_endian, container=np.array
+        )
+
+    def query2Binary(self, ChannelNumber, *args, datatype="f", is_big_endian=True):
+        header = ":".join(args)
+        return self.instr.query_binary_values(
+            f"FETC:{header}? (@{ChannelNumber})",
+            datatype=datatype,
+            is_big_endian=is_big_endian,
+            container=np.array,
+        )
+
 
 class Function(Subsystem):
     """Child Class for Function Subsystem"""
@@ -304,6 +332,12 @@ class Format(Subsystem):
     def write(self, mode):
         self.instr.write(f"FORM:OUTP {mode}")
 
+    def setDataFormat(self, mode):
+        self.instr.write(f"FORM:DATA {mode}")
+
+    def setByteOrder(self, order):
+        self.instr.write(f"FORM:BORD {order}")
+
 
 class Initiate(Subsystem):
     """Child Class for Initiate Subsystem"""
@@ -323,6 +357,9 @@ class Initiate(Subsystem):
     def initiateContinuous(self, state, ChannelNumber):
         self.instr.write(f"INIT:CONT:TRAN {state},(@{ChannelNumber})")
 
+    def initiateTransient(self, ChannelNumber):
+        self.instr.write(f"INIT:TRAN (@{ChannelNumber})")
+
 
 class Output(Subsystem):
     """Child Class for Output Subsystem"""
@@ -377,7 +414,28 @@ class List(Subsystem):
         self.instr.write(f"LIST:CURR {list},(@{ChannelNumber})")
 
     def queryCurrentPoints(self, ChannelNumber):
-        self.instr.write(f"LIST:CURR:POIN? (@{ChannelNumber})")
+        return self.instr.query(f"LIST:CURR:POIN? (@{ChannelNumber})")
+
+    def setVoltageList(self, list, ChannelNumber):
+        self.instr.write(f"LIST:VOLT {list},(@{ChannelNumber})")
+
+    def queryVoltagePoints(self, ChannelNumber):
+        return self.instr.query(f"LIST:VOLT:POIN? (@{ChannelNumber})")
+
+    def setDwellList(self, list, ChannelNumber):
+        self.instr.write(f"LIST:DWEL {list},(@{ChannelNumber})")
+
+    def setTriggerOutBOST(self, list, ChannelNumber):
+        self.instr.write(f"LIST:TOUT:BOST {list},(@{ChannelNumber})")
+
+    def setTriggerOutEOST(self, list, ChannelNumber):
+        self.instr.write(f"LIST:TOUT:EOST {list},(@{ChannelNumber})")
+
+    def setStepMode(self, mode, ChannelNumber):
+        self.instr.write(f"LIST:STEP {mode},(@{ChannelNumber})")
+
+    def setTerminateLast(self, state, ChannelNumber):
+        self.instr.write(f"LIST:TERM:LAST {state},(@{ChannelNumber})")
 
 
 class LXI(Subsystem):
@@ -876,6 +934,15 @@ class Trigger(Subsystem):
     def setTriggerDelay(self, time):
         self.instr.write(f"TRIG:DEL {time}")
 
+    def setSlope(self, slope):
+        self.instr.write(f"TRIG:SLOP {slope}")
+
+    def setTransientSource(self, source, ChannelNumber):
+        self.instr.write(f"TRIG:TRAN:SOUR {source},(@{ChannelNumber})")
+
+    def triggerTransient(self, ChannelNumber):
+        self.instr.write(f"TRIG:TRAN (@{ChannelNumber})")
+
 
 class Unit(Subsystem):
     """Child Class for Unit Subsystem"""
@@ -1034,3 +1101,23 @@ class Oscilloscope(Subsystem):
 
     def setVerticalOffset(self, value, ChannelNumber):
         self.instr.write(f"CHANNEL{ChannelNumber}:OFFSET {value}")
+
+    def setWaveformSource(self, ChannelNumber):
+        self.instr.write(f"WAVEFORM:SOURCE CHANNEL{ChannelNumber}")
+
+    def setWaveformFormat(self, mode):
+        self.instr.write(f"WAVEFORM:FORMAT {mode}")
+
+    def setWaveformByteOrder(self, order):
+        self.instr.write(f"WAVEFORM:BYTEORDER {order}")
+
+    def setWaveformPoints(self, value):
+        self.instr.write(f"WAVEFORM:POINTS {value}")
+
+    def getWaveformPreamble(self):
+        return self.instr.query("WAVEFORM:PREAMBLE?")
+
+    def getWaveformData(self, datatype="h", is_big_endian=True):
+        return self.instr.query_binary_values(
+            "WAVEFORM:DATA?", datatype=datatype, is_big_endian=is_big_endian, container=np.array
+        )
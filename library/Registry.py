@@ -0,0 +1,218 @@
+"""Library containing the registry of the Instrument Libraries (drivers) used by the DUT Tests.
+
+    The DUT Tests used to import the library named by the Instrument parameter and look up every one of
+    its Subsystem classes at the start of every run, failing outright when a library did not have one of
+    them (Keithley.py has no Oscilloscope, Chroma.py has no Read). The DriverRegistry below loads every
+    library once, resolves its Subsystem classes into a Driver cached per library name, and discovers
+    which of the CAPABILITIES the library implements, so that a test can pick the fastest acquisition
+    path supported by the Instruments instead of testing for the name of the library:
+
+        driver = DriverRegistry.get("Keysight")
+        if driver.supports("list"):
+            ...
+        (Read, Apply, ...) = DriverRegistry.classes("Keithley")    # MissingSubsystem for the missing ones
+
+    A library is registered under the name given as Instrument in the DUT Tests. Other libraries (e.g.
+    a library of a single model) are added with DriverRegistry.register, and a name which is not
+    registered is imported as a module of the library folder, as Dimport used to do.
+
+"""
+
+import importlib
+import threading
+
+
+class MissingSubsystem(object):
+    """Placeholder of a Subsystem class a library does not have, raising a clear error once it is used
+
+    The placeholder is false, so that a test can check for a Subsystem before using it.
+    """
+
+    def __init__(self, driver, name):
+        self.driver = driver
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        raise NotImplementedError(
+            f"The {self.driver} library has no {self.name} Subsystem, which is needed by this test"
+        )
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"MissingSubsystem({self.driver!r}, {self.name!r})"
+
+
+class Driver(object):
+    """Subsystem classes and capabilities of one Instrument Library
+
+    Attributes:
+        name: String containing the name the library is registered under, e.g. "Keysight".
+        module: The module of the library.
+        subsystems: Dictionary mapping the name of every Subsystem class of the library to the class.
+        capabilities: Frozenset containing the names of the CAPABILITIES the library implements.
+
+    """
+
+    # Capabilities discovered in a library, with the (Subsystem, method) pairs they need
+    CAPABILITIES = {
+        # Hardware sequenced sweeps of listsweep.py
+        "list": [
+            ("List", "setVoltageList"),
+            ("List", "setCurrentList"),
+            ("List", "setDwellList"),
+            ("List", "setTriggerOutBOST"),
+        ],
+        # REAL,64 binary transfer of the readings of acquisition.py
+        "binary": [("Format", "setDataFormat"), ("Format", "setByteOrder"), ("Fetch", "queryBinary")],
+        # Blocks of readings acquired per initiate by acquisition.py
+        "buffered": [("Sample", "setSampleCount"), ("Trigger", "setCount"), ("Fetch", "query")],
+        # Voltage and current readback of the PSU
+        "readback": [("Measure", "test_V"), ("Measure", "test_I")],
+        # Edge measurements of the Transient Recovery Time and Programming Speed tests
+        "oscilloscope": [("Oscilloscope", None)],
+    }
+
+    def __init__(self, name, module):
+        self.name = name
+        self.module = module
+        base = getattr(module, "Subsystem", object)
+        self.subsystems = {
+            key: value
+            for key, value in vars(module).items()
+            if isinstance(value, type) and issubclass(value, base) and value is not base
+        }
+        self.capabilities = frozenset(
+            capability
+            for capability, requirements in self.CAPABILITIES.items()
+            if all(self.has(subsystem, method) for subsystem, method in requirements)
+        )
+
+    def has(self, subsystem, method=None):
+        """Whether the library has a Subsystem class, and the method of that class if one is given"""
+        cls = self.subsystems.get(subsystem)
+        return cls is not None and (method is None or callable(getattr(cls, method, None)))
+
+    def get(self, name):
+        """Return the Subsystem class of the given name, None if the library does not have it"""
+        return self.subsystems.get(name)
+
+    def subsystem(self, name):
+        """Return the Subsystem class of the given name, a MissingSubsystem if the library lacks it"""
+        cls = self.subsystems.get(name)
+        return MissingSubsystem(self.name, name) if cls is None else cls
+
+    def require(self, capability):
+        """Raise NotImplementedError naming the library if it does not implement a capability"""
+        if not self.supports(capability):
+            needed = [
+                subsystem if method is None else f"{subsystem}.{method}"
+                for subsystem, method in self.CAPABILITIES[capability]
+            ]
+            raise NotImplementedError(
+                f"The {self.name} library does not implement the {capability} capability "
+                f"({', '.join(needed)})"
+            )
+
+    def supports(self, capability):
+        if capability not in self.CAPABILITIES:
+            raise ValueError(f"Unknown capability {capability}, expected one of {list(self.CAPABILITIES)}")
+
+        return capability in self.capabilities
+
+    def __repr__(self):
+        return f"Driver({self.name!r}, {sorted(self.capabilities)})"
+
+
+class DriverRegistry(object):
+    """Registry loading every Instrument Library once and caching its Driver
+
+    Attributes:
+        modules: Dictionary mapping the name of a library to the module implementing it.
+        drivers: Dictionary mapping the name of a library to its Driver, once loaded.
+        SUBSYSTEMS: Names of the Subsystem classes unpacked by the DUT Tests, in the order of classes().
+
+    """
+
+    SUBSYSTEMS = (
+        "Read",
+        "Apply",
+        "Display",
+        "Function",
+        "Output",
+        "Sense",
+        "Configure",
+        "Delay",
+        "Trigger",
+        "Sample",
+        "Initiate",
+        "Fetch",
+        "Status",
+        "Voltage",
+        "Current",
+        "Oscilloscope",
+        "Measure",
+    )
+
+    modules = {
+        "Keysight": "library.Keysight",
+        "Keithley": "library.Keithley",
+        "Chroma": "library.Chroma",
+    }
+    drivers = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def register(cls, name, module_name):
+        """Register the library of an Instrument under a name, replacing the Driver cached for it
+
+        Args:
+            name: String containing the name given as Instrument in the DUT Tests.
+            module_name: String containing the name of the module of the library, e.g. "library.Keysight".
+        """
+        with cls.lock:
+            cls.modules[name] = module_name
+            cls.drivers.pop(name, None)
+
+    @classmethod
+    def get(cls, name):
+        """Return the Driver of a library, loading it on first use
+
+        Args:
+            name: String containing the name of the library, e.g. "Keysight".
+
+        Raises:
+            ImportError: The library could not be imported.
+        """
+        driver = cls.drivers.get(name)
+        if driver is not None:
+            return driver
+
+        with cls.lock:
+            if name not in cls.drivers:
+                cls.drivers[name] = Driver(name, importlib.import_module(cls.modules.get(name, name)))
+
+            return cls.drivers[name]
+
+    @classmethod
+    def classes(cls, name):
+        """Return the Subsystem classes of SUBSYSTEMS, a MissingSubsystem for those the library lacks"""
+        driver = cls.get(name)
+        return tuple(driver.subsystem(subsystem) for subsystem in cls.SUBSYSTEMS)
+
+    @classmethod
+    def supports(cls, name, capability):
+        """Whether a library implements a capability of Driver.CAPABILITIES, e.g. "list" or "binary" """
+        return cls.get(name).supports(capability)
+
+    @classmethod
+    def of(cls, subsystem):
+        """Return the Driver of the library a Subsystem class belongs to, None if it is not registered"""
+        with cls.lock:
+            drivers = list(cls.drivers.values())
+
+        for driver in drivers:
+            if driver.module.__name__ == subsystem.__module__:
+                return driver
+        return None
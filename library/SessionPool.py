@@ -0,0 +1,365 @@
+"""Library containing the process-wide pool of VISA Sessions shared by every Instrument Driver.
+
+    Every Subsystem in the Instrument Libraries used to create its own ResourceManager and open a new
+    session for each SCPI Command sent. The pool keeps one ResourceManager for the whole program and
+    one open session per VISA Address, so that Subsystems created for the same Instrument reuse the
+    same session and the cost of each command is reduced to the actual bus transaction.
+
+    The lifetime of the sessions is tied to VisaResourceManager.openRM / closeRM in DUT_Test.py.
+
+    Every session is wrapped in a Session, which keeps a shadow register of the settings last written
+    to the Instrument and does not send a write whose value has not changed. The shadow is cleared on
+    *RST, *RCL, SYST:PRES, a change of CONF, a VISA error, an error reported by SYST:ERR? and when the
+    session is closed, so that a reconnected Instrument always starts from an empty shadow. It is also
+    cleared at the start of every test by VisaResourceManager.openRM in DUT_Test.py and after a List
+    sweep (src/listsweep.py), which leave the Instruments in states the shadow never recorded.
+
+    While a Tracer of Tracing.py is started, every transaction of the sessions is timed and recorded.
+"""
+
+import re
+import threading
+
+import pyvisa
+
+
+class Session(object):
+    """Wrapper of an opened VISA resource suppressing redundant SCPI writes
+
+    The shadow key of a setting is its header together with its channel list, e.g. ("VOLT", "(@1)"),
+    without the optional SENS and DC nodes so that aliases such as VOLT:DC:NPLC and VOLT:NPLC share a
+    key. Writing a setting forgets the settings it is coupled with (COUPLED), e.g. VOLT:RANG 10 turns
+    off the VOLT:RANG:AUTO last written, so that the next VOLT:RANG:AUTO ON is sent again.
+    Commands without a value (INIT, ABOR, *TRG...) and commands that act rather than configure
+    (OUTP, INP, CAL, MMEM...) are always sent. Every other attribute is forwarded to the resource.
+
+    Attributes:
+        resource: The opened pyvisa resource.
+        shadow: Dictionary mapping the shadow key to the value last written.
+        writes: Integer counting the writes sent to the Instrument.
+        elided: Integer counting the writes that were not sent as the value had not changed.
+        address: String containing the VISA Address of the resource.
+        shadowing: Boolean determining if redundant writes are suppressed, shared by every session.
+        tracer: Tracer recording the transactions of every session, None when tracing is disabled.
+
+    """
+
+    shadowing = True
+    tracer = None
+    CHANNEL = re.compile(r"\(@[^)]*\)")
+    PASSTHROUGH = (
+        "ABOR",
+        "CAL",
+        "DATA",
+        "DISP:TEXT",
+        "INIT",
+        "INP",
+        "LXI",
+        "MMEM",
+        "OUTP",
+        "SINGLE",
+        "SYST:BEEP",
+        "SYST:DATE",
+        "SYST:TIME",
+        "TRIG:ACQ",
+        "TRIG:TRAN",
+    )
+    RESET = ("*RST", "*RCL", "SYST:PRES", "SYST:SET", "MEM:STAT")
+    OPTIONAL = re.compile(r"^SENS(E)?:|:DC(?=:|$)")
+    # Settings of a function changed by writing another setting of the same function
+    COUPLED = {
+        "RANG": ("RANG:AUTO",),
+        "RANG:AUTO": ("RANG",),
+        "NPLC": ("APER", "APER:ENAB", "RES"),
+        "APER": ("NPLC", "APER:ENAB", "RES"),
+        "APER:ENAB": ("NPLC", "APER", "RES"),
+        "RES": ("NPLC", "APER", "APER:ENAB"),
+    }
+    # Settings of a function, and subsystems, which MEASure of a DMM configures before reading
+    MEASURED = ("RANG", "RANG:AUTO", "NPLC", "APER", "APER:ENAB", "RES", "ZERO:AUTO", "IMP:AUTO")
+    MEASURED_SUBSYSTEMS = ("CONF", "TRIG", "SAMP")
+
+    def __init__(self, resource, address=""):
+        object.__setattr__(self, "resource", resource)
+        object.__setattr__(self, "address", address)
+        object.__setattr__(self, "shadow", {})
+        object.__setattr__(self, "writes", 0)
+        object.__setattr__(self, "elided", 0)
+
+    def __getattr__(self, name):
+        return getattr(self.resource, name)
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.resource, name, value)
+
+    def __delattr__(self, name):
+        # e.g. del instr.timeout, which sets an infinite timeout on the resource
+        delattr(self.resource, name)
+
+    @classmethod
+    def parse(cls, command):
+        """Split a command into its header, channel list and value
+
+        Returns:
+            Returns a tuple of three strings, e.g. ("VOLT", "(@1)", "5") for "VOLT 5,(@1)".
+        """
+        header, _, value = command.strip().partition(" ")
+        channel = ""
+        match = cls.CHANNEL.search(value)
+        if match is not None:
+            channel = match.group()
+            value = value[: match.start()] + value[match.end() :]
+
+        return header.upper(), channel, value.strip().rstrip(", ").strip()
+
+    @classmethod
+    def normalize(cls, header):
+        """Header of the shadow key, e.g. "VOLT:NPLC" for "SENS:VOLT:DC:NPLC" """
+        return cls.OPTIONAL.sub("", header)
+
+    def forgetCoupled(self, header, channel):
+        """Forget the settings of the same function coupled with the setting of header"""
+        for setting, coupled in self.COUPLED.items():
+            if header.endswith(":" + setting):
+                function = header[: -len(setting)]
+                for other in coupled:
+                    self.shadow.pop((function + other, channel), None)
+                return
+
+    def forgetMeasured(self, header):
+        """Forget the settings configured by a MEASure query of a DMM, e.g. MEAS:VOLT:DC? 10,0.001
+
+        Only the measurement settings of the measured function are forgotten, so the setpoints of a
+        PSU reading back its output with MEAS:VOLT? stay in the shadow.
+        """
+        function = self.normalize(header.partition(":")[2].rstrip("?"))
+        settings = tuple(function + ":" + setting for setting in self.MEASURED)
+        for key in list(self.shadow):
+            name, channel = key
+            if channel:
+                continue
+            if name in settings or name.startswith(self.MEASURED_SUBSYSTEMS):
+                del self.shadow[key]
+
+    def invalidate(self):
+        """Forget every shadowed setting, the next write of each setting is always sent"""
+        self.shadow.clear()
+
+    def send(self, command):
+        try:
+            if self.tracer is None:
+                self.resource.write(command)
+            else:
+                self.tracer.call(self.address, "write", command, self.resource.write, command)
+        except pyvisa.Error:
+            self.invalidate()
+            raise
+        self.writes += 1
+
+    def write(self, command):
+        header, channel, value = self.parse(command)
+
+        if header.startswith(self.RESET):
+            self.invalidate()
+            return self.send(command)
+
+        if not self.shadowing or header.startswith("*") or header.startswith(self.PASSTHROUGH):
+            return self.send(command)
+
+        if header == "APPL":
+            return self.writeApply(command, value)
+
+        if header.startswith("CONF"):
+            # Configure resets the measurement settings, so the shadow is only kept if it is repeated
+            if self.shadow.get(("CONF", "")) == (header, value):
+                self.elided += 1
+                return
+            self.invalidate()
+            self.send(command)
+            self.shadow[("CONF", "")] = (header, value)
+            return
+
+        if not value:
+            return self.send(command)
+
+        header = self.normalize(header)
+        key = (header, channel)
+        if self.shadow.get(key) == value:
+            self.elided += 1
+            return
+
+        self.send(command)
+        self.forgetCoupled(header, channel)
+        self.shadow[key] = value
+
+    def writeApply(self, command, value):
+        """APPL CHn,V,I programs both the voltage and current setting of the channel"""
+        Channel, _, settings = value.partition(",")
+        Voltage, _, Current = settings.partition(",")
+        channel = "(@" + Channel.upper().replace("CH", "").strip() + ")"
+        voltage = ("VOLT", channel)
+        current = ("CURR", channel)
+
+        if (
+            self.shadow.get(voltage) == Voltage.strip()
+            and self.shadow.get(current) == Current.strip()
+        ):
+            self.elided += 1
+            return
+
+        self.send(command)
+        self.shadow[voltage] = Voltage.strip()
+        self.shadow[current] = Current.strip()
+
+    def query(self, command, *args, **kwargs):
+        header, channel, _ = self.parse(command)
+        try:
+            if self.tracer is None:
+                response = self.resource.query(command, *args, **kwargs)
+            else:
+                response = self.tracer.call(
+                    self.address, "query", command, self.resource.query, command, *args, **kwargs
+                )
+        except pyvisa.Error:
+            self.invalidate()
+            raise
+
+        if header.startswith("MEAS") and not channel:
+            # MEASure of a DMM configures the measurement before reading it
+            self.forgetMeasured(header)
+        elif header.startswith("SYST:ERR") and not response.strip().startswith(("+0", "0")):
+            self.invalidate()
+
+        return response
+
+    def query_binary_values(self, command, *args, **kwargs):
+        try:
+            if self.tracer is None:
+                return self.resource.query_binary_values(command, *args, **kwargs)
+            return self.tracer.call(
+                self.address,
+                "query_binary_values",
+                command,
+                self.resource.query_binary_values,
+                command,
+                *args,
+                **kwargs,
+            )
+        except pyvisa.Error:
+            self.invalidate()
+            raise
+
+    def read_stb(self):
+        if self.tracer is None:
+            return self.resource.read_stb()
+        return self.tracer.call(self.address, "read_stb", "*STB (serial poll)", self.resource.read_stb)
+
+    def wait_on_event(self, *args, **kwargs):
+        if self.tracer is None:
+            return self.resource.wait_on_event(*args, **kwargs)
+        return self.tracer.call(
+            self.address, "wait_on_event", "SRQ", self.resource.wait_on_event, *args, **kwargs
+        )
+
+
+class SessionPool(object):
+    """Class holding one open VISA Session for every VISA Address used by the program
+
+    Attributes:
+        rm: The ResourceManager shared by every session in the pool.
+        sessions: Dictionary mapping the VISA Address to its opened resource.
+        lock: Lock guarding the dictionary when sessions are opened from multiple threads.
+        visa_library: String containing the VISA library of the ResourceManager, e.g. "@py", the default
+            library of pyvisa if empty. Libraries ending with "@simulator" are served by the simulated
+            Instruments of Simulator.py, optionally preceded by the path of their configuration file.
+
+    """
+
+    rm = None
+    sessions = {}
+    visa_library = ""
+    lock = threading.RLock()
+
+    @classmethod
+    def resourceManager(cls):
+        """Return the shared ResourceManager, creating it on first use"""
+        with cls.lock:
+            if cls.rm is None and cls.visa_library.endswith("@simulator"):
+                from library.Simulator import ResourceManager
+
+                cls.rm = ResourceManager(cls.visa_library[: -len("@simulator")])
+            elif cls.rm is None:
+                cls.rm = pyvisa.ResourceManager(cls.visa_library)
+
+            return cls.rm
+
+    @classmethod
+    def open(cls, VISA_ADDRESS):
+        """Return the session of an Instrument, opening it if it is not in the pool yet
+
+        Args:
+            VISA_ADDRESS: String Literal of VISA Address of the Instrument
+
+        Returns:
+            The Session wrapping the opened resource belonging to the VISA Address.
+
+        Raises:
+            VisaIOError: An error occured when opening PyVisa Resources
+        """
+        with cls.lock:
+            instr = cls.sessions.get(VISA_ADDRESS)
+            if instr is None:
+                instr = Session(cls.resourceManager().open_resource(VISA_ADDRESS), VISA_ADDRESS)
+                cls.sessions[VISA_ADDRESS] = instr
+
+            return instr
+
+    @classmethod
+    def isOpen(cls, VISA_ADDRESS):
+        return VISA_ADDRESS in cls.sessions
+
+    @classmethod
+    def close(cls, VISA_ADDRESS):
+        """Close the session of a single Instrument and remove it from the pool
+
+        Args:
+            VISA_ADDRESS: String Literal of VISA Address of the Instrument
+        """
+        with cls.lock:
+            instr = cls.sessions.pop(VISA_ADDRESS, None)
+            if instr is not None:
+                try:
+                    instr.close()
+                except pyvisa.Error as e:
+                    print(e.args)
+
+    @classmethod
+    def invalidate(cls, VISA_ADDRESS=None):
+        """Clear the shadow register of one Instrument, or of every Instrument if no address is given"""
+        with cls.lock:
+            for address, instr in cls.sessions.items():
+                if VISA_ADDRESS is None or address == VISA_ADDRESS:
+                    instr.invalidate()
+
+    @classmethod
+    def statistics(cls):
+        """Return a dictionary mapping every VISA Address to its number of sent and elided writes"""
+        with cls.lock:
+            return {
+                address: (instr.writes, instr.elided)
+                for address, instr in cls.sessions.items()
+            }
+
+    @classmethod
+    def closeAll(cls):
+        """Close every session in the pool followed by the shared ResourceManager"""
+        with cls.lock:
+            for VISA_ADDRESS in list(cls.sessions):
+                cls.close(VISA_ADDRESS)
+
+            if cls.rm is not None:
+                cls.rm.close()
+                cls.rm = None
@@ -0,0 +1,1185 @@
+"""Library containing a simulated VISA backend used to run the DUT Tests without any Instrument connected.
+
+    The ResourceManager below replaces the pyvisa ResourceManager when SessionPool.visa_library ends with
+    "@simulator", optionally preceded by the path of a JSON configuration file ("sim.json@simulator").
+    Every VISA Address opened is served by a simulated Instrument implementing the subset of SCPI sent
+    by Keysight.py, Keithley.py and IEEEStandard.py, so that DUT_Test.py, the drivers and the report
+    pipeline can be exercised on any computer.
+
+    The simulated Instruments are wired into a single Bench modelling the DUT:
+        - The PSU output follows its setpoints through an exponential settling, with the gain, offset,
+          output resistance and noise of the DUT error model. Its readback has errors of its own.
+        - The ELoad draws a constant current, holds a constant voltage or acts as a resistance. The PSU
+          enters CC mode when the load demands more than its current setting.
+        - A DMM measures either the output voltage (DMM_V) or the current through the shunt (DMM_I).
+          Every reading takes NPLC / line frequency seconds, twice as long with AutoZero, and its noise
+          decreases with the square root of the NPLC. The trigger model (INIT, BUS / EXT / IMM triggers,
+          trigger and sample counts, reading memory) is the one used by acquisition.py and listsweep.py.
+        - The Oscilloscope measures the edges of the PSU output captured since the last SINGLE.
+        - The IEEE 488.2 status registers (*ESR, *ESE, *SRE, *STB, *OPC) follow the pending measurement,
+          which drives the completion waits of sync.py in every mode (SRQ, STB and COND).
+
+    The part played by every VISA Address is taken from the "instruments" of the configuration file, or
+    from the keys of the dictionary of a DUT Test passed to ResourceManager.wire. Every transaction costs
+    the latency configured for its command, plus the transfer time of its bytes. Time is kept by a Clock,
+    so the passing of time can be replaced without changing the Instruments: the VirtualClock used by
+    the dry runs of src/estimate.py advances the time without waiting.
+
+    Example configuration file, every key is optional:
+
+        {
+            "seed": 0,
+            "line_frequency": 50,
+            "latency": {"write": 0.0003, "query": 0.0008, "byte": 1e-6, "commands": {"*RST": 0.1}},
+            "dut": {"gain": 0.0002, "offset": 0.003, "noise": 0.0005, "settling": 0.002},
+            "dmm": {"noise": 2e-5, "gain": 0.0},
+            "instruments": {"USB0::0x2A8D::0x1002::MY59001234::0::INSTR": "PSU"}
+        }
+
+"""
+
+import bisect
+import json
+import math
+import re
+import threading
+import time
+import types
+import zlib
+from collections import deque
+
+import numpy as np
+import pyvisa
+from pyvisa.constants import StatusCode
+
+
+def short(node):
+    """Short form of a SCPI keyword, e.g. "MEASURE" -> "MEAS", "CHANNEL1" -> "CHAN1", "RISETIME" -> "RIS" """
+    match = re.match(r"([A-Za-z]+)(\d*)$", node)
+    if match is None:
+        return node.upper()
+
+    word, suffix = match.groups()
+    word = word.upper()
+    if len(word) > 4:
+        word = word[:3] if word[3] in "AEIOU" else word[:4]
+
+    return word + suffix
+
+
+def number(text, default=0.0):
+    """Parse a SCPI numeric value, accepting the unit suffixes used by the GUI (e.g. "100mV", "10A")"""
+    match = re.match(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([mukMG]?)", str(text))
+    if match is None:
+        return default
+
+    value, prefix = match.groups()
+    return float(value) * {"": 1.0, "m": 1e-3, "u": 1e-6, "k": 1e3, "M": 1e6, "G": 1e9}[prefix]
+
+
+def state(text):
+    return str(text).strip().upper() in ("ON", "1")
+
+
+def scpi(value):
+    return f"{value:+.9E}"
+
+
+class Clock(object):
+    """Time of the simulation, the wall clock of the computer"""
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Time of a dry run, sleeping advances the time at once instead of waiting
+
+    The tasks run in parallel by the InstrumentExecutor are run one after another by parallel(), every
+    one of them starting at the same time, so that they take as long as the slowest of them.
+
+    Attributes:
+        time: Float containing the time (s) of the simulation.
+
+    """
+
+    def __init__(self, start=0.0):
+        self.time = float(start)
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.time += seconds
+
+    def parallel(self, tasks):
+        """Run the tasks one after another, as if they had been started at the same time
+
+        Returns:
+            Returns a list containing the value returned by every task, in the order they were given.
+        """
+        start = end = self.time
+        values = []
+        for task in tasks:
+            self.time = start
+            values.append(task())
+            end = max(end, self.time)
+
+        self.time = end
+        return values
+
+
+class Latency(object):
+    """Cost of a bus transaction
+
+    Attributes:
+        write: Float containing the time (s) taken by a write.
+        query: Float containing the time (s) taken by a query, on top of the time taken by the Instrument.
+        byte: Float containing the time (s) taken to transfer a single byte.
+        commands: Dictionary mapping the start of a header (e.g. "*RST" or "CONF") to the time (s) taken
+            by its transactions instead of write / query. The longest matching start is used.
+
+    """
+
+    def __init__(self, write=0.0003, query=0.0008, byte=1e-6, commands=None):
+        self.write = float(write)
+        self.query = float(query)
+        self.byte = float(byte)
+        self.commands = {header.upper(): float(cost) for header, cost in (commands or {}).items()}
+
+    def cost(self, header, size, query=False):
+        base = self.query if query else self.write
+        length = 0
+        for start, cost in self.commands.items():
+            if header.startswith(start) and len(start) > length:
+                base, length = cost, len(start)
+
+        return base + size * self.byte
+
+
+class DUT(object):
+    """Error model of the Device under Test
+
+    Attributes:
+        gain: Float containing the relative error of the programmed voltage.
+        offset: Float containing the offset (V) of the programmed voltage.
+        current_gain: Float containing the relative error of the programmed current.
+        current_offset: Float containing the offset (A) of the programmed current.
+        readback_gain: Float containing the relative error of the voltage and current readback.
+        readback_offset: Float containing the offset (V or A) of the voltage and current readback.
+        resistance: Float containing the output resistance (ohm), the load regulation of the DUT.
+        noise: Float containing the RMS noise (V) of the output.
+        readback_noise: Float containing the RMS noise of the readback.
+        settling: Float containing the time constant (s) of the output after a change of setpoint or load.
+
+    """
+
+    def __init__(
+        self,
+        gain=0.0002,
+        offset=0.003,
+        current_gain=0.0005,
+        current_offset=0.002,
+        readback_gain=0.0002,
+        readback_offset=0.002,
+        resistance=0.002,
+        noise=0.0005,
+        readback_noise=0.0002,
+        settling=0.002,
+    ):
+        self.gain = float(gain)
+        self.offset = float(offset)
+        self.current_gain = float(current_gain)
+        self.current_offset = float(current_offset)
+        self.readback_gain = float(readback_gain)
+        self.readback_offset = float(readback_offset)
+        self.resistance = float(resistance)
+        self.noise = float(noise)
+        self.readback_noise = float(readback_noise)
+        self.settling = float(settling)
+
+    def voltage(self, setpoint):
+        return setpoint * (1 + self.gain) + self.offset
+
+    def current(self, setpoint):
+        return setpoint * (1 + self.current_gain) + self.current_offset
+
+    def readback(self, value):
+        return value * (1 + self.readback_gain) + self.readback_offset
+
+
+class Bench(object):
+    """State of the DUT shared by every simulated Instrument
+
+    The output is a history of segments (start time, voltage and current at the start, voltage and
+    current settled to), one being added every time a setpoint or the load changes.
+
+    Attributes:
+        dut: DUT containing the error model.
+        clock: Clock keeping the time of the simulation.
+        rng: Numpy Generator drawing every noise, seeded for reproducible runs.
+        line_frequency: Float containing the power line frequency (Hz) of the DMM integration.
+        shunt: Float containing the resistance (ohm) of the shunt measured by DMM_I.
+        instruments: List of the simulated Instruments receiving the triggers of the bench.
+        psu: Dictionary containing the settings of the PSU output.
+        load: Dictionary containing the settings of the ELoad input.
+
+    """
+
+    HISTORY = 4096
+
+    def __init__(self, dut=None, clock=None, seed=None, line_frequency=50.0):
+        self.dut = dut or DUT()
+        self.clock = clock or Clock()
+        self.rng = np.random.default_rng(seed)
+        self.line_frequency = float(line_frequency)
+        self.shunt = 0.01
+        self.instruments = []
+        self.lock = threading.RLock()
+
+        self.psu = {"VOLT": 0.0, "CURR": 0.1, "OUTP": False}
+        self.load = {"FUNC": "CURR", "CURR": 0.0, "VOLT": 0.0, "RES": 1000.0, "INP": False, "SHOR": False}
+        self.times = [-math.inf]
+        self.segments = [(0.0, 0.0, 0.0, 0.0)]
+
+    def target(self):
+        """Voltage, current and mode (1 for CV, 2 for CC) the output settles to with the current settings"""
+        if not self.psu["OUTP"]:
+            return 0.0, 0.0, 1
+
+        dut = self.dut
+        voltage = dut.voltage(self.psu["VOLT"])
+        limit = max(dut.current(self.psu["CURR"]), 0.0)
+        load = self.load
+
+        if not load["INP"]:
+            return voltage, 0.0, 1
+
+        if load["SHOR"]:
+            return limit * dut.resistance, limit, 2
+
+        if load["FUNC"] == "VOLT":
+            if load["VOLT"] < voltage:
+                return max(load["VOLT"], 0.0), limit, 2
+            return voltage, 0.0, 1
+
+        if load["FUNC"] == "RES":
+            demand = voltage / max(load["RES"], 1e-6)
+        else:
+            demand = max(load["CURR"], 0.0)
+
+        if demand > limit:
+            return voltage * limit / demand, limit, 2
+
+        return voltage - dut.resistance * demand, demand, 1
+
+    def update(self, t=None):
+        """Start a new segment of the output at time t if the settings changed what it settles to"""
+        with self.lock:
+            t = self.clock.now() if t is None else t
+            voltage, current, _ = self.target()
+            if (voltage, current) == self.segments[-1][2:]:
+                return
+
+            start_voltage, start_current = self.value(t)
+            index = bisect.bisect_right(self.times, t)
+            del self.times[index:], self.segments[index:]
+            self.times.append(t)
+            self.segments.append((start_voltage, start_current, voltage, current))
+
+            if len(self.times) > self.HISTORY:
+                del self.times[1 : len(self.times) - self.HISTORY], self.segments[1 : len(self.segments) - self.HISTORY]
+
+    def value(self, t):
+        """Voltage and current of the output at time t, without noise"""
+        with self.lock:
+            index = bisect.bisect_right(self.times, t) - 1
+            start_voltage, start_current, voltage, current = self.segments[index]
+            elapsed = t - self.times[index]
+            if self.dut.settling <= 0 or elapsed == math.inf:
+                return voltage, current
+
+            decay = math.exp(-elapsed / self.dut.settling)
+            return (
+                voltage + (start_voltage - voltage) * decay,
+                current + (start_current - current) * decay,
+            )
+
+    def edges(self, start, stop):
+        """Segments starting between start and stop, as (time, voltage at the start, settled voltage)"""
+        with self.lock:
+            first = bisect.bisect_left(self.times, start)
+            last = bisect.bisect_right(self.times, stop)
+            return [
+                (self.times[index], self.segments[index][0], self.segments[index][2])
+                for index in range(first, last)
+            ]
+
+    def normal(self, sigma, size=None):
+        with self.lock:
+            return self.rng.normal(0.0, sigma, size) if sigma > 0 else (0.0 if size is None else np.zeros(size))
+
+    def voltage(self, t):
+        return self.value(t)[0] + self.normal(self.dut.noise)
+
+    def current(self, t):
+        return self.value(t)[1]
+
+    def mode(self):
+        return self.target()[2]
+
+    def trigger(self, t, sources):
+        """Send the trigger out of the PSU at time t to the Instruments waiting for an external trigger
+
+        Args:
+            t: Float containing the time of the trigger.
+            sources: Boolean selecting the sources (ELoad) or the meters (DMM) to be triggered, the
+                sources of a whole list are stepped before the meters read it.
+        """
+        for instrument in self.instruments:
+            if instrument.SOURCE == sources:
+                with instrument.lock:
+                    instrument.externalTrigger(t)
+
+
+class Instrument(object):
+    """Simulated VISA resource of one Instrument
+
+    The common commands of IEEE 488.2 and the status registers are implemented here, the Instruments
+    add their own commands in handle (writes) and respond (queries). A setting that is not simulated is
+    stored as it is, and returned when it is queried.
+
+    Attributes:
+        resource_name: String containing the VISA Address of the Instrument.
+        bench: Bench the Instrument is wired to.
+        latency: Latency of the transactions.
+        settings: Dictionary mapping the header of every setting written to its value.
+        esr: Integer containing the Event Status Register, with Power On (128) set when opened.
+        ese: Integer containing the Event Status Enable Register.
+        sre: Integer containing the Service Request Enable Register.
+        errors: Deque containing the error queue read by SYST:ERR?.
+        busy_until: Float containing the time the pending operation is completed.
+        transactions: Integer counting the writes and queries received.
+
+    """
+
+    MODEL = "Simulated Instrument"
+    SOURCE = None
+    NO_ERROR = '+0,"No error"'
+
+    def __init__(self, resource_name, bench, latency):
+        self.resource_name = resource_name
+        self.bench = bench
+        self.clock = bench.clock
+        self.latency = latency
+        self.lock = threading.RLock()
+        self.timeout = 2000
+        self.baud_rate = 9600
+        self.read_termination = None
+        self.write_termination = "\n"
+        self.settings = {}
+        self.esr = 128
+        self.ese = 0
+        self.sre = 0
+        self.opc = False
+        self.errors = deque(maxlen=20)
+        self.busy_until = 0.0
+        self.transactions = 0
+        self.events = set()
+        self.serial = "SIM%05d" % (zlib.crc32(resource_name.encode()) % 100000)
+        self.reset()
+
+    def reset(self):
+        self.settings.clear()
+
+    # --- VISA resource -------------------------------------------------------------------------
+
+    def transaction(self, command, size, query=False):
+        self.transactions += 1
+        self.clock.sleep(self.latency.cost(self.parse(command)[0], size, query))
+
+    def write(self, command):
+        with self.lock:
+            self.transaction(command, len(command) + 1)
+            for part in command.split(";"):
+                if part.strip():
+                    self.execute(part)
+
+            return len(command) + 1
+
+    def query(self, command, delay=None):
+        with self.lock:
+            self.transaction(command, len(command) + 1, query=True)
+            response = self.ask(command) + "\n"
+            self.clock.sleep(len(response) * self.latency.byte)
+            return response
+
+    def query_binary_values(self, command, datatype="f", is_big_endian=False, container=list, **kwargs):
+        with self.lock:
+            self.transaction(command, len(command) + 1, query=True)
+            header, _, args = self.parse(command)
+            values = self.respondBinary(header.rstrip("?"), args)
+            if values is None:
+                self.timedOut(-113, "Undefined header")
+
+            values = np.asarray(values)
+            self.clock.sleep(values.size * np.dtype(datatype).itemsize * self.latency.byte)
+            return container(values.astype(np.dtype(datatype)))
+
+    def read_stb(self):
+        with self.lock:
+            self.transaction("*STB?", 0, query=True)
+            return self.statusByte()
+
+    def enable_event(self, event_type, mechanism, context=None):
+        self.events.add(event_type)
+
+    def disable_event(self, event_type, mechanism):
+        self.events.discard(event_type)
+
+    def discard_events(self, event_type, mechanism):
+        pass
+
+    def wait_on_event(self, event_type, timeout, capture_timeout=False):
+        """Wait for the Service Request raised when the pending operation completes"""
+        with self.lock:
+            if event_type not in self.events:
+                raise pyvisa.VisaIOError(StatusCode.error_invalid_event)
+
+            completion = self.pending() if self.opc and self.sre & 32 and self.ese & 1 else math.inf
+            if not self.statusByte() & 64:
+                remaining = completion - self.clock.now()
+                if remaining > timeout / 1000:
+                    self.clock.sleep(timeout / 1000)
+                    if capture_timeout:
+                        return types.SimpleNamespace(event_type=event_type, timed_out=True)
+                    raise pyvisa.VisaIOError(StatusCode.error_timeout)
+
+                self.clock.sleep(remaining)
+
+            return types.SimpleNamespace(event_type=event_type, timed_out=False)
+
+    def clear(self):
+        with self.lock:
+            self.opc = False
+
+    def close(self):
+        pass
+
+    # --- Status registers ----------------------------------------------------------------------
+
+    def pending(self):
+        """Time the pending operation is completed, infinite while waiting for a trigger"""
+        return self.busy_until
+
+    def busy(self, duration):
+        """Start an operation taking the given time after the pending one, returning its start time"""
+        start = max(self.clock.now(), self.busy_until)
+        self.busy_until = start + duration
+        return start
+
+    def waitPending(self):
+        """Block until the pending operation has been completed, as a query waiting for it would"""
+        remaining = self.pending() - self.clock.now()
+        if remaining > self.timeout / 1000:
+            self.timedOut(-214, "Trigger deadlock" if self.pending() == math.inf else "Timeout")
+        self.clock.sleep(remaining)
+
+    def timedOut(self, code, message):
+        self.errors.append(f'{code},"{message}"')
+        self.clock.sleep(self.timeout / 1000)
+        raise pyvisa.VisaIOError(StatusCode.error_timeout)
+
+    def eventStatus(self):
+        if self.opc and self.clock.now() >= self.pending():
+            self.esr |= 1
+            self.opc = False
+
+        return self.esr
+
+    def statusByte(self):
+        stb = 4 if self.errors else 0
+        if self.eventStatus() & self.ese:
+            stb |= 32
+        if stb & self.sre:
+            stb |= 64
+
+        return stb
+
+    # --- SCPI parser ---------------------------------------------------------------------------
+
+    @staticmethod
+    def parse(command):
+        """Split a command into its header in short form, channel list and arguments
+
+        Returns:
+            Returns a tuple, e.g. ("VOLT", "1", ["5"]) for "VOLTage 5,(@1)".
+        """
+        command = command.strip()
+        header, _, value = command.partition(" ")
+        if "?" in header and not header.endswith("?"):
+            header, _, rest = header.partition("?")
+            header, value = header + "?", rest + " " + value
+
+        channel = ""
+        match = re.search(r"\(@([^)]*)\)", value)
+        if match is not None:
+            channel = match.group(1).strip()
+            value = value[: match.start()] + value[match.end() :]
+
+        nodes = [short(node) for node in header.strip(":").rstrip("?").split(":")]
+        while len(nodes) > 1 and nodes[-1] == "IMM":
+            nodes.pop()
+        header = ":".join(nodes) + ("?" if header.endswith("?") else "")
+        args = [arg.strip() for arg in value.split(",") if arg.strip()]
+
+        return header, channel, args
+
+    def execute(self, command):
+        header, channel, args = self.parse(command)
+
+        if header == "*CLS":
+            self.esr = 0
+            self.opc = False
+            self.errors.clear()
+        elif header == "*ESE":
+            self.ese = int(number(args[0])) if args else 0
+        elif header == "*SRE":
+            self.sre = int(number(args[0])) if args else 0
+        elif header == "*OPC":
+            self.opc = True
+        elif header == "*WAI":
+            self.waitPending()
+        elif header == "*RST":
+            self.busy_until = 0.0
+            self.reset()
+        elif header == "*TRG":
+            self.busTrigger()
+        elif header.startswith("*"):
+            pass
+        elif not self.handle(header, channel, args):
+            self.settings[header] = ",".join(args)
+
+    def ask(self, command):
+        header, channel, args = self.parse(command)
+        header = header.rstrip("?")
+
+        if header == "*IDN":
+            return f"Keysight Technologies,{self.MODEL},{self.serial},1.0.0"
+        if header == "*OPC":
+            self.waitPending()
+            return "1"
+        if header == "*ESR":
+            esr = self.eventStatus()
+            self.esr = 0
+            return str(esr)
+        if header == "*STB":
+            return str(self.statusByte())
+        if header == "*ESE":
+            return str(self.ese)
+        if header == "*SRE":
+            return str(self.sre)
+        if header == "*TST":
+            return "+0"
+        if header == "SYST:ERR":
+            return self.errors.popleft() if self.errors else self.NO_ERROR
+        if header == "SYST:VERS":
+            return "1999.0"
+
+        response = self.respond(header, channel, args)
+        if response is not None:
+            return response
+        if header in self.settings:
+            return self.settings[header]
+
+        self.timedOut(-113, "Undefined header")
+
+    def handle(self, header, channel, args):
+        """Apply a write, returning False if it is only stored as a setting"""
+        return False
+
+    def respond(self, header, channel, args):
+        """Answer a query, returning None if it is not simulated"""
+        return None
+
+    def respondBinary(self, header, args):
+        return None
+
+    def busTrigger(self):
+        pass
+
+    def externalTrigger(self, t):
+        pass
+
+
+class PowerSupply(Instrument):
+    """Simulated DC Power Supply, the output of the DUT"""
+
+    MODEL = "E36731A"
+    SOURCE = None
+
+    def reset(self):
+        super().reset()
+        with self.bench.lock:
+            self.bench.psu.update({"VOLT": 0.0, "CURR": 0.1, "OUTP": False})
+        self.bench.update()
+        self.lists = {"VOLT": [], "CURR": [], "DWEL": [0.01]}
+        self.functionMode = {"VOLT": "FIX", "CURR": "FIX"}
+        self.initiated = False
+
+    def handle(self, header, channel, args):
+        bench = self.bench
+
+        if header == "APPL":
+            with bench.lock:
+                bench.psu["VOLT"] = number(args[1])
+                if len(args) > 2:
+                    bench.psu["CURR"] = number(args[2])
+        elif header in ("VOLT", "CURR"):
+            with bench.lock:
+                bench.psu[header] = number(args[0])
+        elif header == "OUTP" and args:
+            with bench.lock:
+                bench.psu["OUTP"] = state(args[0])
+        elif header in ("VOLT:MODE", "CURR:MODE"):
+            self.functionMode[header[:4]] = short(args[0])
+            return False
+        elif header in ("LIST:VOLT", "LIST:CURR", "LIST:DWEL"):
+            self.lists[header[5:]] = [number(arg) for arg in args]
+            return False
+        elif header == "INIT:TRAN":
+            self.initiated = True
+            return True
+        elif header == "TRIG:TRAN":
+            self.transientTrigger()
+            return True
+        else:
+            return False
+
+        bench.update()
+        return False
+
+    def busTrigger(self):
+        if short(self.settings.get("TRIG:TRAN:SOUR", "BUS")) == "BUS":
+            self.transientTrigger()
+
+    def transientTrigger(self):
+        """Step through the lists of the output, sending a trigger out at the beginning of every step"""
+        if not self.initiated:
+            return
+        self.initiated = False
+
+        function = "VOLT" if self.functionMode["VOLT"] == "LIST" else "CURR"
+        if self.functionMode[function] != "LIST":
+            return
+
+        values = self.lists[function]
+        dwells = self.lists["DWEL"] or [0.01]
+        bost = state(self.settings.get("LIST:TOUT:BOST", "OFF"))
+        start = self.busy(sum(dwells[index % len(dwells)] for index in range(len(values))))
+
+        times = []
+        t = start
+        bench = self.bench
+        for index, value in enumerate(values):
+            times.append(t)
+            with bench.lock:
+                bench.psu[function] = value
+            if bost:
+                bench.trigger(t, sources=True)
+            bench.update(t)
+            t += dwells[index % len(dwells)]
+
+        if bost:
+            for t in times:
+                bench.trigger(t, sources=False)
+
+    def respond(self, header, channel, args):
+        bench = self.bench
+
+        if header == "STAT:OPER:COND":
+            return f"+{bench.mode()}"
+
+        if header.startswith(("MEAS", "FETC")) and header.endswith(("VOLT", "VOLT:DC", "CURR", "CURR:DC")):
+            if header.startswith("MEAS"):
+                # The readback is integrated over one power line cycle
+                start = self.busy(1 / bench.line_frequency) + 0.5 / bench.line_frequency
+                self.waitPending()
+            else:
+                start = self.clock.now()
+
+            voltage, current = bench.value(start)
+            value = voltage if ":VOLT" in header else current
+            return scpi(bench.dut.readback(value) + bench.normal(bench.dut.readback_noise))
+
+        if header in ("VOLT", "CURR"):
+            return scpi(bench.psu[header])
+        if header == "OUTP":
+            return "1" if bench.psu["OUTP"] else "0"
+
+        return None
+
+
+class ElectronicLoad(Instrument):
+    """Simulated Electronic Load drawing the output of the DUT"""
+
+    MODEL = "EL34243A"
+    SOURCE = True
+
+    def reset(self):
+        super().reset()
+        with self.bench.lock:
+            self.bench.load.update(
+                {"FUNC": "CURR", "CURR": 0.0, "VOLT": 0.0, "RES": 1000.0, "INP": False, "SHOR": False}
+            )
+        self.bench.update()
+        self.lists = {"VOLT": [], "CURR": [], "RES": []}
+        self.functionMode = {"VOLT": "FIX", "CURR": "FIX", "RES": "FIX"}
+        self.initiated = False
+        self.step = 0
+        self.acquired = 0.0
+
+    def handle(self, header, channel, args):
+        bench = self.bench
+
+        if header == "FUNC":
+            with bench.lock:
+                bench.load["FUNC"] = short(args[0])
+        elif header in ("VOLT", "CURR", "RES"):
+            with bench.lock:
+                bench.load[header] = number(args[0])
+        elif header in ("OUTP", "INP") and args:
+            with bench.lock:
+                bench.load["INP"] = state(args[0])
+        elif header == "INP:SHOR":
+            with bench.lock:
+                bench.load["SHOR"] = state(args[0])
+        elif header in ("VOLT:MODE", "CURR:MODE", "RES:MODE"):
+            self.functionMode[header.partition(":")[0]] = short(args[0])
+            return False
+        elif header in ("LIST:VOLT", "LIST:CURR", "LIST:RES"):
+            self.lists[header[5:]] = [number(arg) for arg in args]
+            return False
+        elif header == "INIT:TRAN":
+            self.initiated = True
+            self.step = 0
+            return True
+        elif header in ("INIT:ACQ", "TRIG:ACQ"):
+            self.acquired = self.clock.now()
+            return True
+        else:
+            return False
+
+        bench.update()
+        return False
+
+    def externalTrigger(self, t):
+        """Advance the list of the input by one step at time t"""
+        if not self.initiated or short(self.settings.get("TRIG:TRAN:SOUR", "IMM")) != "EXT":
+            return
+
+        for function, mode in self.functionMode.items():
+            if mode == "LIST" and self.step < len(self.lists[function]):
+                with self.bench.lock:
+                    self.bench.load[function] = self.lists[function][self.step]
+                self.bench.update(t)
+
+        self.step += 1
+        if all(self.step >= len(values) for values in self.lists.values()):
+            self.initiated = False
+
+    def respond(self, header, channel, args):
+        if header.startswith(("MEAS", "FETC")) and header.endswith(("VOLT", "CURR", "POW")):
+            if header.startswith("MEAS"):
+                start = self.busy(1 / self.bench.line_frequency) + 0.5 / self.bench.line_frequency
+                self.waitPending()
+            else:
+                start = self.clock.now()
+
+            voltage = self.bench.voltage(start)
+            current = self.bench.current(start)
+            return scpi({"VOLT": voltage, "CURR": current, "POW": voltage * current}[header[-4:].strip(":")])
+
+        if header in ("VOLT", "CURR", "RES"):
+            return scpi(self.bench.load[header])
+        if header == "FUNC":
+            return self.bench.load["FUNC"]
+
+        return None
+
+    def respondBinary(self, header, args):
+        """Digitized array of the last acquisition, FETC:ARR:VOLT? / CURR? / POW?"""
+        if not header.startswith("FETC:ARR"):
+            return None
+
+        points = int(number(self.settings.get("SENS:SWE:POIN", 1024)))
+        interval = number(self.settings.get("SENS:TINT", 2.048e-5))
+        t = self.acquired + np.arange(points) * interval
+        voltage = np.array([self.bench.value(sample)[0] for sample in t]) + self.bench.normal(
+            self.bench.dut.noise, points
+        )
+        current = np.array([self.bench.value(sample)[1] for sample in t])
+        return {"VOLT": voltage, "CURR": current, "POW": voltage * current}[header[-4:].strip(":")]
+
+
+class Multimeter(Instrument):
+    """Simulated Digital Multimeter measuring the voltage or the shunt current of the DUT
+
+    Attributes:
+        measurand: String containing what the DMM is wired to, "V" for the output or "I" for the shunt.
+        noise: Float containing the RMS noise (V) of a reading integrated over 1 NPLC.
+        gain: Float containing the relative error of the readings.
+
+    """
+
+    MODEL = "34470A"
+    SOURCE = False
+    OVERLOAD = 9.9e37
+
+    def __init__(self, resource_name, bench, latency, measurand="V", noise=2e-5, gain=0.0):
+        self.measurand = measurand
+        self.noise = float(noise)
+        self.gain = float(gain)
+        super().__init__(resource_name, bench, latency)
+
+    def reset(self):
+        super().reset()
+        self.function = "VOLT"
+        self.nplc = 10.0
+        self.autozero = True
+        self.range = None
+        self.source = "IMM"
+        self.count = 1
+        self.samples = 1
+        self.delay = 0.0
+        self.binary = False
+        self.memory = []
+        self.triggers = 0
+
+    def configure(self, function):
+        self.function = "CURR" if function.startswith("CURR") else "VOLT"
+        self.range = None
+        self.source = "IMM"
+        self.count = 1
+        self.samples = 1
+        self.delay = 0.0
+
+    def handle(self, header, channel, args):
+        if header.startswith("CONF"):
+            self.configure(header[5:] or "VOLT")
+        elif header.endswith("NPLC"):
+            self.nplc = number(args[0], 10.0)
+        elif header.endswith(":APER"):
+            self.nplc = number(args[0]) * self.bench.line_frequency
+        elif header.endswith("ZERO:AUTO"):
+            self.autozero = short(args[0]) != "OFF"
+        elif header.endswith("RANG:AUTO"):
+            self.range = None if state(args[0]) else self.range
+        elif header.endswith("RANG"):
+            value = number(args[0], -1)
+            self.range = value if value > 0 else None
+        elif header == "TRIG:SOUR":
+            self.source = short(args[0])
+        elif header == "TRIG:COUN":
+            self.count = max(int(number(args[0], 1)), 1)
+        elif header == "SAMP:COUN":
+            self.samples = max(int(number(args[0], 1)), 1)
+        elif header == "TRIG:DEL":
+            self.delay = number(args[0])
+        elif header == "FORM:DATA":
+            self.binary = short(args[0]) == "REAL"
+        elif header == "SYST:LFR":
+            self.bench.line_frequency = number(args[0], 50.0)
+        elif header == "INIT":
+            self.initiate()
+        elif header == "ABOR":
+            self.triggers = 0
+        else:
+            return False
+
+        return header in ("INIT", "ABOR")
+
+    def integration(self):
+        """Time (s) taken by a single reading"""
+        duration = self.nplc / self.bench.line_frequency
+        return 2 * duration if self.autozero else duration
+
+    def initiate(self):
+        self.memory = []
+        self.triggers = self.count
+        if self.source == "IMM":
+            for _ in range(self.count):
+                self.measure(self.clock.now())
+
+    def busTrigger(self):
+        if self.triggers and self.source == "BUS":
+            self.measure(self.clock.now())
+
+    def externalTrigger(self, t):
+        if self.triggers and self.source == "EXT":
+            self.measure(t)
+
+    def measure(self, t):
+        """Take the samples of one trigger received at time t into the reading memory"""
+        integration = self.integration()
+        start = max(t + self.delay, self.busy_until)
+        self.busy_until = start + self.samples * integration
+        self.triggers -= 1
+
+        sigma = self.noise / math.sqrt(max(self.nplc, 1e-3))
+        for sample in range(self.samples):
+            middle = start + (sample + 0.5) * integration
+            self.memory.append(self.reading(middle, sigma))
+
+    def reading(self, t, sigma):
+        bench = self.bench
+        if self.measurand == "I":
+            current = bench.current(t)
+            value = current if self.function == "CURR" else current * bench.shunt
+        else:
+            value = bench.voltage(t)
+
+        value = value * (1 + self.gain) + bench.normal(sigma)
+        if self.range is not None and abs(value) > 1.2 * self.range:
+            return self.OVERLOAD
+
+        return value
+
+    def pending(self):
+        return math.inf if self.triggers else self.busy_until
+
+    def respond(self, header, channel, args):
+        if header == "FETC":
+            self.waitPending()
+            return ",".join(scpi(value) for value in self.memory)
+
+        if header == "READ":
+            self.initiate()
+            self.waitPending()
+            return ",".join(scpi(value) for value in self.memory)
+
+        if header.startswith("MEAS"):
+            self.configure(header[5:] or "VOLT")
+            self.initiate()
+            self.waitPending()
+            return scpi(self.memory[0])
+
+        if header == "STAT:OPER:COND":
+            # Bit 4 while measuring, bit 9 once the measurement is complete
+            return "+16" if self.clock.now() < self.pending() else "+512"
+
+        if header == "DATA:POIN":
+            return str(len(self.memory))
+        if header == "DATA:LAST":
+            return scpi(self.memory[-1]) if self.memory else scpi(self.OVERLOAD)
+        if header == "TRIG:SOUR":
+            return self.source
+        if header == "TRIG:COUN":
+            return scpi(self.count)
+        if header == "SAMP:COUN":
+            return scpi(self.samples)
+        if header == "SYST:LFR":
+            return scpi(self.bench.line_frequency)
+
+        return None
+
+    def respondBinary(self, header, args):
+        if header != "FETC":
+            return None
+
+        self.waitPending()
+        return self.memory
+
+
+class Oscilloscope(Instrument):
+    """Simulated Oscilloscope probing the output of the DUT"""
+
+    MODEL = "DSO6104A"
+    SOURCE = None
+    NO_EDGE = 9.9e37
+
+    def reset(self):
+        super().reset()
+        self.armed = -math.inf
+
+    def handle(self, header, channel, args):
+        if header in ("SING", "RUN", "DIG"):
+            self.armed = self.clock.now()
+            return True
+
+        return False
+
+    def window(self):
+        return self.armed, self.clock.now()
+
+    def thresholds(self, low, high):
+        """Lower and upper threshold (V) of an edge from low to high"""
+        if short(self.settings.get("MEAS:THR", "PERC")).startswith("VOLT"):
+            return (
+                number(self.settings.get("MEAS:LOW", low)),
+                number(self.settings.get("MEAS:UPP", high)),
+            )
+
+        return low + 0.1 * (high - low), low + 0.9 * (high - low)
+
+    def edgeTime(self, rising):
+        """Time between the lower and upper thresholds of the first edge captured since SINGLE"""
+        tau = self.bench.dut.settling
+        for t, start, target in self.bench.edges(*self.window()):
+            if (target > start) != rising or target == start:
+                continue
+
+            low, high = sorted((start, target))
+            lower, upper = self.thresholds(low, high)
+            first, second = (lower, upper) if rising else (upper, lower)
+            crossings = []
+            for level in (first, second):
+                remaining = (target - level) / (target - start)
+                if remaining <= 0:
+                    break
+                crossings.append(0.0 if remaining >= 1 else -tau * math.log(remaining))
+
+            if len(crossings) == 2:
+                return abs(crossings[1] - crossings[0]) * (1 + self.bench.normal(0.005))
+
+        return self.NO_EDGE
+
+    def respond(self, header, channel, args):
+        if header == "MEAS:RIS":
+            return scpi(self.edgeTime(True))
+        if header == "MEAS:FALL":
+            return scpi(self.edgeTime(False))
+        if header in ("MEAS:VMAX", "MEAS:VMIN"):
+            start, stop = self.window()
+            values = [self.bench.value(max(start, self.bench.times[1] if len(self.bench.times) > 1 else stop))[0]]
+            values.append(self.bench.value(stop)[0])
+            values += [voltage for _, voltage, _ in self.bench.edges(start, stop)]
+            return scpi(max(values) if header == "MEAS:VMAX" else min(values))
+        if header == "WAV:PRE":
+            return ",".join(str(value) for value in self.preamble())
+
+        return None
+
+    def preamble(self):
+        """WORD waveform preamble: format, type, points, count, x increment, origin, reference, y ..."""
+        points = int(number(self.settings.get("WAV:POIN", 1000)))
+        span = 10 * number(self.settings.get("TIM:MAIN:SCAL", self.settings.get("TIM:SCAL", 1e-3)))
+        source = self.settings.get("WAV:SOUR", "CHAN1").replace("CHANNEL", "CHAN")
+        scale = number(self.settings.get(source + ":SCAL", 1.0))
+        offset = number(self.settings.get(source + ":OFFS", 0.0))
+
+        edges = self.bench.edges(*self.window())
+        centre = edges[0][0] if edges else self.clock.now() - span / 2
+        return [1, 0, points, 1, span / points, centre - span / 2, 0, 8 * scale / 65536, offset, 32768]
+
+    def respondBinary(self, header, args):
+        if header != "WAV:DATA":
+            return None
+
+        _, _, points, _, x_increment, x_origin, x_reference, y_increment, y_origin, y_reference = self.preamble()
+        t = (np.arange(points) - x_reference) * x_increment + x_origin
+        voltage = np.array([self.bench.value(sample)[0] for sample in t])
+        voltage += self.bench.normal(self.bench.dut.noise, points)
+        return np.clip(np.round((voltage - y_origin) / y_increment + y_reference), 0, 65535)
+
+
+class ResourceManager(object):
+    """Drop-in replacement of the pyvisa ResourceManager serving simulated Instruments
+
+    Attributes:
+        bench: Bench shared by every Instrument opened.
+        latency: Latency of the transactions of every Instrument.
+        roles: Dictionary mapping a VISA Address to its role, a key of ROLES.
+        measurands: Dictionary mapping the VISA Address of a DMM to the quantity it measures, "V" or "I".
+        resources: Dictionary mapping a VISA Address to its opened simulated Instrument.
+
+    """
+
+    # Keys of the dictionaries of the DUT Tests containing a VISA Address, with the Instrument and the
+    # quantity measured by the DMMs
+    ROLES = {
+        "PSU": (PowerSupply, None),
+        "ELoad": (ElectronicLoad, None),
+        "DMM_V": (Multimeter, "V"),
+        "DMM_I": (Multimeter, "I"),
+        "DMM": (Multimeter, "V"),
+        "OSC": (Oscilloscope, None),
+    }
+
+    def __init__(self, path="", clock=None):
+        config = {}
+        if path:
+            with open(path) as file:
+                config = json.load(file)
+
+        self.config = config
+        self.bench = Bench(
+            DUT(**config.get("dut", {})),
+            clock,
+            seed=config.get("seed"),
+            line_frequency=config.get("line_frequency", 50),
+        )
+        self.latency = Latency(**config.get("latency", {}))
+        self.dmm = config.get("dmm", {})
+        self.roles = {}
+        self.measurands = {}
+        self.resources = {}
+        for address, role in config.get("instruments", {}).items():
+            self.assign(address, role)
+
+    def wire(self, dict):
+        """Assign the role of every VISA Address of the dictionary of a DUT Test
+
+        A DMM under the "DMM" key measures the output voltage, except in Load Regulation (CC) where it
+        measures the current of the DUT.
+        """
+        for key in self.ROLES:
+            if dict.get(key):
+                self.assign(dict[key], key, dict.get("Test"))
+
+        self.bench.shunt = float(dict.get("shuntResistance") or self.bench.shunt)
+
+    def assign(self, address, role, test=None):
+        if role not in self.ROLES:
+            raise ValueError(f"Unknown role {role!r} of {address}, expected one of {list(self.ROLES)}")
+
+        measurand = self.ROLES[role][1]
+        if role == "DMM" and test == "Load Regulation (CC)":
+            measurand = "I"
+
+        self.roles[address] = role
+        self.measurands[address] = measurand
+        if isinstance(self.resources.get(address), Multimeter):
+            self.resources[address].measurand = measurand
+
+    def open_resource(self, resource_name, **kwargs):
+        if resource_name in self.resources:
+            return self.resources[resource_name]
+
+        role = self.roles.get(resource_name)
+        if role not in self.ROLES:
+            raise pyvisa.VisaIOError(StatusCode.error_resource_not_found)
+
+        cls = self.ROLES[role][0]
+        if cls is Multimeter:
+            resource = Multimeter(
+                resource_name, self.bench, self.latency, measurand=self.measurands[resource_name], **self.dmm
+            )
+        else:
+            resource = cls(resource_name, self.bench, self.latency)
+
+        self.bench.instruments.append(resource)
+        self.resources[resource_name] = resource
+        return resource
+
+    def list_resources(self, query="?*::INSTR"):
+        return tuple(self.roles)
+
+    def close(self):
+        self.resources.clear()
+        self.bench.instruments.clear()
@@ -0,0 +1,234 @@
+"""Library containing the opt-in latency tracing of every SCPI transaction sent through the SessionPool.
+
+    Every Subsystem of the Instrument Libraries sends its commands through self.instr, the Session of
+    SessionPool.py. While a Tracer is started, the Session times every write, query, binary query, serial
+    poll (read_stb) and wait for a service request, and records its VISA Address, command, start time,
+    duration and bytes. When no Tracer is started the Session only checks a class attribute, so the
+    drivers run as fast as without tracing.
+
+    The records of a run are aggregated into a histogram of the durations of every command header, and
+    exported to a Chrome trace (trace.json), which can be opened in chrome://tracing or ui.perfetto.dev
+    to see the timeline of every Instrument, with a track per VISA Address:
+
+        tracer = Tracer.start()
+        ...run the DUT Test...
+        Tracer.stop()
+        tracer.writeChromeTrace("trace.json")
+        tracer.writeSummary("latency.csv")
+
+"""
+
+import bisect
+import csv
+import json
+import math
+import struct
+import threading
+from time import perf_counter
+
+
+class Tracer(object):
+    """Collects the timing of the SCPI transactions of every Session
+
+    Attributes:
+        records: List of tuples (address, kind, command, start, duration, sent, received, error), with the
+            start relative to the start of the Tracer and the durations in seconds.
+        origin: Float containing the perf_counter value of the start of the Tracer.
+        BINS: Upper bounds in seconds of the buckets of the histograms, the last bucket is unbounded.
+
+    """
+
+    BINS = [1e-5 * 2**n for n in range(22)]
+
+    def __init__(self):
+        self.records = []
+        self.origin = perf_counter()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def start(cls):
+        """Create a Tracer and install it on every Session, opened or not
+
+        Returns:
+            Returns the installed Tracer.
+        """
+        from library.SessionPool import Session
+
+        tracer = cls()
+        Session.tracer = tracer
+        return tracer
+
+    @classmethod
+    def stop(cls):
+        """Remove the installed Tracer, the Sessions stop timing their transactions
+
+        Returns:
+            Returns the Tracer that was installed, None if tracing was not started.
+        """
+        from library.SessionPool import Session
+
+        tracer, Session.tracer = Session.tracer, None
+        return tracer
+
+    def call(self, address, kind, command, function, *args, **kwargs):
+        """Call a method of a VISA resource, recording its duration and bytes
+
+        Args:
+            address: String containing the VISA Address of the resource.
+            kind: String containing the type of transaction, e.g. "write", "query" or "read_stb".
+            command: String containing the SCPI command sent, or the name of the transaction.
+            function: Method of the resource to be called with the remaining arguments.
+
+        Returns:
+            Returns the value returned by the method.
+        """
+        error = ""
+        response = None
+        start = perf_counter()
+        try:
+            response = function(*args, **kwargs)
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = perf_counter() - start
+            self.record(address, kind, command, start - self.origin, duration, response, error, kwargs)
+
+    def record(self, address, kind, command, start, duration, response, error, kwargs):
+        sent = len(command) + 1 if kind in ("write", "query", "query_binary_values") else 0
+        if isinstance(response, str):
+            received = len(response)
+        elif kind == "query_binary_values" and response is not None:
+            received = len(response) * struct.calcsize(kwargs.get("datatype", "f"))
+        else:
+            received = 0
+
+        with self.lock:
+            self.records.append((address, kind, command, start, duration, sent, received, error))
+
+    @staticmethod
+    def header(command):
+        """Header of a command, without its channel list and values, e.g. "VOLT" for "VOLT 5,(@1)"
+
+        Queries keep their question mark so that "VOLT?" and "VOLT" are aggregated separately.
+        """
+        return command.strip().partition(" ")[0].upper()
+
+    def histograms(self):
+        """Aggregate the durations of the transactions of every command header
+
+        Returns:
+            Returns a dictionary mapping (kind, header) to a dictionary containing the count, total,
+            mean, median, 95th percentile and maximum duration in seconds, the bytes sent and received,
+            the number of errors and the counts of every bucket of BINS.
+        """
+        groups = {}
+        with self.lock:
+            records = list(self.records)
+        for address, kind, command, start, duration, sent, received, error in records:
+            groups.setdefault((kind, self.header(command)), []).append((duration, sent, received, error))
+
+        histograms = {}
+        for key, group in groups.items():
+            durations = sorted(entry[0] for entry in group)
+            counts = [0] * (len(self.BINS) + 1)
+            for duration in durations:
+                counts[bisect.bisect_left(self.BINS, duration)] += 1
+
+            histograms[key] = {
+                "count": len(durations),
+                "total": sum(durations),
+                "mean": sum(durations) / len(durations),
+                "median": self.percentile(durations, 50),
+                "p95": self.percentile(durations, 95),
+                "max": durations[-1],
+                "sent": sum(entry[1] for entry in group),
+                "received": sum(entry[2] for entry in group),
+                "errors": sum(1 for entry in group if entry[3]),
+                "buckets": counts,
+            }
+        return histograms
+
+    @staticmethod
+    def percentile(durations, q):
+        """Nearest rank percentile of a sorted list"""
+        return durations[max(0, math.ceil(q / 100 * len(durations)) - 1)]
+
+    def summary(self, top=15):
+        """Text table of the command headers taking the most time, heaviest first"""
+        histograms = sorted(self.histograms().items(), key=lambda item: item[1]["total"], reverse=True)
+        lines = [
+            f"{'kind':<20} {'header':<24} {'count':>7} {'total s':>9} {'mean ms':>9} "
+            f"{'p95 ms':>9} {'max ms':>9} {'bytes':>9}"
+        ]
+        for (kind, header), h in histograms[:top]:
+            lines.append(
+                f"{kind:<20} {header:<24} {h['count']:>7} {h['total']:>9.3f} {1000 * h['mean']:>9.3f} "
+                f"{1000 * h['p95']:>9.3f} {1000 * h['max']:>9.3f} {h['sent'] + h['received']:>9}"
+            )
+        return "\n".join(lines)
+
+    def writeSummary(self, path):
+        """Write the histograms to a csv file, one row per command header
+
+        Args:
+            path: String containing the path of the csv file.
+        """
+        buckets = [f"<={bound * 1000:g}ms" for bound in self.BINS] + [f">{self.BINS[-1] * 1000:g}ms"]
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(
+                ["kind", "header", "count", "total_s", "mean_s", "median_s", "p95_s", "max_s",
+                 "bytes_sent", "bytes_received", "errors"] + buckets
+            )
+            for (kind, header), h in sorted(self.histograms().items()):
+                writer.writerow(
+                    [kind, header, h["count"], h["total"], h["mean"], h["median"], h["p95"], h["max"],
+                     h["sent"], h["received"], h["errors"]] + h["buckets"]
+                )
+
+    def chromeTrace(self):
+        """Events of the Chrome trace event format, a track (thread) per VISA Address
+
+        Returns:
+            Returns a dictionary which can be dumped to a JSON file loaded by chrome://tracing or Perfetto.
+        """
+        with self.lock:
+            records = list(self.records)
+
+        tracks = {}
+        events = []
+        for address, kind, command, start, duration, sent, received, error in records:
+            if address not in tracks:
+                tracks[address] = len(tracks) + 1
+                events.append(
+                    {"name": "thread_name", "ph": "M", "pid": 1, "tid": tracks[address],
+                     "args": {"name": address}}
+                )
+            args = {"command": command, "bytes_sent": sent, "bytes_received": received}
+            if error:
+                args["error"] = error
+            events.append(
+                {
+                    "name": self.header(command),
+                    "cat": kind,
+                    "ph": "X",
+                    "ts": round(start * 1e6, 3),
+                    "dur": round(duration * 1e6, 3),
+                    "pid": 1,
+                    "tid": tracks[address],
+                    "args": args,
+                }
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def writeChromeTrace(self, path):
+        """Write the timeline of the transactions to a JSON file in the Chrome trace event format
+
+        Args:
+            path: String containing the path of the JSON file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.chromeTrace(), file)
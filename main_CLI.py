@@ -0,0 +1,92 @@
+"""Command line entry point running test campaigns without the Graphical User Interface
+
+    python main_CLI.py campaign.json [--output FOLDER] [--no-report] [--no-store] [--stop-on-error]
+                                     [--visa-library @simulator] [--trace] [--resume] [--verbose]
+    python main_CLI.py campaign.json --dry-run
+    python main_CLI.py --calibrate TRACE [TRACE ...]
+
+The format of the campaign file is described in src/campaign.py. The exit code is 0 when every run
+completed without failed points, and 1 otherwise. A dry run only estimates the duration of every run,
+using the latency model calibrated with --calibrate from the trace.json files of earlier runs (see
+src/estimate.py).
+
+"""
+
+import argparse
+import sys
+
+from src.campaign import Campaign
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a campaign of DUT Tests without the GUI")
+    parser.add_argument("campaign", nargs="?", help="JSON file listing the configurations of the tests")
+    parser.add_argument("--output", help="folder of the runs, campaign_output/<campaign> by default")
+    parser.add_argument("--no-report", action="store_true", help="do not generate the Excel reports")
+    parser.add_argument("--no-store", action="store_true", help="do not record the runs in the ResultStore")
+    parser.add_argument("--stop-on-error", action="store_true", help="stop at the first run raising an error")
+    parser.add_argument(
+        "--visa-library",
+        default="",
+        help='VISA library of pyvisa, e.g. "@py", or "[config.json]@simulator" for simulated Instruments',
+    )
+    parser.add_argument(
+        "--trace", action="store_true", help="write the latency of every SCPI command to latency.csv and trace.json"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the interrupted runs of the output folder from the points recorded in their journal",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only estimate the duration of every run, without any Instrument"
+    )
+    parser.add_argument(
+        "--calibrate",
+        nargs="+",
+        metavar="TRACE",
+        help="calibrate the latency model of the dry runs from the trace.json files of earlier runs",
+    )
+    parser.add_argument("--verbose", action="store_true", help="print every measured point")
+    args = parser.parse_args(argv)
+    if args.campaign is None and not args.calibrate:
+        parser.error("the campaign is required unless --calibrate is given")
+
+    if args.calibrate:
+        from src.estimate import DryRun
+
+        latency = DryRun.calibrate(args.calibrate)
+        print(
+            f"Latency model of {len(latency['commands'])} commands written to {DryRun.LATENCY}: "
+            f"write {latency['write'] * 1000:.3f} ms, query {latency['query'] * 1000:.3f} ms"
+        )
+        if args.campaign is None:
+            return 0
+
+    from library.SessionPool import SessionPool
+
+    SessionPool.visa_library = args.visa_library
+
+    options = dict(
+        report=not args.no_report,
+        store=not args.no_store,
+        stop=args.stop_on_error,
+        verbose=args.verbose,
+        trace=args.trace,
+        resume=args.resume,
+    )
+    if args.output:
+        options["output"] = args.output
+
+    campaign = Campaign.fromFile(args.campaign, **options)
+    if args.dry_run:
+        estimates = campaign.estimate()
+        return 0 if all(estimate is not None for estimate in estimates) else 1
+
+    summary = campaign.run()
+
+    return 0 if all(entry["status"] in ("PASS", "DONE") for entry in summary) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,22 +24,179 @@ from PyQt5.QtWidgets import (
     QGridLayout,
 )
 
-from src.DUT_Test import (
-    VoltageMeasurement,
-    CurrentMeasurement,
-    VisaResourceManager,
-    LoadRegulation,
-    RiseFallTime,
-    ProgrammingSpeedTest,
-)
-from src.data import *
-from src.xlreport import xlreport
-from src.xlreport import xlreport_Regulation
+# The DUT Tests, analysis, plotting, reporting and VISA stacks are imported by the methods using
+# them, so that the window opens before pandas, matplotlib, openpyxl and pyvisa are loaded
+from src.progress import Progress
+from src.worker import TestWorker
 
 desp_font = QFont("Arial", 10)
 desp_font.setWeight(QFont.Bold)
 AdvancedSettingsList = []
 
+
+class TestDialog(object):
+    """Mixin of the DUT Test dialogs running the test in a TestWorker instead of the GUI thread
+
+    Every completed point is appended to the OutputBox with its verdict and the estimated time left
+    while the dialog stays responsive. Once the test has completed, testCompleted is called with the
+    value returned by the test method, which dialogs override to generate their reports.
+
+    Closing the dialog while a test runs asks to stop it. The test is cancelled after the current point
+    and the dialog closes once the TestWorker has stopped, so no result arrives after it was closed.
+    The mixin comes before QDialog in the bases of the dialogs so that its closeEvent and reject apply.
+    """
+
+    worker = None
+    closing = False
+    # Dry run before every test, enabled by the checkbox of the main window
+    estimateDuration = False
+
+    def runTest(self, function, dict, judge=None, progress=True):
+        if self.worker is not None and self.worker.isRunning():
+            QMessageBox.warning(self, "In Progress", "A test is already running")
+            return
+
+        self.dict = dict
+        if not self.confirmDuration(function, dict):
+            return
+
+        self.journal(function, dict)
+        self.worker = TestWorker(function, self, dict, judge, progress)
+        self.worker.point.connect(self.pointCompleted)
+        self.worker.completed.connect(self.testCompleted)
+        self.worker.failed.connect(self.testFailed)
+        self.worker.cancelled.connect(self.testCancelled)
+        self.closing = False
+        self.worker.start()
+
+    def closeEvent(self, event):
+        if self.worker is None or not self.worker.isRunning():
+            event.accept()
+            return
+
+        event.ignore()
+        if self.closing:
+            return
+        if (
+            QMessageBox.question(self, "Stop Test", "A test is running, stop it and close the window?")
+            != QMessageBox.Yes
+        ):
+            return
+
+        self.closing = True
+        self.worker.finished.connect(self.close)
+        if self.worker.cancel():
+            self.OutputBox.append("Stopping the test after the current point...")
+        else:
+            self.OutputBox.append("This test cannot be stopped, the window closes once it has completed")
+
+    def reject(self):
+        # Escape closes the dialog through reject, which bypasses closeEvent
+        if self.worker is not None and self.worker.isRunning():
+            self.close()
+        else:
+            super().reject()
+
+    def pointCompleted(self, index, total, info, data, verdict, eta):
+        self.OutputBox.append(f"Point {index}/{total} {verdict}  ETA: {eta:.1f} s")
+
+    def testCompleted(self, result):
+        self.OutputBox.append(my_result.getvalue())
+        self.OutputBox.append("Measurement is complete !")
+
+    def testCancelled(self, message):
+        """The points of an accuracy sweep measured so far are kept in its journal and can be resumed"""
+        self.OutputBox.append(my_result.getvalue())
+        self.OutputBox.append(message)
+
+    def testFailed(self, message):
+        """Keep the window open, the points measured so far are kept in the journal of the run"""
+        import os
+
+        self.OutputBox.append(my_result.getvalue())
+        if os.path.exists(self.dict["Journal"]):
+            message += (
+                f"\n\nThe points measured so far are kept in {self.dict['Journal']}, the test can be "
+                "resumed from the next point once the error has been fixed."
+            )
+        QMessageBox.warning(self, "Error", message)
+
+    def confirmDuration(self, function, dict):
+        """Estimate the duration of the test with a dry run, and let the user start it or not
+
+        The dry run is simulated in virtual time, see src/estimate.py, and blocks the window for up to
+        a second on large sweeps, so it is only made if estimateDuration is enabled. A test the dry run
+        fails for is started without an estimate. The dry run replaces the SessionPool, clock and
+        output of the whole process, so no estimate is made while the test of another dialog is running.
+        """
+        if not self.estimateDuration:
+            return True
+
+        from src.estimate import DryRun
+
+        if TestWorker.anyRunning():
+            self.OutputBox.append("The duration is not estimated while another test is running")
+            return True
+
+        try:
+            estimate = DryRun().estimate(function, dict)
+        except Exception as e:
+            self.OutputBox.append(f"The duration of the test could not be estimated: {e}")
+            return True
+
+        self.OutputBox.append(f"Estimated duration: {DryRun.format(estimate)}")
+        return (
+            QMessageBox.question(
+                self, "Estimated Duration", f"Estimated duration: {DryRun.format(estimate)}\n\nStart the test?"
+            )
+            == QMessageBox.Yes
+        )
+
+    def journal(self, function, dict):
+        """Journal every point of the run, and offer to resume the previous run if it did not complete
+
+        The journal is only used by the step sweeps of the accuracy tests, see src/journal.py.
+        """
+        import os
+
+        from src.journal import RunJournal
+
+        dict.setdefault("Journal", os.path.join("results", "journal", function.__name__ + ".jsonl"))
+        points = RunJournal.unfinished(dict)
+        dict["Resume"] = bool(points) and (
+            QMessageBox.question(
+                self,
+                "Resume",
+                f"A run with the same parameters stopped after {points} points, resume it?",
+            )
+            == QMessageBox.Yes
+        )
+        if dict["Resume"]:
+            from library.SessionPool import SessionPool
+
+            # The Sessions of the interrupted run are still open, every setting is written again
+            SessionPool.invalidate()
+
+    def saveCSV(self, *sinks):
+        """Keep the data of the report in the csv folder, as the report did when it was built from csv files"""
+        try:
+            for save in sinks:
+                save()
+        except OSError as error:
+            self.OutputBox.append(f"CSV files could not be saved: {error}")
+
+    def storeResults(self, test_type, data, instrument):
+        """Keep the run in the ResultStore, a failure to store it does not stop the report"""
+        import sqlite3
+
+        from src.store import ResultStore
+
+        try:
+            with ResultStore() as store:
+                store.record(test_type, data, self.dict, instrument.data)
+        except sqlite3.Error as error:
+            self.OutputBox.append(f"Results could not be stored: {error}")
+
 class tab(QTabWidget):
     """Class containing all the tabs which displays the available types of DUT Tests available"""
 
@@ -179,22 +336,31 @@ class Window(QMainWindow):
         QButton_Widget.setText("Confirm")
         QButton_Widget.setDefault(False)
 
+        QCheckBox_Estimate_Widget = QCheckBox()
+        QCheckBox_Estimate_Widget.setText("Estimate the duration before starting a test")
+        QCheckBox_Estimate_Widget.setChecked(TestDialog.estimateDuration)
+
         layout1.addWidget(QLabel_Widget)
 
         mainLayout.addLayout(layout1)
         mainLayout.addWidget(Tab)
+        mainLayout.addWidget(QCheckBox_Estimate_Widget)
         mainLayout.addWidget(QButton_Widget)
         widget = QWidget()
         widget.setLayout(mainLayout)
         self.setCentralWidget(widget)
 
         QButton_Widget.clicked.connect(self.PushBtnClicked)
+        QCheckBox_Estimate_Widget.stateChanged.connect(self.checkbox_state_Estimate)
         Tab.currentChanged.connect(self.currentTabChanged)
         self.CurrentTab = 0
 
     def currentTabChanged(self, s):
         self.CurrentTab = s
 
+    def checkbox_state_Estimate(self, s):
+        TestDialog.estimateDuration = s == Qt.Checked
+
     def PushBtnClicked(self):
         if self.CurrentTab == 0:
             dlg = VoltageMeasurementDialog()
@@ -221,7 +387,7 @@ class Window(QMainWindow):
             dlg.exec()
 
 
-class VoltageMeasurementDialog(QDialog):
+class VoltageMeasurementDialog(TestDialog, QDialog):
     """Class for configuring the voltage measurement DUT Tests Dialog.
     A widget is declared for each parameter that can be customized by the user. These widgets can come in
     the form of QLineEdit, or QComboBox where user can select their preferred parameters. When the widgets
@@ -333,6 +499,11 @@ class VoltageMeasurementDialog(QDialog):
         QComboBox_set_Function.setEnabled(False)
         QComboBox_Voltage_Sense.addItems(["2 Wire", "4 Wire"])
 
+        QLabel_SweepMode = QLabel()
+        QLabel_SweepMode.setText("Sweep Mode:")
+        QComboBox_SweepMode = QComboBox()
+        QComboBox_SweepMode.addItems(["Step", "List"])
+
         # Shunt 
         QLabel_Shunt = QLabel()
         QLabel_Shunt.setText("Resistance (Ohm):")
@@ -377,6 +548,7 @@ class VoltageMeasurementDialog(QDialog):
         layout1.addRow(QLabel_Prog_Accuracy_Offset, QLineEdit_Prog_Accuracy_Offset)
         layout1.addRow(QLabel_Rdbk_Accuracy_Gain, QLineEdit_Rdbk_Accuracy_Gain)
         layout1.addRow(QLabel_Rdbk_Accuracy_Offset, QLineEdit_Rdbk_Accuracy_Offset)
+        layout1.addRow(QLabel_SweepMode, QComboBox_SweepMode)
         layout1.addRow(Desp5)
         layout1.addRow(QLabel_Shunt, QLineEdit_Shunt)
         layout1.addRow(Desp3)
@@ -413,6 +585,7 @@ class VoltageMeasurementDialog(QDialog):
         self.ELoad_Channel = ""
         self.PSU_Channel = ""
         self.DMM_Instrument = "Keysight"
+        self.SweepMode = "Step"
 
         self.setFunction = "Current"
         self.VoltageRes = "SLOW"
@@ -463,6 +636,7 @@ class VoltageMeasurementDialog(QDialog):
             self.set_VoltageSense_changed
         )
         QComboBox_DMM_Instrument.currentTextChanged.connect(self.DMM_Instrument_changed)
+        QComboBox_SweepMode.currentTextChanged.connect(self.SweepMode_changed)
         QCheckBox_Report_Widget.stateChanged.connect(self.checkbox_state_Report)
         QCheckBox_Image_Widget.stateChanged.connect(self.checkbox_state_Image)
         QPushButton_Widget1.clicked.connect(self.executeTest)
@@ -471,6 +645,9 @@ class VoltageMeasurementDialog(QDialog):
     def DMM_Instrument_changed(self, s):
         self.DMM_Instrument = s
 
+    def SweepMode_changed(self, s):
+        self.SweepMode = s
+
     def PSU_VisaAddress_changed(self, s):
         self.PSU = s
 
@@ -582,6 +759,10 @@ class VoltageMeasurementDialog(QDialog):
         optionally export all the details into a CSV file or display a graph after the test is completed.
 
         """
+        from library.Registry import DriverRegistry
+        from src.DUT_Test import VoltageMeasurement, VisaResourceManager
+        from src.data import dictGenerator
+
         self.infoList = []
         self.dataList = []
 
@@ -618,6 +799,7 @@ class VoltageMeasurementDialog(QDialog):
             InputZ=AdvancedSettingsList[3],
             UpTime=AdvancedSettingsList[4],
             DownTime=AdvancedSettingsList[5],
+            SweepMode=self.SweepMode,
             Terminal=AdvancedSettingsList[6],
         )
         QMessageBox.warning(
@@ -644,47 +826,46 @@ class VoltageMeasurementDialog(QDialog):
                 QMessageBox.warning(self, "VISA IO ERROR", string)
                 exit()
 
-            if self.DMM_Instrument == "Keysight":
-                try:
-                    (
-                        infoList,
-                        dataList,
-                    ) = VoltageMeasurement.executeVoltageMeasurementA(self, dict)
+            judge = Progress.accuracy(
+                float(self.Prog_Accuracy_Gain), float(self.Prog_Accuracy_Offset), 0
+            )
+            if self.SweepMode == "List" and DriverRegistry.supports(self.DMM_Instrument, "list"):
+                self.runTest(VoltageMeasurement.executeVoltageMeasurementList, dict, judge)
 
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", str(e))
-                    exit()
+            elif self.DMM_Instrument == "Keysight":
+                self.runTest(VoltageMeasurement.executeVoltageMeasurementA, dict, judge)
 
             elif self.DMM_Instrument == "Keithley":
-                try:
-                    (
-                        infoList,
-                        dataList,
-                    ) = VoltageMeasurement.executeVoltageMeasurementB(self, dict)
-                except Exception as e:
-                    QMessageBox.warning(self, e)
-                    exit()
-            self.OutputBox.append(my_result.getvalue())
-            self.OutputBox.append("Measurement is complete !")
-
-            if self.checkbox_data_Report == 2:
-                instrumentData(self.PSU, self.DMM_V, self.ELoad)
-                datatoCSV_Accuracy(infoList, dataList, flag_VI=1)
-                datatoGraph(infoList, dataList, flag_VI=1)
-                datatoGraph.scatterCompareVoltage(
-                    self, float(self.Prog_Accuracy_Gain), float(self.Prog_Accuracy_Offset), float(self.Rdbk_Accuracy_Gain), float(self.Rdbk_Accuracy_Offset)
-                )
-                A = xlreport()
-                A.run()
-                df = pd.DataFrame.from_dict(dict,orient="index")
-                df.to_csv("csv/config.csv")
+                self.runTest(VoltageMeasurement.executeVoltageMeasurementB, dict, judge)
+
+    def testCompleted(self, result):
+        """Generate the report once the worker has completed the test"""
+        from src.data import configData, datatoGraph, instrumentData
+        from src.xlreport import xlreport
 
-            if self.checkbox_data_Image == 2:
-                dlg = image_Window()
-                dlg.exec()
+        results = result
+        self.OutputBox.append(my_result.getvalue())
+        self.OutputBox.append("Measurement is complete !")
+
+        if self.checkbox_data_Report == 2:
+            instrument = instrumentData(self.PSU, self.DMM_V, self.ELoad)
+            config = configData(self.dict)
+            graph = datatoGraph(results, flag_VI=1)
+            error = graph.scatterCompareVoltage(
+                float(self.Prog_Accuracy_Gain), float(self.Prog_Accuracy_Offset), float(self.Rdbk_Accuracy_Gain), float(self.Rdbk_Accuracy_Offset)
+            )
+            self.storeResults("Voltage Accuracy", error, instrument)
+            self.saveCSV(graph.save, graph.saveError, instrument.save, config.save)
+
+            A = xlreport()
+            A.run(error, instrument.data, config.data)
+
+        if self.checkbox_data_Image == 2:
+            dlg = image_Window()
+            dlg.exec()
 
 
-class CurrentMeasurementDialog(QDialog):
+class CurrentMeasurementDialog(TestDialog, QDialog):
     """Class for configuring the current measurement DUT Tests Dialog.
     A widget is declared for each parameter that can be customized by the user. These widgets can come in
     the form of QLineEdit, or QComboBox where user can select their preferred parameters. When the widgets
@@ -796,6 +977,11 @@ class CurrentMeasurementDialog(QDialog):
         QComboBox_Current_Sense.addItems(["2 Wire", "4 Wire"])
         QComboBox_Range.addItems(["Auto", "10mA", "100mA", "1A", "3A"])
 
+        QLabel_SweepMode = QLabel()
+        QLabel_SweepMode.setText("Sweep Mode:")
+        QComboBox_SweepMode = QComboBox()
+        QComboBox_SweepMode.addItems(["Step", "List"])
+
         # Shunt 
         QLabel_Shunt = QLabel()
         QLabel_Shunt.setText("Resistance (Ohm):")
@@ -843,6 +1029,7 @@ class CurrentMeasurementDialog(QDialog):
         layout1.addRow(QLabel_Prog_Accuracy_Offset, QLineEdit_Prog_Accuracy_Offset)
         layout1.addRow(QLabel_Rdbk_Accuracy_Gain, QLineEdit_Rdbk_Accuracy_Gain)
         layout1.addRow(QLabel_Rdbk_Accuracy_Offset, QLineEdit_Rdbk_Accuracy_Offset)
+        layout1.addRow(QLabel_SweepMode, QComboBox_SweepMode)
         layout1.addRow(Desp5)
         layout1.addRow(QLabel_Shunt, QLineEdit_Shunt)
         layout1.addRow(Desp3)
@@ -878,6 +1065,7 @@ class CurrentMeasurementDialog(QDialog):
         self.ELoad_Channel = ""
         self.PSU_Channel = ""
         self.DMM_Instrument = "Keysight"
+        self.SweepMode = "Step"
         self.setFunction = "Voltage"
         self.CurrentRes = "SLOW"
         self.CurrentSense = "INT"
@@ -927,6 +1115,7 @@ class CurrentMeasurementDialog(QDialog):
             self.set_CurrentSense_changed
         )
         QComboBox_DMM_Instrument.currentTextChanged.connect(self.DMM_Instrument_changed)
+        QComboBox_SweepMode.currentTextChanged.connect(self.SweepMode_changed)
         QCheckBox_Report_Widget.stateChanged.connect(self.checkbox_state_Report)
         QCheckBox_Image_Widget.stateChanged.connect(self.checkbox_state_Image)
         QPushButton_Widget1.clicked.connect(self.executeTest)
@@ -935,6 +1124,9 @@ class CurrentMeasurementDialog(QDialog):
     def DMM_Instrument_changed(self, s):
         self.DMM_Instrument = s
 
+    def SweepMode_changed(self, s):
+        self.SweepMode = s
+
     def PSU_VisaAddress_changed(self, s):
         self.PSU = s
 
@@ -1046,6 +1238,10 @@ class CurrentMeasurementDialog(QDialog):
         optionally export all the details into a CSV file or display a graph after the test is completed.
 
         """
+        from library.Registry import DriverRegistry
+        from src.DUT_Test import CurrentMeasurement, VisaResourceManager
+        from src.data import dictGenerator
+
         self.infoList = []
         self.dataList = []
         dict = []
@@ -1080,6 +1276,7 @@ class CurrentMeasurementDialog(QDialog):
             Terminal=AdvancedSettingsList[3],
             UpTime=AdvancedSettingsList[4],
             DownTime=AdvancedSettingsList[5],
+            SweepMode=self.SweepMode,
             InputZ=AdvancedSettingsList[6],
         )
         QMessageBox.warning(
@@ -1107,47 +1304,43 @@ class CurrentMeasurementDialog(QDialog):
                 QMessageBox.warning(self, "VISA IO ERROR", string)
                 exit()
 
-            if self.DMM_Instrument == "Keysight":
-                try:
-                    (
-                        dataList,
-                        infoList,
-                    ) = CurrentMeasurement.executeCurrentMeasurementA(self, dict)
+            judge = Progress.accuracy(
+                float(self.Prog_Accuracy_Gain), float(self.Prog_Accuracy_Offset), 1
+            )
+            if self.SweepMode == "List" and DriverRegistry.supports(self.DMM_Instrument, "list"):
+                self.runTest(CurrentMeasurement.executeCurrentMeasurementList, dict, judge)
 
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", str(e))
-                    exit()
+            elif self.DMM_Instrument == "Keysight":
+                self.runTest(CurrentMeasurement.executeCurrentMeasurementA, dict, judge)
 
             elif self.DMM_Instrument == "Keithley":
-                try:
-                    (
-                        dataList,
-                        infoList,
-                    ) = CurrentMeasurement.executeCurrentMeasurementB(self, dict)
-                except Exception as e:
-                    QMessageBox.warning(self, e)
-                    exit()
-
-            self.OutputBox.append(my_result.getvalue())
-            self.OutputBox.append("Measurement is complete !")
-
-            if self.checkbox_data_Report == 2:
-                instrumentData(self.PSU, self.DMM_I, self.ELoad)
-                datatoCSV_Accuracy(infoList, dataList, flag_VI=2)
-                datatoGraph(infoList, dataList, flag_VI=2)
-                datatoGraph.scatterCompareCurrent(
-                    self, float(self.Prog_Accuracy_Gain), float(self.Prog_Accuracy_Offset), float(self.Rdbk_Accuracy_Gain), float(self.Rdbk_Accuracy_Offset)
-                )
+                self.runTest(CurrentMeasurement.executeCurrentMeasurementB, dict, judge)
 
-                A = xlreport()
-                A.run()
+    def testCompleted(self, result):
+        """Generate the report once the worker has completed the test"""
+        from src.data import configData, datatoGraph, instrumentData
+        from src.xlreport import xlreport
 
-                df = pd.DataFrame.from_dict(dict, orient="index")
-                df.to_csv("csv/config.csv")
+        results = result
+        self.OutputBox.append(my_result.getvalue())
+        self.OutputBox.append("Measurement is complete !")
 
-            if self.checkbox_data_Image == 2:
-                dlg = image_Window()
-                dlg.exec()
+        if self.checkbox_data_Report == 2:
+            instrument = instrumentData(self.PSU, self.DMM_I, self.ELoad)
+            config = configData(self.dict)
+            graph = datatoGraph(results, flag_VI=2)
+            error = graph.scatterCompareCurrent(
+                float(self.Prog_Accuracy_Gain), float(self.Prog_Accuracy_Offset), float(self.Rdbk_Accuracy_Gain), float(self.Rdbk_Accuracy_Offset)
+            )
+            self.storeResults("Current Accuracy", error, instrument)
+            self.saveCSV(graph.save, graph.saveError, instrument.save, config.save)
+
+            A = xlreport()
+            A.run(error, instrument.data, config.data)
+
+        if self.checkbox_data_Image == 2:
+            dlg = image_Window()
+            dlg.exec()
 
 
 class AdvancedSetting_Voltage(QDialog):
@@ -1373,7 +1566,7 @@ class image_Window(QDialog):
         self.show()
 
 
-class CV_LoadRegulationDialog(QDialog):
+class CV_LoadRegulationDialog(TestDialog, QDialog):
     """Class for configuring the Load Regulation under CV Mode DUT Tests Dialog.
     A widget is declared for each parameter that can be customized by the user. These widgets can come in
     the form of QLineEdit, or QComboBox where user can select their preferred parameters. When the widgets
@@ -1624,6 +1817,8 @@ class CV_LoadRegulationDialog(QDialog):
         are connected. Then the actual DUT Tests will commence. Depending on the users selection, the method can
         optionally export all the details into a CSV file or display a graph after the test is completed.
         """
+        from src.DUT_Test import VisaResourceManager, LoadRegulation
+        from src.data import dictGenerator
 
         self.infoList = []
         self.dataList = []
@@ -1677,39 +1872,39 @@ class CV_LoadRegulationDialog(QDialog):
                 exit()
 
             if self.DMM_Instrument == "Keysight":
-                try:
-                    infoList, dataList = LoadRegulation.executeCV_LoadRegulationB(self, dict)
-
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", str(e))
-                    exit()
+                self.runTest(LoadRegulation.executeCV_LoadRegulationB, dict)
 
             elif self.DMM_Instrument == "Keithley":
-                try:
-                    LoadRegulation.executeCV_LoadRegulationA(self, dict)
+                self.runTest(LoadRegulation.executeCV_LoadRegulationA, dict, progress=False)
+
+    def testCompleted(self, result):
+        """Generate the report once the worker has completed the test"""
+        from src.data import configData, datatoCSV_Regulation, instrumentData
+        from src.xlreport import xlreport_Regulation
 
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", str(e))
-                    exit()
+        self.OutputBox.append(my_result.getvalue())
+        self.OutputBox.append("Measurement is complete !")
 
-            self.OutputBox.append(my_result.getvalue())
-            self.OutputBox.append("Measurement is complete !")
+        if result is None:
+            return
 
+        if self.checkbox_data_Report == 2:
+            infoList, dataList = result
+            instrument = instrumentData(self.PSU, self.DMM, self.ELoad)
+            config = configData(self.dict)
+            regulation = datatoCSV_Regulation(infoList, dataList)
+            self.storeResults("Load Regulation (CV)", regulation.data, instrument)
+            self.saveCSV(regulation.save, instrument.save, config.save)
 
-            if self.checkbox_data_Report == 2:
-                instrumentData(self.PSU, self.DMM, self.ELoad)
-                datatoCSV_Regulation(infoList, dataList)
-                A = xlreport_Regulation()
-                A.run()
-                df = pd.DataFrame.from_dict(dict,orient="index")
-                df.to_csv("csv/config.csv")
+            A = xlreport_Regulation()
+            A.run(regulation.data, instrument.data, config.data)
 
     def openDialog(self):
         dlg = AdvancedSetting_Voltage()
         dlg.exec()
 
 
-class CC_LoadRegulationDialog(QDialog):
+class CC_LoadRegulationDialog(TestDialog, QDialog):
     """Class for configuring the  Load Regulation under CC Mode DUT Tests Dialog.
     A widget is declared for each parameter that can be customized by the user. These widgets can come in
     the form of QLineEdit, or QComboBox where user can select their preferred parameters. When the widgets
@@ -1980,6 +2175,9 @@ class CC_LoadRegulationDialog(QDialog):
         optionally export all the details into a CSV file or display a graph after the test is completed.
 
         """
+        from src.DUT_Test import VisaResourceManager, LoadRegulation
+        from src.data import dictGenerator
+
         dict = dictGenerator.input(
             Instrument=self.DMM_Instrument,
             Error_Gain=self.Error_Gain,
@@ -2031,28 +2229,17 @@ class CC_LoadRegulationDialog(QDialog):
                 exit()
 
             if self.DMM_Instrument == "Keysight":
-                try:
-                    LoadRegulation.executeCC_LoadRegulationB(self, dict)
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", str(e))
-                    exit()
+                self.runTest(LoadRegulation.executeCC_LoadRegulationB, dict, progress=False)
 
             elif self.DMM_Instrument == "Keithley":
-                try:
-                    LoadRegulation.executeCC_LoadRegulationA(self, dict)
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", str(e))
-                    exit()
-
-            self.OutputBox.append(my_result.getvalue())
-            self.OutputBox.append("Measurement is complete !")
+                self.runTest(LoadRegulation.executeCC_LoadRegulationA, dict, progress=False)
 
     def openDialog(self):
         dlg = AdvancedSetting_Current()
         dlg.exec()
 
 
-class TransientRecoveryTime(QDialog):
+class TransientRecoveryTime(TestDialog, QDialog):
     """Class for configuring the Transient Recovery Time DUT Tests Dialog.
     A widget is declared for each parameter that can be customized by the user. These widgets can come in
     the form of QLineEdit, or QComboBox where user can select their preferred parameters. When the widgets
@@ -2281,6 +2468,9 @@ class TransientRecoveryTime(QDialog):
         optionally export all the details into a CSV file or display a graph after the test is completed.
 
         """
+        from src.DUT_Test import VisaResourceManager, RiseFallTime
+        from src.data import dictGenerator
+
         dict = dictGenerator.input(
             Instrument="Keysight",
             PSU=self.PSU,
@@ -2328,16 +2518,7 @@ class TransientRecoveryTime(QDialog):
                 QMessageBox.warning(self, "VISA IO ERROR", string)
                 exit()
 
-            try:
-                RiseFallTime.execute(self, dict)
-
-            except Exception as e:
-                print(e)
-                QMessageBox.warning(self, "Error", str(e))
-                exit()
-
-            self.OutputBox.append(my_result.getvalue())
-            self.OutputBox.append("Measurement is complete !")
+            self.runTest(RiseFallTime.execute, dict, progress=False)
 
     def Channel_CouplingMode_changed(self, s):
         self.Channel_CouplingMode = s
@@ -2404,7 +2585,7 @@ class TransientRecoveryTime(QDialog):
         self.Voltage_Rating = s
 
 
-class ProgrammingSpeed(QDialog):
+class ProgrammingSpeed(TestDialog, QDialog):
     """Class for configuring the Programming Speed DUT Tests Dialog.
     A widget is declared for each parameter that can be customized by the user. These widgets can come in
     the form of QLineEdit, or QComboBox where user can select their preferred parameters. When the widgets
@@ -2580,6 +2761,9 @@ class ProgrammingSpeed(QDialog):
         optionally export all the details into a CSV file or display a graph after the test is completed.
 
         """
+        from src.DUT_Test import VisaResourceManager, ProgrammingSpeedTest
+        from src.data import dictGenerator
+
         dict = dictGenerator.input(
             Instrument="Keysight",
             PSU=self.PSU,
@@ -2621,16 +2805,7 @@ class ProgrammingSpeed(QDialog):
                 QMessageBox.warning(self, "VISA IO ERROR", string)
                 exit()
 
-            try:
-                ProgrammingSpeedTest.execute(self, dict)
-
-            except Exception as e:
-                print(e)
-                QMessageBox.warning(self, "Error", str(e))
-                exit()
-
-        self.OutputBox.append(my_result.getvalue())
-        self.OutputBox.append("Measurement is complete !")
+            self.runTest(ProgrammingSpeedTest.execute, dict, progress=False)
 
     def V_Upper_changed(self, s):
         self.V_Upper = s
@@ -7,6 +7,7 @@
 
 """
 
+import os
 import pyvisa
 import sys
 from time import sleep
@@ -14,66 +15,22 @@ import numpy as np
 
 sys.path.insert(
     1,
-    r"library//"
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "library")
 )
 
+from library.AsyncSession import AsyncSession, AsyncSubsystem
 from library.IEEEStandard import OPC, WAI, TRG, RST
-
-
-class Dimport:
-    """Class to control which library will be dynamically imported"""
-
-    def __init__():
-        pass
-
-    def getClasses(module_name):
-        """Declare the module based on the module name given
-
-        Args:
-            module_name: Determines which library will the program import from
-
-        Returns:
-            Returns a set of Modules imported from a library
-        """
-
-        module = __import__(module_name)
-        Read = getattr(module, "Read")
-        Apply = getattr(module, "Apply")
-        Display = getattr(module, "Display")
-        Function = getattr(module, "Function")
-        Output = getattr(module, "Output")
-        Sense = getattr(module, "Sense")
-        Configure = getattr(module, "Configure")
-        Delay = getattr(module, "Delay")
-        Trigger = getattr(module, "Trigger")
-        Sample = getattr(module, "Sample")
-        Initiate = getattr(module, "Initiate")
-        Fetch = getattr(module, "Fetch")
-        Status = getattr(module, "Status")
-        Voltage = getattr(module, "Voltage")
-        Current = getattr(module, "Current")
-        Oscilloscope = getattr(module, "Oscilloscope")
-        Measure = getattr(module, "Measure")
-
-        return (
-            Read,
-            Apply,
-            Display,
-            Function,
-            Output,
-            Sense,
-            Configure,
-            Delay,
-            Trigger,
-            Sample,
-            Initiate,
-            Fetch,
-            Status,
-            Voltage,
-            Current,
-            Oscilloscope,
-            Measure,
-        )
+from library.Registry import DriverRegistry
+from library.SessionPool import SessionPool
+from src.sync import CompletionWait
+from src.parallel import InstrumentExecutor
+from src.listsweep import ListSweep
+from src.acquisition import BufferedAcquisition, Waveform
+from src.results import ResultBuffer
+from src.settling import Settling
+from src.precision import AdaptivePrecision
+from src.journal import RunJournal
+from src.planner import SweepPlanner
 
 
 class VisaResourceManager:
@@ -85,14 +42,18 @@ class VisaResourceManager:
     """
 
     def __init__(self):
-        """Initiate the object rm as Resource Manager"""
-        rm = pyvisa.ResourceManager()
+        """Initiate the object rm as the Resource Manager shared by the SessionPool"""
+        rm = SessionPool.resourceManager()
         self.rm = rm
 
     def openRM(self, *args):
         """Open the VISA Resources to be used
 
-        The program also initiates and standardize certain specifications such as the baud rate.
+        The resources are opened into the SessionPool, where every Subsystem of the Instrument Libraries
+        will reuse the same session until closeRM is called. The program also initiates and standardize
+        certain specifications such as the baud rate, and clears the shadow register of the settings of
+        every Instrument, since the settings may have been changed since the last test (e.g. from the
+        front panel, a power cycle or the List mode), so that every test starts by writing them all.
 
             Args:
                 *args: to declare single or multiple VISA Resources
@@ -106,8 +67,9 @@ class VisaResourceManager:
         """
         try:
             for i in range(len(args)):
-                instr = self.rm.open_resource(args[i])
+                instr = SessionPool.open(args[i])
                 instr.baud_rate = 9600
+                instr.invalidate()
 
             return 1, None
         except pyvisa.VisaIOError as e:
@@ -115,8 +77,68 @@ class VisaResourceManager:
             return 0, e.args
 
     def closeRM(self):
-        """Closes the Visa Resources when not in used"""
-        self.rm.close()
+        """Closes the Visa Resources in the SessionPool when not in used, and the threads of the AsyncSession"""
+        AsyncSession.shutdown()
+        SessionPool.closeAll()
+
+
+class PointMeasurement:
+    """Class grouping the tasks of the measure phase of a single point
+
+    Every task only communicates with one Instrument, so that the tasks of different Instruments
+    can be run in parallel by the InstrumentExecutor. The DMM tasks are the read method of their
+    BufferedAcquisition in acquisition.py.
+    """
+
+    @staticmethod
+    def readback(Measure, VISA_ADDRESS):
+        """Query the voltage and current readback of the PSU
+
+        Returns:
+            Returns a tuple of the voltage and current readback as floats.
+        """
+        return (
+            float(Measure(VISA_ADDRESS).test_V()),
+            float(Measure(VISA_ADDRESS).test_I()),
+        )
+
+
+class InstrumentSetup:
+    """Class grouping the coroutines initializing the Instruments of a DUT Test
+
+    Every coroutine only communicates with one Instrument through the awaitable Subsystems of
+    library/AsyncSession.py, so that the Instruments of a test are initialized at the same time by
+    AsyncSession.run instead of one after another. The Subsystem classes of the library chosen by the
+    DriverRegistry are passed in.
+    """
+
+    @staticmethod
+    async def voltageDMM(Configure, Trigger, Sense, Voltage, dict, key):
+        """Configure the DMM dict[key] to measure DC voltage with the settings of the DUT Test"""
+        Configure, Trigger, Sense, Voltage = AsyncSubsystem.wrap(Configure, Trigger, Sense, Voltage)
+        await Configure(dict[key]).write("Voltage")
+        await Trigger(dict[key]).setSource("BUS")
+        await Sense(dict[key]).setVoltageResDC(dict["VoltageRes"])
+        await Voltage(dict[key]).setNPLC(dict["Aperture"])
+        await Voltage(dict[key]).setAutoZeroMode(dict["AutoZero"])
+        await Voltage(dict[key]).setAutoImpedanceMode(dict["InputZ"])
+        if dict["Range"] == "Auto":
+            await Sense(dict[key]).setVoltageRangeDCAuto()
+        else:
+            await Sense(dict[key]).setVoltageRangeDC(dict["Range"])
+
+    @staticmethod
+    async def load(Display, Function, dict):
+        """Display the channel of the ELoad and set its priority mode"""
+        Display, Function = AsyncSubsystem.wrap(Display, Function)
+        await Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
+        await Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
+
+    @staticmethod
+    async def senseMode(Voltage, dict, sense):
+        """Set the sense mode of the PSU to the dict[sense] setting (VoltageSense or CurrentSense)"""
+        (Voltage,) = AsyncSubsystem.wrap(Voltage)
+        await Voltage(dict["PSU"]).setSenseMode(dict[sense], dict["PSU_Channel"])
 
 
 class VoltageMeasurement:
@@ -124,10 +146,10 @@ class VoltageMeasurement:
         self.infoList = []
         self.dataList = []
 
-    def executeVoltageMeasurementA(self, dict):
+    def executeVoltageMeasurementA(self, dict, progress=None):
         """Execution of Voltage Measurement for Programm / Readback Accuracy using Status Event Registry to synchronize Instrument
 
-        The function first declares two lists, datalist & infolist that will be used to collect data.
+        The function first preallocates a ResultBuffer sized from the sweep that will be used to collect data.
         It then dynamically imports the library to be used. Next, the settings for all Instrument
         are initialized. The test loop begins where Voltage and Current Sweep is conducted and collect
         measured data.
@@ -138,7 +160,11 @@ class VoltageMeasurement:
         after it is determined that the measurement has been completed. This method is suitable for
         operations that require a longer time (e.g. 100 NPLC). However the implementation is slighty
         more complicated than other methods. This method only can be implemented that have the specific
-        commands that are used.
+        commands that are used. The completion is awaited by CompletionWait in sync.py, which waits for
+        the Status Byte through SRQ or serial poll with a backoff schedule instead of querying the
+        registry continuously.
+        Each DMM reading is a block of SampleCount readings acquired by BufferedAcquisition in
+        acquisition.py, retrieved in one Fetch and reduced to a single value on the host.
 
         In line 260, where I_fixed - 0.001 * I_fixed is done to prevent the ELoad from causing the DUT
         to enter CC Mode.
@@ -167,19 +193,29 @@ class VoltageMeasurement:
             InputZ: String determining the Input Impedance Mode of DMM .
             UpTime: Float containing details regarding the uptime delay.
             DownTime: Float containing details regarding the downtime delay.
+            SyncMode: Optional string determining how completion is detected ("SRQ", "STB" or "COND"),
+                "SRQ" by default.
+            SampleCount: Optional integer containing the number of readings taken per point.
+            Reduction: Optional string determining how the readings are reduced ("mean", "median" or "reject").
+            OutlierSigma: Optional float containing the rejection threshold of the "reject" reduction.
+            BinaryTransfer: Optional boolean determining if the readings are transferred as binary blocks.
+            SettlingBand: Optional float enabling the settling detection of settling.py before every point.
+            SweepOrder: Optional string determining the order of the points, see planner.py.
+            Journal: Optional string containing the path of the journal of the points, see journal.py.
+            Resume: Optional boolean continuing the run recorded in the Journal.
+            ScreenNPLC: Optional float enabling the adaptive precision of precision.py.
             current_iter: integer storing the number of iterations of current sweep.
             voltage_iter: integer storing the number of iterations of voltage sweep.
-            status: float storing the value returned by the status event registry.
-            infoList: List containing the programmed data that was set by Program.
-            dataList: List containing the measured data that was queried from DUT.
+            results: ResultBuffer collecting the programmed & measured data of every point.
+            progress: Optional callable receiving index, total, info and data after every point.
 
         Returns:
-            Returns two list, DataList & InfoList. Each containing the programmed & measured data individually.
+            Returns a ResultBuffer containing the programmed & measured data of every point.
 
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -198,11 +234,197 @@ class VoltageMeasurement:
             Current,
             Oscilloscope,
             Measure,
-        ) = Dimport.getClasses(dict["Instrument"])
+        ) = DriverRegistry.classes(dict["Instrument"])
+
+        # Instrument Initialization, every Instrument is initialized at the same time
+        AsyncSession.run(
+            InstrumentSetup.voltageDMM(Configure, Trigger, Sense, Voltage, dict, "DMM_V"),
+            InstrumentSetup.voltageDMM(Configure, Trigger, Sense, Voltage, dict, "DMM_I"),
+            InstrumentSetup.load(Display, Function, dict),
+            InstrumentSetup.senseMode(Voltage, dict, "VoltageSense"),
+        )
+
+        self.param1 = dict["Prog_Accuracy_Gain"]
+        self.param2 = dict["Prog_Accuracy_Offset"]
+
+        # Every point is a block of readings fetched at once, completion is signalled through the Status Byte
+        acq_V = BufferedAcquisition.fromDict(dict, "DMM_V", Trigger, Sample, Initiate, Fetch)
+        acq_I = BufferedAcquisition.fromDict(dict, "DMM_I", Trigger, Sample, Initiate, Fetch)
+        # Quick low NPLC readings wait for the output to settle before every point if SettlingBand is given
+        settling = Settling.fromDict(
+            dict, "DMM_V", Voltage, Trigger, Sample, Initiate, Fetch, acquisition=acq_V
+        )
+        # Points far from the limits are decided by a low NPLC screening if ScreenNPLC is given
+        adaptive = AdaptivePrecision.fromDict(
+            dict,
+            Voltage,
+            Sample,
+            [acq_V, acq_I],
+            float(dict["Prog_Accuracy_Gain"]),
+            float(dict["Prog_Accuracy_Offset"]),
+        )
+
+        # Test Loop Begins
+        I = float(dict["maxCurrent"]) + 1
+        current_iter = (
+            (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
+            / float(dict["current_step_size"])
+        ) + 1
+        voltage_iter = (
+            (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
+            / float(dict["voltage_step_size"])
+        ) + 1
+        total = int(np.ceil(current_iter)) * int(np.ceil(voltage_iter))
+        results = ResultBuffer(total)
+        # Order of the points, SweepOrder of planner.py
+        plan = SweepPlanner.fromDict(
+            dict,
+            SweepPlanner.values(dict["minCurrent"], dict["current_step_size"], current_iter),
+            SweepPlanner.values(dict["minVoltage"], dict["voltage_step_size"], voltage_iter),
+        )
+        # Every point is journaled as soon as it is measured if Journal is given, see journal.py
+        journal = RunJournal.fromDict(dict, "executeVoltageMeasurementA", total, plan.strategy)
+        resumed = 0 if journal is None else journal.open(results, dict.get("Resume", False))
+        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+        Output(dict["PSU"]).setOutputState("ON")
+
+        try:
+            plan.start()
+            for k, (i, j) in enumerate(plan.order[resumed:], resumed):
+                I_fixed = plan.outer[i]
+                V = plan.inner[j]
+                # Only sent when the outer setpoint changes, repeated writes are elided by the Session
+                Current(dict["ELoad"]).setOutputCurrent(
+                    I_fixed - 0.001 * I_fixed, dict["ELoad_Channel"]
+                )
+                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
+                print("Voltage: ", V, "Current: ", I_fixed)
+                mode = Status(dict["PSU"]).operationCondition()
+                if mode == "+1\n": mode = "CV"
+                elif mode == "+2\n": mode = "CC"
+                else:mode = "Unknown"
+                results.append(V, I_fixed, i, mode, I)
+
+                WAI(dict["PSU"])
+                Delay(dict["PSU"]).write(dict["UpTime"])
+                if settling is not None:
+                    results.set(k, Settle=settling.settle())
+                # Both DMMs and the PSU readback are measured at the same time
+                if adaptive is not None:
+                    (V_DMM, V_shunt, (V_rdbk, I_rdbk)), nplc = adaptive.measure(
+                        V, lambda: PointMeasurement.readback(Measure, dict["PSU"])
+                    )
+                    results.set(k, NPLC=nplc)
+                else:
+                    V_DMM, V_shunt, (V_rdbk, I_rdbk) = InstrumentExecutor.run(
+                        acq_V.read,
+                        acq_I.read,
+                        lambda: PointMeasurement.readback(Measure, dict["PSU"]),
+                    )
+                results.set(
+                    k,
+                    Vmeasured=V_DMM,
+                    Imeasured=V_shunt / float(dict["shuntResistance"]),
+                    Vreadback=V_rdbk,
+                    Ireadback=I_rdbk,
+                )
+                if progress is not None:
+                    progress(k + 1, total, results.info(k), results.data(k))
+
+                if journal is not None:
+                    journal.record(k, results)
+
+                Delay(dict["PSU"]).write(dict["DownTime"])
+
+            plan.finish()
+            if journal is not None:
+                journal.close()
+        finally:
+            # Closed without the completion mark if the sweep raised, so that the run can be resumed
+            if journal is not None:
+                journal.release()
+        # The points are stored in raster order for the analysis whatever the order of the sweep
+        results.reorder(plan.canonical())
+
+        Output(dict["PSU"]).setOutputState("OFF")
+        Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        print(plan.summary(results.column("Settle")))
+        if settling is not None:
+            print(settling.summary())
+        if adaptive is not None:
+            print(adaptive.summary())
+        acq_V.release()
+        acq_I.release()
+        print(
+            "Synchronization transactions per point: ",
+            acq_V.wait.transactionsPerWait() + acq_I.wait.transactionsPerWait(),
+        )
+        print(
+            "Redundant writes elided: ",
+            sum(elided for writes, elided in SessionPool.statistics().values()),
+        )
+        return results
+
+    def executeVoltageMeasurementList(self, dict, progress=None):
+        """Execution of Voltage Measurement for Programm / Readback Accuracy using the List Subsystem
+
+        The setpoints of the whole Voltage and Current Sweep are generated first and uploaded to
+        the PSU and ELoad as lists by ListSweep in listsweep.py. The PSU then steps through the list
+        on its own, triggering the ELoad and both DMMs through its trigger out pin, so that no bus
+        transaction is needed between two points. The readings of the DMMs are retrieved at the end
+        of the sequence. The readback of the PSU is not measured in this mode and is left as NaN.
+
+        Args:
+            Instrument: String determining which library to be used, only Keysight supports List mode.
+            minCurrent: Float determining the start current for Current Sweep.
+            maxCurrent: Float determining the stop current for Current Sweep.
+            current_stepsize: Float determining the step size during Current Sweep.
+            minVoltage: Float determining the start voltage for Voltage Sweep.
+            maxVoltage: Float determining the stop voltage for Voltage Sweep.
+            voltage_stepsize: Float determining the step_size for Voltage_Sweep.
+            PSU: String containing the VISA Address of the PSU used.
+            DMM_V: String containing the VISA Address of the DMM measuring the voltage.
+            DMM_I: String containing the VISA Address of the DMM measuring the shunt voltage.
+            ELoad: String containing the VISA Address of the ELoad used.
+            ELoad_Channel: Integer containing the channel number that the ELoad is using.
+            PSU_Channel: Integer containing the channel number that the PSU is using.
+            Aperture: String determining the NPLC to be used by DMM when measuring.
+            UpTime: Float containing the settling delay (ms) before the DMMs are triggered.
+            Dwell: Optional float containing the time (s) spent on every point of the list.
+            ListSize: Optional integer containing the maximum number of points in one list.
+            TriggerPin: Optional integer containing the PSU digital pin wired to the trigger inputs.
+            progress: Optional callable receiving index, total, info and data for every point.
+
+        Returns:
+            Returns a ResultBuffer containing the programmed & measured data of every point.
+
+        Raises:
+            VisaIOError: An error occured when opening PyVisa Resources.
+            TimeoutError: The DMMs did not complete the sequence in time.
+        """
+        # Subsystem classes of the library, loaded once by the DriverRegistry
+        (
+            Read,
+            Apply,
+            Display,
+            Function,
+            Output,
+            Sense,
+            Configure,
+            Delay,
+            Trigger,
+            Sample,
+            Initiate,
+            Fetch,
+            Status,
+            Voltage,
+            Current,
+            Oscilloscope,
+            Measure,
+        ) = DriverRegistry.classes(dict["Instrument"])
 
         # Instrument Initialization
         Configure(dict["DMM_V"]).write("Voltage")
-        Trigger(dict["DMM_V"]).setSource("BUS")
         Sense(dict["DMM_V"]).setVoltageResDC(dict["VoltageRes"])
         Voltage(dict["DMM_V"]).setNPLC(dict["Aperture"])
         Voltage(dict["DMM_V"]).setAutoZeroMode(dict["AutoZero"])
@@ -212,13 +434,7 @@ class VoltageMeasurement:
         else:
             Sense(dict["DMM_V"]).setVoltageRangeDC(dict["Range"])
 
-
-        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
-        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
-        Voltage(dict["PSU"]).setSenseMode(dict["VoltageSense"], dict["PSU_Channel"])
-
         Configure(dict["DMM_I"]).write("Voltage")
-        Trigger(dict["DMM_I"]).setSource("BUS")
         Sense(dict["DMM_I"]).setVoltageResDC(dict["VoltageRes"])
         Voltage(dict["DMM_I"]).setNPLC(dict["Aperture"])
         Voltage(dict["DMM_I"]).setAutoZeroMode(dict["AutoZero"])
@@ -228,10 +444,14 @@ class VoltageMeasurement:
         else:
             Sense(dict["DMM_I"]).setVoltageRangeDC(dict["Range"])
 
+        Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
+        Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
+        Voltage(dict["PSU"]).setSenseMode(dict["VoltageSense"], dict["PSU_Channel"])
+
         self.param1 = dict["Prog_Accuracy_Gain"]
         self.param2 = dict["Prog_Accuracy_Offset"]
 
-        # Test Loop Begins
+        # Setpoints of the whole sweep
         i = 0
         j = 0
         k = 0
@@ -246,60 +466,17 @@ class VoltageMeasurement:
             (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
             / float(dict["voltage_step_size"])
         ) + 1
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
+        source_values = []
+        load_values = []
+        results = ResultBuffer(int(np.ceil(current_iter)) * int(np.ceil(voltage_iter)))
 
         while i < current_iter:
-            Current(dict["ELoad"]).setOutputCurrent(
-                I_fixed - 0.001 * I_fixed, dict["ELoad_Channel"]
-            )
             j = 0
             V = float(dict["minVoltage"])
             while j < voltage_iter:
-                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
-                print("Voltage: ", V, "Current: ", I_fixed)
-                mode = Status(dict["PSU"]).operationCondition()
-                if mode == "+1\n": mode = "CV"
-                elif mode == "+2\n": mode = "CC"
-                else:mode = "Unknown"
-                self.infoList.insert(k, [V, I_fixed, i, mode, I])
-
-                WAI(dict["PSU"])
-                Delay(dict["PSU"]).write(dict["UpTime"])
-                Initiate(dict["DMM_I"]).initiate()
-                Initiate(dict["DMM_V"]).initiate()
-                status_I = float(Status(dict["DMM_I"]).operationCondition())
-                status_V = float(Status(dict["DMM_V"]).operationCondition())
-                TRG(dict["DMM_I"])
-                TRG(dict["DMM_V"])
-
-                while 1:
-                    status_I = float(Status(dict["DMM_I"]).operationCondition())
-                    status_V = float(Status(dict["DMM_V"]).operationCondition())
-
-                    if status_I == 8704.0 and status_V == 8704.0:
-                        self.dataList.insert(
-                            k, [
-                                float(Fetch(dict["DMM_V"]).query()),
-                                (float(Fetch(dict["DMM_I"]).query())/float(dict["shuntResistance"])),
-                                float(Measure(dict["PSU"]).test_V()),
-                                float(Measure(dict["PSU"]).test_I())
-                                ]
-                        )
-                        break
-
-                    elif status_I == 512.0 and status_V == 512.0:
-                        self.dataList.insert(
-                            k, [
-                                float(Fetch(dict["DMM_V"]).query()),
-                                (float(Fetch(dict["DMM_I"]).query())/float(dict["shuntResistance"])),
-                                float(Measure(dict["PSU"]).test_V()),
-                                float(Measure(dict["PSU"]).test_I())
-                                ]
-                        )
-                        break
-
-                Delay(dict["PSU"]).write(dict["DownTime"])
+                source_values.append(V)
+                load_values.append(I_fixed - 0.001 * I_fixed)
+                results.append(V, I_fixed, i, "LIST", I)
                 V += float(dict["voltage_step_size"])
                 j += 1
                 k += 1
@@ -307,17 +484,31 @@ class VoltageMeasurement:
             I_fixed += float(dict["current_step_size"])
             i += 1
 
+        Apply(dict["PSU"]).write(dict["PSU_Channel"], source_values[0], I)
+        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+        Output(dict["PSU"]).setOutputState("ON")
+
+        V_DMM, V_shunt = ListSweep(dict, "VOLT", "CURR").run(source_values, load_values)
+
         Output(dict["PSU"]).setOutputState("OFF")
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
-        return self.infoList, self.dataList
+
+        results.column("Vmeasured")[:] = V_DMM
+        results.column("Imeasured")[:] = V_shunt / float(dict["shuntResistance"])
+        if progress is not None:
+            for k in range(len(results)):
+                progress(k + 1, len(results), results.info(k), results.data(k))
+
+        return results
 
     def executeVoltageMeasurementB(
         self,
         dict,
+        progress=None,
     ):
         """Execution of Voltage Measurement for Programm / Readback Accuracy using WAI and OPC to synchronize Instrument
 
-        The function first declares two lists, datalist & infolist that will be used to collect data.
+        The function first preallocates a ResultBuffer sized from the sweep that will be used to collect data.
         It then dynamically imports the library to be used. Next, the settings for all Instrument
         are initialized. The test loop begins where Voltage and Current Sweep is conducted and collect
         measured data.
@@ -358,16 +549,20 @@ class VoltageMeasurement:
             current_iter: integer storing the number of iterations of current sweep.
             voltage_iter: integer storing the number of iterations of voltage sweep.
             status: float storing the value returned by the status event registry.
-            infoList: List containing the programmed data that was set by Program.
-            dataList: List containing the measured data that was queried from DUT.
+            results: ResultBuffer collecting the programmed & measured data of every point.
+            progress: Optional callable receiving index, total, info and data after every point.
+            SettlingBand: Optional float enabling the settling detection of settling.py before every point.
+            SweepOrder: Optional string determining the order of the points, see planner.py.
+            Journal: Optional string containing the path of the journal of the points, see journal.py.
+            Resume: Optional boolean continuing the run recorded in the Journal.
 
         Returns:
-            Returns two list, DataList & InfoList. Each containing the programmed & measured data individually.
+            Returns a ResultBuffer containing the programmed & measured data of every point.
 
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -386,7 +581,7 @@ class VoltageMeasurement:
             Current,
             Oscilloscope,
             Measure,
-        ) = Dimport.getClasses(dict["Instrument"])
+        ) = DriverRegistry.classes(dict["Instrument"])
 
         # Instrument Initialization
         Configure(dict["DMM"]).write("Voltage")
@@ -409,12 +604,9 @@ class VoltageMeasurement:
         self.param1 = dict["Error_Gain"]
         self.param2 = dict["Error_Offset"]
 
+        # Quick low NPLC readings wait for the output to settle before every point if SettlingBand is given
+        settling = Settling.fromDict(dict, "DMM", Voltage, Trigger, Sample, Initiate, Fetch)
         # Test Loop
-        i = 0
-        j = 0
-        k = 0
-        I_fixed = float(dict["minCurrent"])
-        V = float(dict["minVoltage"])
         I = float(dict["maxCurrent"]) + 1
         current_iter = (
             (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
@@ -424,53 +616,80 @@ class VoltageMeasurement:
             (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
             / float(dict["voltage_step_size"])
         ) + 1
+        total = int(np.ceil(current_iter)) * int(np.ceil(voltage_iter))
+        results = ResultBuffer(total)
+        # Order of the points, SweepOrder of planner.py
+        plan = SweepPlanner.fromDict(
+            dict,
+            SweepPlanner.values(dict["minCurrent"], dict["current_step_size"], current_iter),
+            SweepPlanner.values(dict["minVoltage"], dict["voltage_step_size"], voltage_iter),
+        )
+        # Every point is journaled as soon as it is measured if Journal is given, see journal.py
+        journal = RunJournal.fromDict(dict, "executeVoltageMeasurementB", total, plan.strategy)
+        resumed = 0 if journal is None else journal.open(results, dict.get("Resume", False))
         Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
         Output(dict["PSU"]).setOutputState("ON")
 
-        while i < current_iter:
-            Current(dict["ELoad"]).setOutputCurrent(
-                I_fixed - 0.001 * I_fixed, dict["ELoad_Channel"]
-            )
-            j = 0
-            V = float(dict["minVoltage"])
-            while j < voltage_iter:
+        try:
+            plan.start()
+            for k, (i, j) in enumerate(plan.order[resumed:], resumed):
+                I_fixed = plan.outer[i]
+                V = plan.inner[j]
+                # Only sent when the outer setpoint changes, repeated writes are elided by the Session
+                Current(dict["ELoad"]).setOutputCurrent(
+                    I_fixed - 0.001 * I_fixed, dict["ELoad_Channel"]
+                )
                 Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
                 print("Voltage: ", V, "Current: ", I_fixed)
-                self.infoList.insert(k, [V, I_fixed, i])
+                results.append(V, I_fixed, i, "", I)
                 WAI(dict["PSU"])
                 Delay(dict["PSU"]).write(dict["UpTime"])
+                if settling is not None:
+                    results.set(k, Settle=settling.settle())
                 Initiate(dict["DMM"]).initiate()
                 TRG(dict["DMM"])
 
                 temp_string = float(OPC(dict["PSU"]).query())
 
                 if temp_string == 1:
-                    self.dataList.insert(
-                        k, [float(Fetch(dict["DMM"]).query()), I_fixed]
+                    results.set(
+                        k, Vmeasured=float(Fetch(dict["DMM"]).query()), Imeasured=I_fixed
                     )
                     del temp_string
+                    if progress is not None:
+                        progress(k + 1, total, results.info(k), results.data(k))
 
-                Delay(self.PSU).write(dict["DownTime"])
-                V += float(dict["voltage_step_size"])
-                j += 1
-                k += 1
+                if journal is not None:
+                    journal.record(k, results)
 
-            I_fixed += float(dict["current_step_size"])
-            i += 1
+                Delay(dict["PSU"]).write(dict["DownTime"])
+
+            plan.finish()
+            if journal is not None:
+                journal.close()
+        finally:
+            # Closed without the completion mark if the sweep raised, so that the run can be resumed
+            if journal is not None:
+                journal.release()
+        # The points are stored in raster order for the analysis whatever the order of the sweep
+        results.reorder(plan.canonical())
 
         Output(dict["PSU"]).setOutputState("OFF")
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
-        return self.infoList, self.dataList
+        print(plan.summary(results.column("Settle")))
+        if settling is not None:
+            print(settling.summary())
+        return results
 
 
 class CurrentMeasurement:
     def __init__(self):
         pass
 
-    def executeCurrentMeasurementA(self, dict):
+    def executeCurrentMeasurementA(self, dict, progress=None):
         """Execution of Current Measurement for Programm / Readback Accuracy using Status Event Registry to synchronize Instrument
 
-        The function first declares two lists, datalist & infolist that will be used to collect data.
+        The function first preallocates a ResultBuffer sized from the sweep that will be used to collect data.
         It then dynamically imports the library to be used. Next, the settings for all Instrument
         are initialized. The test loop begins where Voltage and Current Sweep is conducted and collect
         measured data.
@@ -481,7 +700,11 @@ class CurrentMeasurement:
         after it is determined that the measurement has been completed. This method is suitable for
         operations that require a longer time (e.g. 100 NPLC). However the implementation is slighty
         more complicated than other methods. This method only can be implemented that have the specific
-        commands that are used.
+        commands that are used. The completion is awaited by CompletionWait in sync.py, which waits for
+        the Status Byte through SRQ or serial poll with a backoff schedule instead of querying the
+        registry continuously.
+        Each DMM reading is a block of SampleCount readings acquired by BufferedAcquisition in
+        acquisition.py, retrieved in one Fetch and reduced to a single value on the host.
 
         In line 605, where V_fixed - 0.001 * V_fixed is done to prevent the ELoad from causing the DUT
         to enter CV Mode.
@@ -510,21 +733,227 @@ class CurrentMeasurement:
             InputZ: String determining the Input Impedance Mode of DMM.
             UpTime: Float containing details regarding the uptime delay.
             DownTime: Float containing details regarding the downtime delay.
+            SyncMode: Optional string determining how completion is detected ("SRQ", "STB" or "COND"),
+                "SRQ" by default.
+            SampleCount: Optional integer containing the number of readings taken per point.
+            Reduction: Optional string determining how the readings are reduced ("mean", "median" or "reject").
+            OutlierSigma: Optional float containing the rejection threshold of the "reject" reduction.
+            BinaryTransfer: Optional boolean determining if the readings are transferred as binary blocks.
+            SettlingBand: Optional float enabling the settling detection of settling.py before every point.
+            SweepOrder: Optional string determining the order of the points, see planner.py.
+            Journal: Optional string containing the path of the journal of the points, see journal.py.
+            Resume: Optional boolean continuing the run recorded in the Journal.
+            ScreenNPLC: Optional float enabling the adaptive precision of precision.py.
             current_iter: integer storing the number of iterations of current sweep.
             voltage_iter: integer storing the number of iterations of voltage sweep.
-            status: float storing the value returned by the status event registry.
-            infoList: List containing the programmed data that was set by Program.
-            dataList: List containing the measured data that was queried from DUT.
+            results: ResultBuffer collecting the programmed & measured data of every point.
+            progress: Optional callable receiving index, total, info and data after every point.
+
+        Returns:
+            Returns a ResultBuffer containing the programmed & measured data of every point.
+
+        Raises:
+            VisaIOError: An error occured when opening PyVisa Resources.
+        """
+        # Subsystem classes of the library, loaded once by the DriverRegistry
+        (
+            Read,
+            Apply,
+            Display,
+            Function,
+            Output,
+            Sense,
+            Configure,
+            Delay,
+            Trigger,
+            Sample,
+            Initiate,
+            Fetch,
+            Status,
+            Voltage,
+            Current,
+            Oscilloscope,
+            Measure,
+        ) = DriverRegistry.classes(dict["Instrument"])
+
+        # Instrument Initialization, every Instrument is initialized at the same time
+        AsyncSession.run(
+            InstrumentSetup.voltageDMM(Configure, Trigger, Sense, Voltage, dict, "DMM_I"),
+            InstrumentSetup.voltageDMM(Configure, Trigger, Sense, Voltage, dict, "DMM_V"),
+            InstrumentSetup.load(Display, Function, dict),
+            InstrumentSetup.senseMode(Voltage, dict, "CurrentSense"),
+        )
+
+        self.param1 = dict["Prog_Accuracy_Gain"]
+        self.param2 = dict["Prog_Accuracy_Offset"]
+
+        # Every point is a block of readings fetched at once, completion is signalled through the Status Byte
+        acq_V = BufferedAcquisition.fromDict(dict, "DMM_V", Trigger, Sample, Initiate, Fetch)
+        acq_I = BufferedAcquisition.fromDict(dict, "DMM_I", Trigger, Sample, Initiate, Fetch)
+        # Quick low NPLC readings wait for the output to settle before every point if SettlingBand is given
+        settling = Settling.fromDict(
+            dict,
+            "DMM_I",
+            Voltage,
+            Trigger,
+            Sample,
+            Initiate,
+            Fetch,
+            scale=1 / float(dict["shuntResistance"]),
+            acquisition=acq_I,
+        )
+        # Points far from the limits are decided by a low NPLC screening if ScreenNPLC is given
+        adaptive = AdaptivePrecision.fromDict(
+            dict,
+            Voltage,
+            Sample,
+            [acq_V, acq_I],
+            float(dict["Prog_Accuracy_Gain"]),
+            float(dict["Prog_Accuracy_Offset"]),
+            judged=1,
+            scale=1 / float(dict["shuntResistance"]),
+        )
+
+        # Test Loop
+        V = float(dict["maxVoltage"]) + 1
+        current_iter = (
+            (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
+            / float(dict["current_step_size"])
+        ) + 1
+        voltage_iter = (
+            (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
+            / float(dict["voltage_step_size"])
+        ) + 1
+        total = int(np.ceil(current_iter)) * int(np.ceil(voltage_iter))
+        results = ResultBuffer(total)
+        # Order of the points, SweepOrder of planner.py
+        plan = SweepPlanner.fromDict(
+            dict,
+            SweepPlanner.values(dict["minVoltage"], dict["voltage_step_size"], voltage_iter),
+            SweepPlanner.values(dict["minCurrent"], dict["current_step_size"], current_iter),
+            scale=float(dict["shuntResistance"]),
+        )
+        # Every point is journaled as soon as it is measured if Journal is given, see journal.py
+        journal = RunJournal.fromDict(dict, "executeCurrentMeasurementA", total, plan.strategy)
+        resumed = 0 if journal is None else journal.open(results, dict.get("Resume", False))
+        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+        Output(dict["PSU"]).setOutputState("ON")
+
+        try:
+            plan.start()
+            for k, (i, j) in enumerate(plan.order[resumed:], resumed):
+                V_fixed = plan.outer[i]
+                I = plan.inner[j]
+                # Only sent when the outer setpoint changes, repeated writes are elided by the Session
+                Voltage(dict["ELoad"]).setOutputVoltage(
+                    V_fixed - 0.001 * V_fixed, dict["ELoad_Channel"]
+                )
+                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
+                print("Voltage: ", V_fixed, "Current: ", I)
+                mode = Status(dict["PSU"]).operationCondition()
+                if mode == "+1\n": mode = "CV"
+                elif mode == "+2\n": mode = "CC"
+                else:mode = "Unknown"
+
+                results.append(V_fixed, I, i, mode, V)
+
+                WAI(dict["PSU"])
+                Delay(dict["PSU"]).write(dict["UpTime"])
+                if settling is not None:
+                    results.set(k, Settle=settling.settle())
+                # Both DMMs and the PSU readback are measured at the same time
+                if adaptive is not None:
+                    (V_DMM, V_shunt, (V_rdbk, I_rdbk)), nplc = adaptive.measure(
+                        I, lambda: PointMeasurement.readback(Measure, dict["PSU"])
+                    )
+                    results.set(k, NPLC=nplc)
+                else:
+                    V_DMM, V_shunt, (V_rdbk, I_rdbk) = InstrumentExecutor.run(
+                        acq_V.read,
+                        acq_I.read,
+                        lambda: PointMeasurement.readback(Measure, dict["PSU"]),
+                    )
+                results.set(
+                    k,
+                    Vmeasured=V_DMM,
+                    Imeasured=V_shunt / float(dict["shuntResistance"]),
+                    Vreadback=V_rdbk,
+                    Ireadback=I_rdbk,
+                )
+                if progress is not None:
+                    progress(k + 1, total, results.info(k), results.data(k))
+
+                if journal is not None:
+                    journal.record(k, results)
+
+                Delay(dict["PSU"]).write(dict["DownTime"])
+
+            plan.finish()
+            if journal is not None:
+                journal.close()
+        finally:
+            # Closed without the completion mark if the sweep raised, so that the run can be resumed
+            if journal is not None:
+                journal.release()
+        # The points are stored in raster order for the analysis whatever the order of the sweep
+        results.reorder(plan.canonical())
+        Output(dict["PSU"]).setOutputState("OFF")
+        Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
+        print(plan.summary(results.column("Settle")))
+        if settling is not None:
+            print(settling.summary())
+        if adaptive is not None:
+            print(adaptive.summary())
+        acq_V.release()
+        acq_I.release()
+        print(
+            "Synchronization transactions per point: ",
+            acq_V.wait.transactionsPerWait() + acq_I.wait.transactionsPerWait(),
+        )
+        print(
+            "Redundant writes elided: ",
+            sum(elided for writes, elided in SessionPool.statistics().values()),
+        )
+        return results
+
+    def executeCurrentMeasurementList(self, dict, progress=None):
+        """Execution of Current Measurement for Programm / Readback Accuracy using the List Subsystem
+
+        The setpoints of the whole Current and Voltage Sweep are generated first and uploaded to
+        the PSU and ELoad as lists by ListSweep in listsweep.py. The PSU then steps through the list
+        on its own, triggering the ELoad and both DMMs through its trigger out pin, so that no bus
+        transaction is needed between two points. The readings of the DMMs are retrieved at the end
+        of the sequence. The readback of the PSU is not measured in this mode and is left as NaN.
+
+        Args:
+            Instrument: String determining which library to be used, only Keysight supports List mode.
+            minCurrent: Float determining the start current for Current Sweep.
+            maxCurrent: Float determining the stop current for Current Sweep.
+            current_stepsize: Float determining the step size during Current Sweep.
+            minVoltage: Float determining the start voltage for Voltage Sweep.
+            maxVoltage: Float determining the stop voltage for Voltage Sweep.
+            voltage_stepsize: Float determining the step_size for Voltage_Sweep.
+            PSU: String containing the VISA Address of the PSU used.
+            DMM_V: String containing the VISA Address of the DMM measuring the voltage.
+            DMM_I: String containing the VISA Address of the DMM measuring the shunt voltage.
+            ELoad: String containing the VISA Address of the ELoad used.
+            ELoad_Channel: Integer containing the channel number that the ELoad is using.
+            PSU_Channel: Integer containing the channel number that the PSU is using.
+            Aperture: String determining the NPLC to be used by DMM when measuring.
+            UpTime: Float containing the settling delay (ms) before the DMMs are triggered.
+            Dwell: Optional float containing the time (s) spent on every point of the list.
+            ListSize: Optional integer containing the maximum number of points in one list.
+            TriggerPin: Optional integer containing the PSU digital pin wired to the trigger inputs.
+            progress: Optional callable receiving index, total, info and data for every point.
 
         Returns:
-            Returns two list, DataList & InfoList. Each containing the programmed & measured data individually.
+            Returns a ResultBuffer containing the programmed & measured data of every point.
 
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
+            TimeoutError: The DMMs did not complete the sequence in time.
         """
-        dataList = []
-        infoList = []
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -543,11 +972,20 @@ class CurrentMeasurement:
             Current,
             Oscilloscope,
             Measure,
-        ) = Dimport.getClasses(dict["Instrument"])
+        ) = DriverRegistry.classes(dict["Instrument"])
 
         # Instrument Initialization
+        Configure(dict["DMM_V"]).write("Voltage")
+        Sense(dict["DMM_V"]).setVoltageResDC(dict["VoltageRes"])
+        Voltage(dict["DMM_V"]).setNPLC(dict["Aperture"])
+        Voltage(dict["DMM_V"]).setAutoZeroMode(dict["AutoZero"])
+        Voltage(dict["DMM_V"]).setAutoImpedanceMode(dict["InputZ"])
+        if dict["Range"] == "Auto":
+            Sense(dict["DMM_V"]).setVoltageRangeDCAuto()
+        else:
+            Sense(dict["DMM_V"]).setVoltageRangeDC(dict["Range"])
+
         Configure(dict["DMM_I"]).write("Voltage")
-        Trigger(dict["DMM_I"]).setSource("BUS")
         Sense(dict["DMM_I"]).setVoltageResDC(dict["VoltageRes"])
         Voltage(dict["DMM_I"]).setNPLC(dict["Aperture"])
         Voltage(dict["DMM_I"]).setAutoZeroMode(dict["AutoZero"])
@@ -561,22 +999,10 @@ class CurrentMeasurement:
         Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
         Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
 
-        Configure(dict["DMM_V"]).write("Voltage")
-        Trigger(dict["DMM_V"]).setSource("BUS")
-        Sense(dict["DMM_V"]).setVoltageResDC(dict["VoltageRes"])
-        Voltage(dict["DMM_V"]).setNPLC(dict["Aperture"])
-        Voltage(dict["DMM_V"]).setAutoZeroMode(dict["AutoZero"])
-        Voltage(dict["DMM_V"]).setAutoImpedanceMode(dict["InputZ"])
-        if dict["Range"] == "Auto":
-            Sense(dict["DMM_V"]).setVoltageRangeDCAuto()
-        else:
-            Sense(dict["DMM_V"]).setVoltageRangeDC(dict["Range"])
-
-
         self.param1 = dict["Prog_Accuracy_Gain"]
         self.param2 = dict["Prog_Accuracy_Offset"]
 
-        # Test Loop
+        # Setpoints of the whole sweep
         i = 0
         j = 0
         k = 0
@@ -591,75 +1017,45 @@ class CurrentMeasurement:
             (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
             / float(dict["voltage_step_size"])
         ) + 1
-        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
-        Output(dict["PSU"]).setOutputState("ON")
+        source_values = []
+        load_values = []
+        results = ResultBuffer(int(np.ceil(current_iter)) * int(np.ceil(voltage_iter)))
 
         while i < voltage_iter:
-            Voltage(dict["ELoad"]).setOutputVoltage(
-                V_fixed - 0.001 * V_fixed, dict["ELoad_Channel"]
-            )
             j = 0
             I = float(dict["minCurrent"])
             while j < current_iter:
-                Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
-                print("Voltage: ", V_fixed, "Current: ", I)
-                mode = Status(dict["PSU"]).operationCondition()
-                if mode == "+1\n": mode = "CV"
-                elif mode == "+2\n": mode = "CC"
-                else:mode = "Unknown"
-
-                infoList.insert(k, [V_fixed, I, i, mode, V])
-
-                WAI(dict["PSU"])
-                Delay(dict["PSU"]).write(dict["UpTime"])
-                Initiate(dict["DMM_I"]).initiate()
-                Initiate(dict["DMM_V"]).initiate()
-                status_I = float(Status(dict["DMM_I"]).operationCondition())
-                status_V = float(Status(dict["DMM_V"]).operationCondition())
-                TRG(dict["DMM_I"])
-                TRG(dict["DMM_V"])
-
-                while 1:
-                    status_I = float(Status(dict["DMM_I"]).operationCondition())
-                    status_V = float(Status(dict["DMM_V"]).operationCondition())
-
-                    if status_I == 8704.0 and status_V == 8704.0:
-                        dataList.insert(
-                            k, [
-                                float(Fetch(dict["DMM_V"]).query()),
-                                (float(Fetch(dict["DMM_I"]).query())/float(dict["shuntResistance"])),
-                                float(Measure(dict["PSU"]).test_V()),
-                                float(Measure(dict["PSU"]).test_I())
-                                ]
-                        )
-                        break
-
-                    elif status_I == 512.0 and status_V == 512.0:
-                        dataList.insert(
-                            k, [
-                                float(Fetch(dict["DMM_V"]).query()),
-                                (float(Fetch(dict["DMM_I"]).query())/float(dict["shuntResistance"])),
-                                float(Measure(dict["PSU"]).test_V()),
-                                float(Measure(dict["PSU"]).test_I())
-                                ]
-                        )
-                        break
-
-                Delay(dict["PSU"]).write(dict["DownTime"])
+                source_values.append(I)
+                load_values.append(V_fixed - 0.001 * V_fixed)
+                results.append(V_fixed, I, i, "LIST", V)
                 I += float(dict["current_step_size"])
                 j += 1
                 k += 1
 
             V_fixed += float(dict["voltage_step_size"])
             i += 1
+
+        Apply(dict["PSU"]).write(dict["PSU_Channel"], V, source_values[0])
+        Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
+        Output(dict["PSU"]).setOutputState("ON")
+
+        V_DMM, V_shunt = ListSweep(dict, "CURR", "VOLT").run(source_values, load_values)
+
         Output(dict["PSU"]).setOutputState("OFF")
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
-        return dataList, infoList
 
-    def executeCurrentMeasurementB(self, dict):
+        results.column("Vmeasured")[:] = V_DMM
+        results.column("Imeasured")[:] = V_shunt / float(dict["shuntResistance"])
+        if progress is not None:
+            for k in range(len(results)):
+                progress(k + 1, len(results), results.info(k), results.data(k))
+
+        return results
+
+    def executeCurrentMeasurementB(self, dict, progress=None):
         """Execution of Current Measurement for Programm / Readback Accuracy using WAI and OPC to synchronize Instrument
 
-        The function first declares two lists, datalist & infolist that will be used to collect data.
+        The function first preallocates a ResultBuffer sized from the sweep that will be used to collect data.
         It then dynamically imports the library to be used. Next, the settings for all Instruments
         are initialized. The test loop begins where Voltage and Current Sweep is conducted and collect
         measured data.
@@ -700,18 +1096,20 @@ class CurrentMeasurement:
             current_iter: integer storing the number of iterations of current sweep.
             voltage_iter: integer storing the number of iterations of voltage sweep.
             status: float storing the value returned by the status event registry.
-            infoList: List containing the programmed data that was set by Program.
-            dataList: List containing the measured data that was queried from DUT.
+            results: ResultBuffer collecting the programmed & measured data of every point.
+            progress: Optional callable receiving index, total, info and data after every point.
+            SettlingBand: Optional float enabling the settling detection of settling.py before every point.
+            SweepOrder: Optional string determining the order of the points, see planner.py.
+            Journal: Optional string containing the path of the journal of the points, see journal.py.
+            Resume: Optional boolean continuing the run recorded in the Journal.
 
         Returns:
-            Returns two list, DataList & InfoList. Each containing the programmed & measured data individually.
+            Returns a ResultBuffer containing the programmed & measured data of every point.
 
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
-        dataList = []
-        infoList = []
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -728,32 +1126,31 @@ class CurrentMeasurement:
             Status,
             Voltage,
             Current,
-        ) = Dimport.getClasses(dict["Instrument"])
+            Oscilloscope,
+            Measure,
+        ) = DriverRegistry.classes(dict["Instrument"])
 
-        Configure(self.dict["DMM"]).write("Current")
-        Trigger(self.dict["DMM"]).setSource("BUS")
+        Configure(dict["DMM"]).write("Current")
+        Trigger(dict["DMM"]).setSource("BUS")
         Sense(dict["DMM"]).setCurrentResDC(dict["CurrentRes"])
         Display(dict["ELoad"]).displayState(dict["ELoad_Channel"])
         Function(dict["ELoad"]).setMode(dict["setFunction"], dict["ELoad_Channel"])
         Voltage(dict["PSU"]).setSenseMode(dict["CurrentSense"], dict["PSU_Channel"])
 
-        Current(self.dict["DMM"]).setNPLC(dict["Aperture"])
-        Current(self.dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
-        Current(self.dict["DMM"]).setTerminal(dict["Terminal"])
+        Current(dict["DMM"]).setNPLC(dict["Aperture"])
+        Current(dict["DMM"]).setAutoZeroMode(dict["AutoZero"])
+        Current(dict["DMM"]).setTerminal(dict["Terminal"])
 
         if dict["Range"] == "Auto":
-            Sense(self.dict["DMM"]).setCurrentRangeDCAuto()
+            Sense(dict["DMM"]).setCurrentRangeDCAuto()
         else:
-            Sense(self.dict["DMM"]).setCurrentRangeDC(dict["Range"])
+            Sense(dict["DMM"]).setCurrentRangeDC(dict["Range"])
         self.param1 = dict["Error_Gain"]
         self.param2 = dict["Error_Offset"]
+        # Quick low NPLC readings wait for the output to settle before every point if SettlingBand is given
+        settling = Settling.fromDict(dict, "DMM", Current, Trigger, Sample, Initiate, Fetch)
         # Test Loop
-        i = 0
-        j = 0
-        k = 0
-        V_fixed = float(dict["minVoltage"])
         V = float(dict["maxVoltage"]) + 1
-        I = float(dict["minCurrent"])
         current_iter = (
             (float(dict["maxCurrent"]) - float(dict["minCurrent"]))
             / float(dict["current_step_size"])
@@ -762,41 +1159,70 @@ class CurrentMeasurement:
             (float(dict["maxVoltage"]) - float(dict["minVoltage"]))
             / float(dict["voltage_stepsize"])
         ) + 1
+        total = int(np.ceil(current_iter)) * int(np.ceil(voltage_iter))
+        results = ResultBuffer(total)
+        # Order of the points, SweepOrder of planner.py
+        plan = SweepPlanner.fromDict(
+            dict,
+            SweepPlanner.values(dict["minVoltage"], dict["voltage_stepsize"], voltage_iter),
+            SweepPlanner.values(dict["minCurrent"], dict["current_step_size"], current_iter),
+        )
+        # Every point is journaled as soon as it is measured if Journal is given, see journal.py
+        journal = RunJournal.fromDict(dict, "executeCurrentMeasurementB", total, plan.strategy)
+        resumed = 0 if journal is None else journal.open(results, dict.get("Resume", False))
         Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
         Output(dict["PSU"]).setOutputState("ON")
 
-        while i < voltage_iter:
-            Voltage(dict["ELoad"]).setOutputVoltage(
-                V_fixed - 0.001 * V_fixed, dict["ELoad_Channel"]
-            )
-            j = 0
-            I = float(dict["minCurrent"])
-            while j < current_iter:
+        try:
+            plan.start()
+            for k, (i, j) in enumerate(plan.order[resumed:], resumed):
+                V_fixed = plan.outer[i]
+                I = plan.inner[j]
+                # Only sent when the outer setpoint changes, repeated writes are elided by the Session
+                Voltage(dict["ELoad"]).setOutputVoltage(
+                    V_fixed - 0.001 * V_fixed, dict["ELoad_Channel"]
+                )
                 Apply(dict["PSU"]).write(dict["PSU_Channel"], V, I)
                 print("Voltage: ", V_fixed, "Current: ", I)
-                infoList.insert(k, [V_fixed, I, i])
+                results.append(V_fixed, I, i, "", V)
 
                 WAI(dict["PSU"])
                 Delay(dict["PSU"]).write(dict["UpTime"])
+                if settling is not None:
+                    results.set(k, Settle=settling.settle())
                 Initiate(dict["DMM"]).initiate()
                 TRG(dict["DMM"])
 
                 temp_string = float(OPC(dict["PSU"]).query())
 
                 if temp_string == 1:
-                    dataList.insert(k, [V_fixed, float(Fetch(dict["DMM"]).query())])
+                    results.set(
+                        k, Vmeasured=V_fixed, Imeasured=float(Fetch(dict["DMM"]).query())
+                    )
                     del temp_string
+                    if progress is not None:
+                        progress(k + 1, total, results.info(k), results.data(k))
+
+                if journal is not None:
+                    journal.record(k, results)
 
                 Delay(dict["PSU"]).write(dict["DownTime"])
-                I += float(dict["current_step_size"])
-                j += 1
-                k += 1
 
-            V_fixed += float(dict["voltage_stepsize"])
-            i += 1
+            plan.finish()
+            if journal is not None:
+                journal.close()
+        finally:
+            # Closed without the completion mark if the sweep raised, so that the run can be resumed
+            if journal is not None:
+                journal.release()
+        # The points are stored in raster order for the analysis whatever the order of the sweep
+        results.reorder(plan.canonical())
         Output(dict["PSU"]).setOutputState("OFF")
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
-        return dataList, infoList
+        print(plan.summary(results.column("Settle")))
+        if settling is not None:
+            print(settling.summary())
+        return results
 
 
 class LoadRegulation:
@@ -851,7 +1277,7 @@ class LoadRegulation:
 
 
         """
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -869,7 +1295,8 @@ class LoadRegulation:
             Voltage,
             Current,
             Oscilloscope,
-        ) = Dimport.getClasses(dict["Instrument"])
+            Measure,
+        ) = DriverRegistry.classes(dict["Instrument"])
 
         # Instrument Initializations
         Configure(dict["DMM"]).write("Voltage")
@@ -929,7 +1356,7 @@ class LoadRegulation:
         print("Desired Voltage Regulation (CV): (%)", Desired_Voltage_Regulation)
         print("Calculated Voltage Regulation (CV): (%)", round(Voltage_Regulation, 4))
 
-    def executeCV_LoadRegulationB(self, dict):
+    def executeCV_LoadRegulationB(self, dict, progress=None):
         """Test for determining the Load Regulation of DUT under Constant Voltage (CV) Mode.
 
         The function first dynamically imports the library to be used. Next, settings for the
@@ -968,6 +1395,7 @@ class LoadRegulation:
             I_Max: Float storing the maximum nominal current value based on Power & Voltage Rating
             V_NL: Float storing the measured voltage during no load.
             V_FL: Float storing the measured voltage during full load.
+            progress: Optional callable receiving index, total, info and data after every point.
 
 
         Raises:
@@ -975,7 +1403,7 @@ class LoadRegulation:
 
 
         """
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -994,7 +1422,7 @@ class LoadRegulation:
             Current,
             Oscilloscope,
             Measure,
-        ) = Dimport.getClasses(dict["Instrument"])
+        ) = DriverRegistry.classes(dict["Instrument"])
 
         # Instruments Initialization
         Configure(dict["DMM"]).write("Voltage")
@@ -1025,20 +1453,17 @@ class LoadRegulation:
         Apply(dict["PSU"]).write(dict["PSU_Channel"], self.V_Rating, self.I_Rating)
         Output(dict["PSU"]).setOutputState("ON")
 
+        # Measurement completion is signalled through the Status Byte of the DMM
+        wait_DMM = CompletionWait.fromDict(dict, "DMM")
+
         # Reading for No Load Voltage
         k = 0
         WAI(dict["PSU"])
         Initiate(dict["DMM"]).initiate()
-        status = float(Status(dict["DMM"]).operationCondition())
+        wait_DMM.start()
         TRG(dict["DMM"])
-        while 1:
-            status = float(Status(dict["DMM"]).operationCondition())
-            if status == 8704.0:
-                V_NL = float(Fetch(dict["DMM"]).query())
-                break
-            elif status == 512.0:
-                V_NL = float(Fetch(dict["DMM"]).query())
-                break
+        wait_DMM.wait()
+        V_NL = float(Fetch(dict["DMM"]).query())
         Delay(dict["PSU"]).write(dict["DownTime"])
 
         self.infoList.insert(0, 
@@ -1052,6 +1477,9 @@ class LoadRegulation:
                              [V_NL, 
                               0])
         
+        if progress is not None:
+            progress(1, len(I_range), self.infoList[0], self.dataList[0])
+
         print("no load: ", V_NL)
         print("desired: ", Desired_Voltage_Regulation)
 
@@ -1071,16 +1499,10 @@ class LoadRegulation:
 
             WAI(dict["PSU"])
             Initiate(dict["DMM"]).initiate()
-            status = float(Status(dict["DMM"]).operationCondition())
+            wait_DMM.start()
             TRG(dict["DMM"])
-            while 1:
-                status = float(Status(dict["DMM"]).operationCondition())
-                if status == 8704.0:
-                    V_DMM = float(Fetch(dict["DMM"]).query())
-                    break
-                elif status == 512.0:
-                    V_DMM = float(Fetch(dict["DMM"]).query())
-                    break
+            wait_DMM.wait()
+            V_DMM = float(Fetch(dict["DMM"]).query())
             Delay(dict["PSU"]).write(dict["DownTime"])
 
             Voltage_Regulation = ((V_NL - V_DMM) / V_DMM) * 100
@@ -1089,6 +1511,8 @@ class LoadRegulation:
                         [V_DMM, 
                          Voltage_Regulation])
             k += 1
+            if progress is not None:
+                progress(k, len(I_range), self.infoList[i + 1], self.dataList[i + 1])
             print("eload: ", element)
             print("Voltage (Full load): ", V_DMM)
             print("Calculated Load Voltage Regulation (CV): (%)", round(Voltage_Regulation, 4))
@@ -1161,7 +1585,8 @@ class LoadRegulation:
             Voltage,
             Current,
             Oscilloscope,
-        ) = Dimport.getClasses(dict["Instrument"])
+            Measure,
+        ) = DriverRegistry.classes(dict["Instrument"])
         # Fixed Settings
         Configure(dict["DMM"]).write("Current")
         Trigger(dict["DMM"]).setSource("BUS")
@@ -1263,7 +1688,7 @@ class LoadRegulation:
             VisaIOError: An error occured when opening PyVisa Resources.
 
         """
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -1282,7 +1707,7 @@ class LoadRegulation:
             Current,
             Oscilloscope,
             Measure,
-        ) = Dimport.getClasses(dict["Instrument"])
+        ) = DriverRegistry.classes(dict["Instrument"])
 
         # Instruments Initialization
         Configure(dict["DMM"]).write("Voltage")
@@ -1317,21 +1742,16 @@ class LoadRegulation:
         Output(dict["ELoad"]).setOutputStateC("ON", dict["ELoad_Channel"])
         
 
+        # Measurement completion is signalled through the Status Byte of the DMM
+        wait_DMM = CompletionWait.fromDict(dict, "DMM")
+
         # Reading for No Load Voltage
         WAI(dict["PSU"])
         Initiate(dict["DMM"]).initiate()
-        status = float(Status(dict["DMM"]).operationCondition())
+        wait_DMM.start()
         TRG(dict["DMM"])
-        while 1:
-            status = float(Status(dict["DMM"]).operationCondition())
-
-            if status == 8704.0:
-                I_NL = float(Fetch(dict["DMM"]).query()) / float(dict["shuntResistance"])
-                break
-
-            elif status == 512.0:
-                I_NL = float(Fetch(dict["DMM"]).query()) / float(dict["shuntResistance"])
-                break
+        wait_DMM.wait()
+        I_NL = float(Fetch(dict["DMM"]).query()) / float(dict["shuntResistance"])
         Delay(dict["PSU"]).write(dict["DownTime"])
         Output(dict["ELoad"]).shortInput("OFF")
         Voltage(dict["ELoad"]).setOutputVoltage(V_Max, dict["ELoad_Channel"])
@@ -1339,18 +1759,11 @@ class LoadRegulation:
 
         WAI(dict["ELoad"])
         Initiate(dict["DMM"]).initiate()
-        status = float(Status(dict["DMM"]).operationCondition())
+        wait_DMM.start()
         TRG(dict["DMM"])
         Delay(dict["PSU"]).write(dict["UpTime"])
-        while 1:
-            status = float(Status(dict["DMM"]).operationCondition())
-
-            if status == 8704.0:
-                I_FL = float(Fetch(dict["DMM"]).query()) / float(dict["shuntResistance"])
-                break
-            elif status == 512.0:
-                I_FL = float(Fetch(dict["DMM"]).query()) / float(dict["shuntResistance"])
-                break
+        wait_DMM.wait()
+        I_FL = float(Fetch(dict["DMM"]).query()) / float(dict["shuntResistance"])
 
         Delay(dict["PSU"]).write(dict["DownTime"])
         print("Current (No load): ", I_NL, "Current (Full load): ", I_FL)
@@ -1400,12 +1813,14 @@ class RiseFallTime:
             VerticalScale: Float determining the vertical scale of the oscilloscope display.
             I_Step: Float determining the value of current step.
             V_settling_band: Float determining the desired voltage settling band.
+            Waveform: Optional string containing the path of the CSV file the captured transient is
+                saved to.
 
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
 
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -1423,7 +1838,8 @@ class RiseFallTime:
             Voltage,
             Current,
             Oscilloscope,
-        ) = Dimport.getClasses(dict["Instrument"])
+            Measure,
+        ) = DriverRegistry.classes(dict["Instrument"])
         V_Settling_Band = dict["V_Settling_Band"]
         # Instruments Settings
         Oscilloscope(dict["OSC"]).setChannelCoupling(
@@ -1471,6 +1887,7 @@ class RiseFallTime:
         print(
             f"Total Transient Time with Voltage Settling Band of {V_Settling_Band}, {rise_time+fall_time}s"
         )
+        Waveform.saveFromDict(dict, Oscilloscope)
 
         Output(dict["ELoad"]).setOutputStateC("OFF", dict["ELoad_Channel"])
 
@@ -1505,12 +1922,14 @@ class ProgrammingSpeedTest:
             Trigger_SlopeMode: String determing the Trigger Slope Mode of Oscilloscope.
             Upper_Bound: Float containing the upper threshold for the boundary.
             Lower_Bound: Float contining the lower threshold for the boundary.
+            Waveform: Optional string containing the path of the CSV files the rising and falling
+                edges are saved to, with _rise and _fall appended to the file name.
 
         Raises:
             VisaIOError: An error occured when opening PyVisa Resources.
         """
 
-        # Dynamic Library Import
+        # Subsystem classes of the library, loaded once by the DriverRegistry
         (
             Read,
             Apply,
@@ -1528,7 +1947,8 @@ class ProgrammingSpeedTest:
             Voltage,
             Current,
             Oscilloscope,
-        ) = Dimport.getClasses(dict["Instrument"])
+            Measure,
+        ) = DriverRegistry.classes(dict["Instrument"])
         # Instrument Initialization
         Lower_Bound = dict["Lower_Bound"]
         Upper_Bound = dict["Upper_Bound"]
@@ -1564,6 +1984,7 @@ class ProgrammingSpeedTest:
         sleep(1)
         Rise_Time = float(Oscilloscope(dict["OSC"]).getRiseTime(dict["OSC_Channel"]))
         print(f"Rise Time from{Lower_Bound}% to {Upper_Bound}%: {Rise_Time} s")
+        Waveform.saveFromDict(dict, Oscilloscope, "rise")
         sleep(1)
         Oscilloscope(dict["OSC"]).setSingleMode()
         sleep(1)
@@ -1572,5 +1993,6 @@ class ProgrammingSpeedTest:
         Fall_Time = float(Oscilloscope(dict["OSC"]).getFallTime(dict["OSC_Channel"]))
 
         print(f"Fall Time from {Upper_Bound}% to {Lower_Bound}%: {Fall_Time} s")
+        Waveform.saveFromDict(dict, Oscilloscope, "fall")
         WAI(dict["OSC"])
         Output(dict["PSU"]).setOutputState("OFF")
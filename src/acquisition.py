@@ -0,0 +1,267 @@
+""" Module containing the buffered acquisition of DMM readings.
+
+    Instead of one Initiate / TRG / Fetch cycle per reading, the DMM is configured to take N samples
+    for every trigger and M triggers per initiate. The readings are stored in the reading memory of
+    the DMM and retrieved in a single Fetch, after which averaging and outlier rejection are done on
+    the host with numpy. Several readings per setpoint therefore only cost one bus round trip.
+
+    Large buffers can be transferred as IEEE 488.2 binary blocks (FORM REAL) instead of ASCII, which
+    are read by query_binary_values straight into numpy arrays. The Waveform class below does the same
+    for the waveforms of the Oscilloscope, which the Transient Recovery Time and Programming Speed tests
+    save as CSV when Waveform is given in their parameters.
+
+"""
+
+import os
+from time import sleep
+
+import numpy as np
+
+from library.IEEEStandard import TRG
+from library.Registry import DriverRegistry
+from src.sync import CompletionWait
+
+
+class BufferedAcquisition(object):
+    """Acquire a block of readings from one DMM and reduce them to a single value
+
+    The Subsystem classes are passed in so that the acquisition works with the library chosen by
+    the DriverRegistry of library/Registry.py.
+
+    Attributes:
+        VISA_ADDRESS: String containing the VISA Address of the DMM.
+        samples: Integer containing the number of samples taken for every trigger.
+        triggers: Integer containing the number of triggers accepted per initiate.
+        source: String containing the trigger source of the DMM, "BUS", "EXT" or "IMM".
+        integration: Float containing the time (s) taken by a single reading.
+        reduction: String determining how the readings are reduced, "mean", "median" or "reject".
+        sigma: Float containing the rejection threshold in robust standard deviations.
+        wait: CompletionWait used to detect that the whole block has been acquired.
+        binary: Boolean determining if the readings are transferred as REAL,64 binary blocks.
+        last: Numpy array containing the raw readings of the last acquisition.
+
+    """
+
+    REDUCTIONS = ("mean", "median", "reject")
+
+    def __init__(
+        self,
+        Trigger,
+        Sample,
+        Initiate,
+        Fetch,
+        VISA_ADDRESS,
+        samples=1,
+        triggers=1,
+        source="BUS",
+        integration=0.0,
+        reduction="mean",
+        sigma=3.0,
+        wait=None,
+        Format=None,
+    ):
+        if reduction not in self.REDUCTIONS:
+            raise ValueError(f"Unknown reduction {reduction}, expected one of {self.REDUCTIONS}")
+
+        self.Initiate = Initiate
+        self.Fetch = Fetch
+        self.VISA_ADDRESS = VISA_ADDRESS
+        self.samples = int(samples)
+        self.triggers = int(triggers)
+        self.source = source.upper()
+        self.integration = integration
+        self.reduction = reduction
+        self.sigma = float(sigma)
+        self.wait = wait or CompletionWait(VISA_ADDRESS)
+        self.wait.delay = self.samples * self.triggers * integration
+        self.last = np.empty(0)
+        self.Format = Format
+        self.binary = Format is not None and hasattr(Fetch, "queryBinary")
+
+        Trigger(VISA_ADDRESS).setSource(self.source)
+        Trigger(VISA_ADDRESS).setCount(self.triggers)
+        Sample(VISA_ADDRESS).setSampleCount(self.samples)
+        if self.binary:
+            Format(VISA_ADDRESS).setDataFormat("REAL,64")
+            Format(VISA_ADDRESS).setByteOrder("NORM")
+
+    @classmethod
+    def fromDict(cls, dict, key, Trigger, Sample, Initiate, Fetch):
+        """Create the acquisition of the DMM dict[key] using the settings of a DUT Test
+
+        Args:
+            dict: Dictionary containing the parameters of the DUT Test.
+            key: String containing the key of the VISA Address of the DMM (e.g. "DMM_V").
+            Trigger, Sample, Initiate, Fetch: Subsystem classes of the library used.
+        """
+        integration = float(dict.get("Aperture", 0)) / float(dict.get("LineFrequency", 50))
+        Format = None
+        binary = dict.get("BinaryTransfer", False)
+        driver = DriverRegistry.of(Fetch)
+        if binary and driver is not None and driver.supports("binary"):
+            # The Format Subsystem is taken from the same library as the other Subsystems
+            Format = driver.get("Format")
+
+        return cls(
+            Trigger,
+            Sample,
+            Initiate,
+            Fetch,
+            dict[key],
+            samples=dict.get("SampleCount", 1),
+            triggers=dict.get("TriggerCount", 1),
+            source="BUS",
+            integration=integration,
+            reduction=dict.get("Reduction", "mean"),
+            sigma=dict.get("OutlierSigma", 3.0),
+            wait=CompletionWait.fromDict(dict, key),
+            Format=Format,
+        )
+
+    def acquire(self):
+        """Acquire the whole block of readings and retrieve it in one transfer
+
+        Returns:
+            Returns a numpy array containing samples * triggers readings.
+        """
+        self.start()
+        return self.finish()
+
+    def start(self):
+        """Initiate the DMM and send the bus triggers of the block
+
+        With a BUS trigger source one TRG is sent for every trigger, spaced by the time the samples
+        of the previous trigger take. External and immediate triggers are left to the hardware, so
+        the sequence driving them can be started once start() has returned.
+        """
+        self.Initiate(self.VISA_ADDRESS).initiate()
+        self.wait.start()
+
+        if self.source == "BUS":
+            for n in range(self.triggers):
+                if n > 0:
+                    sleep(self.samples * self.integration)
+                TRG(self.VISA_ADDRESS)
+
+    def finish(self):
+        """Wait for the block to be complete and retrieve every reading in one transfer"""
+        self.wait.wait()
+        self.last = self.fetch()
+        return self.last
+
+    def fetch(self):
+        if self.binary:
+            return self.Fetch(self.VISA_ADDRESS).queryBinary("d", is_big_endian=True)
+
+        return np.array(self.Fetch(self.VISA_ADDRESS).query().split(","), dtype=float)
+
+    def release(self):
+        """Return the DMM to ASCII transfers used by the queries of the other tests"""
+        if self.binary:
+            self.Format(self.VISA_ADDRESS).setDataFormat("ASC")
+
+    def read(self):
+        """Acquire a block of readings and reduce it to a single value"""
+        return self.reduce(self.acquire(), self.reduction, self.sigma)
+
+    @staticmethod
+    def reduce(readings, reduction="mean", sigma=3.0):
+        """Reduce a block of readings to a single value
+
+        The "reject" reduction discards the readings further than sigma robust standard deviations
+        (1.4826 * median absolute deviation) from the median before averaging the rest.
+
+        Args:
+            readings: Numpy array containing the readings.
+            reduction: String determining the reduction, "mean", "median" or "reject".
+            sigma: Float containing the rejection threshold.
+
+        Returns:
+            Returns the reduced reading as a float.
+        """
+        readings = np.asarray(readings, dtype=float)
+
+        if readings.size == 1 or reduction == "mean":
+            return float(readings.mean())
+
+        median = np.median(readings)
+        if reduction == "median":
+            return float(median)
+
+        spread = 1.4826 * np.median(np.abs(readings - median))
+        if spread == 0:
+            return float(median)
+
+        kept = readings[np.abs(readings - median) <= sigma * spread]
+        return float(kept.mean())
+
+
+class Waveform(object):
+    """Class retrieving the waveforms of the Oscilloscope as binary blocks"""
+
+    @staticmethod
+    def oscilloscope(Oscilloscope, VISA_ADDRESS, ChannelNumber, points=None):
+        """Retrieve the waveform of an Oscilloscope channel as 16 bit words
+
+        The raw words are scaled to time and voltage using the waveform preamble.
+
+        Args:
+            Oscilloscope: Oscilloscope Subsystem class of the library used.
+            VISA_ADDRESS: String containing the VISA Address of the Oscilloscope.
+            ChannelNumber: Integer containing the channel of the Oscilloscope.
+            points: Optional integer containing the number of points to transfer.
+
+        Returns:
+            Returns two numpy arrays, containing the time (s) and voltage (V) of every point.
+        """
+        scope = Oscilloscope(VISA_ADDRESS)
+        scope.setWaveformSource(ChannelNumber)
+        scope.setWaveformFormat("WORD")
+        scope.setWaveformByteOrder("MSBF")
+        if points is not None:
+            scope.setWaveformPoints(points)
+
+        preamble = [float(value) for value in scope.getWaveformPreamble().split(",")]
+        x_increment, x_origin, x_reference = preamble[4:7]
+        y_increment, y_origin, y_reference = preamble[7:10]
+
+        data = scope.getWaveformData("H", is_big_endian=True)
+        index = np.arange(data.size)
+        time = (index - x_reference) * x_increment + x_origin
+        voltage = (data - y_reference) * y_increment + y_origin
+
+        return time, voltage
+
+    @classmethod
+    def saveFromDict(cls, dict, Oscilloscope, name=""):
+        """Save the waveform captured on the channel of the Oscilloscope if Waveform is given in a DUT Test
+
+        Args:
+            dict: Dictionary containing the parameters of the DUT Test, Waveform is an optional string
+                containing the path of the CSV file.
+            Oscilloscope: Oscilloscope Subsystem class of the library used.
+            name: Optional string appended to the file name, e.g. "rise" for one of several captures.
+
+        Returns:
+            Returns the path of the CSV file, or None if Waveform is not given.
+        """
+        path = dict.get("Waveform")
+        if not path:
+            return None
+
+        if name:
+            root, extension = os.path.splitext(path)
+            path = f"{root}_{name}{extension}"
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        time, voltage = cls.oscilloscope(Oscilloscope, dict["OSC"], dict["OSC_Channel"])
+        np.savetxt(
+            path,
+            np.column_stack((time, voltage)),
+            delimiter=",",
+            header="Time (s),Voltage (V)",
+            comments="",
+        )
+        return path
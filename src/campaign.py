@@ -0,0 +1,389 @@
+""" Module containing the headless runner of test campaigns.
+
+    A campaign is a JSON file listing the configurations of many DUT Tests, using the same keys as the
+    dictionaries compiled by the dialogs of main_GUI.py with dictGenerator.input, plus the type of the
+    test under "Test":
+
+        {
+            "defaults": {"Instrument": "Keysight", "PSU": "USB0::...", "ELoad": "USB0::...", ...},
+            "runs": [
+                {"Test": "Voltage Accuracy", "minVoltage": 1, "maxVoltage": 30, ...},
+                {"Test": "Load Regulation (CV)", "Repeat": 3, ...}
+            ]
+        }
+
+    The keys of "defaults" are shared by every run and overridden by the keys of the run. The runs are
+    executed back to back without Qt, dialogs or confirmations. Every run gets its own folder with the
+    output printed by the test, its data, chart and Excel report, and is stored in the ResultStore. A
+    run that raises an error is recorded as such and the campaign continues with the next one. With
+    trace, the SCPI transactions of every run are timed by the Tracer of library/Tracing.py and written
+    to latency.csv and trace.json in its folder. The Oscilloscope tests save the captured waveforms to
+    waveform.csv in their folder.
+
+    The points of the accuracy tests are journaled to journal.jsonl in the folder of their run (see
+    src/journal.py). With resume, a campaign run again into the same output folder continues every
+    interrupted run from its next unfinished point, and reloads the points of the completed ones.
+
+    The duration of every run can be estimated beforehand by estimate(), which runs the campaign
+    against simulated Instruments in virtual time (see src/estimate.py).
+
+"""
+
+import contextlib
+import csv
+import datetime
+import json
+import os
+import re
+import shutil
+import sys
+import traceback
+import types
+from time import monotonic
+
+from src.progress import Progress
+
+
+class Campaign(object):
+    """Runs a list of DUT Test configurations back to back
+
+    Attributes:
+        runs: List of dictionaries containing the parameters of every run, with its type under "Test".
+        output: String containing the folder in which a subfolder is created for every run.
+        report: Boolean determining if the Excel report of every run is generated.
+        store: Boolean determining if every run is recorded in the ResultStore.
+        stop: Boolean determining if the campaign stops at the first run raising an error.
+        verbose: Boolean determining if every measured point is printed.
+        trace: Boolean determining if the latency of every SCPI transaction is traced.
+        resume: Boolean determining if the runs recorded in the journals of the output folder are continued.
+        console: Stream the progress of the campaign is printed to.
+
+    """
+
+    # Keys of the VISA Addresses opened for every type of test
+    INSTRUMENTS = {
+        "Voltage Accuracy": ("ELoad", "PSU", "DMM_V"),
+        "Current Accuracy": ("ELoad", "PSU", "DMM_I"),
+        "Load Regulation (CV)": ("ELoad", "PSU", "DMM"),
+        "Load Regulation (CC)": ("ELoad", "PSU", "DMM"),
+        "Transient Recovery Time": ("ELoad", "PSU", "OSC"),
+        "Programming Speed": ("PSU", "OSC"),
+    }
+
+    def __init__(
+        self,
+        runs,
+        output="campaign_output",
+        report=True,
+        store=True,
+        stop=False,
+        verbose=False,
+        trace=False,
+        resume=False,
+    ):
+        self.runs = runs
+        self.output = output
+        self.report = report
+        self.store = store
+        self.stop = stop
+        self.verbose = verbose
+        self.trace = trace
+        self.resume = resume
+        self.console = sys.stdout
+
+        for index, run in enumerate(runs):
+            if run.get("Test") not in self.INSTRUMENTS:
+                raise ValueError(
+                    f"Run {index}: unknown Test {run.get('Test')!r}, expected one of {list(self.INSTRUMENTS)}"
+                )
+
+    @classmethod
+    def fromFile(cls, path, **options):
+        """Create the campaign described by a JSON campaign file
+
+        Args:
+            path: String containing the path of the campaign file.
+            **options: Keyword arguments passed to Campaign.
+        """
+        with open(path) as file:
+            campaign = json.load(file)
+
+        if isinstance(campaign, list):
+            campaign = {"runs": campaign}
+
+        defaults = campaign.get("defaults", {})
+        runs = []
+        for run in campaign["runs"]:
+            run = {**defaults, **run}
+            for _ in range(int(run.pop("Repeat", 1))):
+                runs.append(dict(run))
+
+        options.setdefault(
+            "output", os.path.join("campaign_output", os.path.splitext(os.path.basename(path))[0])
+        )
+        return cls(runs, **options)
+
+    def print(self, *args):
+        print(*args, file=self.console, flush=True)
+
+    def run(self):
+        """Run every test of the campaign
+
+        Returns:
+            Returns a list containing a dictionary summarizing every run, which is also written to
+            summary.csv in the output folder.
+        """
+        from library.AsyncSession import AsyncSession
+        from library.SessionPool import SessionPool
+
+        os.makedirs(self.output, exist_ok=True)
+        os.makedirs("images", exist_ok=True)
+        summary = []
+
+        try:
+            for index, dict in enumerate(self.runs):
+                self.print(f"[{index + 1}/{len(self.runs)}] {dict['Test']}")
+                entry = self.runOne(index, dict)
+                summary.append(entry)
+                self.print(f"    {entry['status']} in {entry['duration']:.1f} s {entry['message']}")
+
+                if entry["status"] == "ERROR" and self.stop:
+                    break
+        finally:
+            AsyncSession.shutdown()
+            SessionPool.closeAll()
+
+        self.writeSummary(summary)
+        return summary
+
+    def runOne(self, index, dict):
+        """Run a single test, writing everything it prints and its errors to log.txt in its folder"""
+        from library.SessionPool import SessionPool
+
+        test = dict["Test"]
+        folder = os.path.join(self.output, f"{index + 1:03d}-" + re.sub(r"\W+", "_", test).strip("_"))
+        os.makedirs(folder, exist_ok=True)
+        dict = {
+            "Journal": os.path.join(folder, "journal.jsonl"),
+            "Waveform": os.path.join(folder, "waveform.csv"),
+            **dict,
+            "Resume": self.resume,
+        }
+
+        entry = {
+            "index": index + 1,
+            "test": test,
+            "status": "ERROR",
+            "failures": 0,
+            "duration": 0.0,
+            "folder": folder,
+            "run_id": "",
+            "message": "",
+        }
+        start = monotonic()
+
+        with open(os.path.join(folder, "log.txt"), "w") as log, contextlib.redirect_stdout(
+            log
+        ), contextlib.redirect_stderr(log):
+            if self.trace:
+                from library.Tracing import Tracer
+
+                tracer = Tracer.start()
+            try:
+                self.openInstruments(dict)
+                function, judge, progress = self.method(dict)
+                # The test methods use self as a scratch namespace, the dialog in the GUI
+                namespace = types.SimpleNamespace(infoList=[], dataList=[])
+                if progress:
+                    result = function(namespace, dict, progress=Progress(self.point, judge))
+                else:
+                    result = function(namespace, dict)
+
+                entry.update(self.complete(dict, result, folder))
+            except Exception as e:
+                traceback.print_exc(file=log)
+                entry["message"] = f"{type(e).__name__}: {e}"
+                # The state of the Instruments is unknown, the next run reopens every session
+                SessionPool.closeAll()
+            finally:
+                if self.trace:
+                    Tracer.stop()
+                    tracer.writeChromeTrace(os.path.join(folder, "trace.json"))
+                    tracer.writeSummary(os.path.join(folder, "latency.csv"))
+                    print(tracer.summary())
+
+        entry["duration"] = round(monotonic() - start, 3)
+        return entry
+
+    def estimate(self, dry=None):
+        """Estimate the duration of every run with a dry run in virtual time, see src/estimate.py
+
+        Args:
+            dry: Optional DryRun, using the calibrated latency model if it exists by default.
+
+        Returns:
+            Returns a list containing the estimate of every run, None for the runs it failed for.
+        """
+        from src.estimate import DryRun
+
+        dry = dry or DryRun()
+        estimates = []
+        for index, dict in enumerate(self.runs):
+            try:
+                estimate = dry.estimate(self.method(dict)[0], dict)
+                self.print(f"[{index + 1}/{len(self.runs)}] {dict['Test']}: {DryRun.format(estimate)}")
+            except Exception as e:
+                estimate = None
+                self.print(f"[{index + 1}/{len(self.runs)}] {dict['Test']}: {type(e).__name__}: {e}")
+            estimates.append(estimate)
+
+        completed = [estimate for estimate in estimates if estimate is not None]
+        total = {
+            "duration": sum(estimate["duration"] for estimate in completed),
+            "points": sum(estimate["points"] or 0 for estimate in completed),
+            "transactions": sum(estimate["transactions"] for estimate in completed),
+        }
+        self.print(f"{len(self.runs)} runs: {DryRun.format(total)}")
+        return estimates
+
+    def point(self, index, total, info, data, verdict, eta):
+        if self.verbose:
+            self.print(f"    point {index}/{total} {verdict}  ETA: {eta:.1f} s")
+
+    def openInstruments(self, dict):
+        from src.DUT_Test import VisaResourceManager
+
+        addresses = [dict[key] for key in self.INSTRUMENTS[dict["Test"]]]
+        manager = VisaResourceManager()
+        if hasattr(manager.rm, "wire"):
+            # The simulated backend takes the part played by every VISA Address from the run
+            manager.rm.wire(dict)
+
+        flag, args = manager.openRM(*addresses)
+        if flag == 0:
+            raise IOError("VISA IO ERROR " + "".join(str(item) for item in args))
+
+    def method(self, dict):
+        """Select the test method the same way as the dialogs of the GUI
+
+        Returns:
+            Returns the test method, the judge of its points and whether it reports progress.
+        """
+        from library.Registry import DriverRegistry
+        from src.DUT_Test import (
+            CurrentMeasurement,
+            LoadRegulation,
+            ProgrammingSpeedTest,
+            RiseFallTime,
+            VoltageMeasurement,
+        )
+
+        test = dict["Test"]
+        keysight = dict.get("Instrument") == "Keysight"
+        # Hardware sequenced sweeps are run by the libraries supporting the List Subsystem
+        listMode = dict.get("SweepMode") == "List" and DriverRegistry.supports(dict["Instrument"], "list")
+
+        if test == "Voltage Accuracy":
+            judge = Progress.accuracy(
+                float(dict["Prog_Accuracy_Gain"]), float(dict["Prog_Accuracy_Offset"]), 0
+            )
+            if listMode:
+                return VoltageMeasurement.executeVoltageMeasurementList, judge, True
+            if keysight:
+                return VoltageMeasurement.executeVoltageMeasurementA, judge, True
+            return VoltageMeasurement.executeVoltageMeasurementB, judge, True
+
+        if test == "Current Accuracy":
+            judge = Progress.accuracy(
+                float(dict["Prog_Accuracy_Gain"]), float(dict["Prog_Accuracy_Offset"]), 1
+            )
+            if listMode:
+                return CurrentMeasurement.executeCurrentMeasurementList, judge, True
+            if keysight:
+                return CurrentMeasurement.executeCurrentMeasurementA, judge, True
+            return CurrentMeasurement.executeCurrentMeasurementB, judge, True
+
+        if test == "Load Regulation (CV)":
+            if keysight:
+                return LoadRegulation.executeCV_LoadRegulationB, None, True
+            return LoadRegulation.executeCV_LoadRegulationA, None, False
+
+        if test == "Load Regulation (CC)":
+            if keysight:
+                return LoadRegulation.executeCC_LoadRegulationB, None, False
+            return LoadRegulation.executeCC_LoadRegulationA, None, False
+
+        if test == "Transient Recovery Time":
+            return RiseFallTime.execute, None, False
+
+        return ProgrammingSpeedTest.execute, None, False
+
+    def complete(self, dict, result, folder):
+        """Analyse the result of a run and write its data, chart, report and database record
+
+        Returns:
+            Returns a dictionary updating the summary of the run.
+        """
+        from src.data import configData, datatoCSV_Regulation, datatoGraph, instrumentData
+        from src.xlreport import xlreport, xlreport_Regulation
+
+        test = dict["Test"]
+        if test in ("Voltage Accuracy", "Current Accuracy"):
+            flag_VI = 1 if test == "Voltage Accuracy" else 2
+            DMM = dict["DMM_V"] if flag_VI == 1 else dict["DMM_I"]
+            instrument = instrumentData(dict["PSU"], DMM, dict["ELoad"])
+            graph = datatoGraph(result, flag_VI=flag_VI)
+            compare = graph.scatterCompareVoltage if flag_VI == 1 else graph.scatterCompareCurrent
+            data = compare(
+                float(dict["Prog_Accuracy_Gain"]),
+                float(dict["Prog_Accuracy_Offset"]),
+                float(dict["Rdbk_Accuracy_Gain"]),
+                float(dict["Rdbk_Accuracy_Offset"]),
+            )
+            graph.saveError(os.path.join(folder, "error.csv"))
+            shutil.copy("images/Chart.png", os.path.join(folder, "Chart.png"))
+            report = xlreport
+
+        elif test == "Load Regulation (CV)" and result is not None:
+            instrument = instrumentData(dict["PSU"], dict["DMM"], dict["ELoad"])
+            regulation = datatoCSV_Regulation(*result)
+            regulation.save(os.path.join(folder, "data.csv"))
+            data = regulation.data
+            report = xlreport_Regulation
+
+        else:
+            return {"status": "DONE"}
+
+        if self.report:
+            A = report()
+            A.path = os.path.join(folder, "report.xlsx")
+            A.run(data, instrument.data, configData(dict).data)
+
+        from src.store import ResultStore
+
+        failures, verdict = ResultStore.summary(data)
+        entry = {"status": verdict or "DONE", "failures": failures}
+        if self.store:
+            with ResultStore() as store:
+                entry["run_id"] = store.record(test, data, dict, instrument.data)
+
+        return entry
+
+    def writeSummary(self, summary):
+        path = os.path.join(self.output, "summary.csv")
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(
+                file,
+                fieldnames=["index", "test", "status", "failures", "duration", "folder", "run_id", "message"],
+            )
+            writer.writeheader()
+            writer.writerows(summary)
+
+        counts = {}
+        for entry in summary:
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        self.print(
+            f"{len(summary)} runs: "
+            + ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+            + f" ({datetime.datetime.now():%Y-%m-%d %H:%M:%S}), summary in {path}"
+        )
@@ -2,8 +2,22 @@
 
     The module mainly uses maltplotlib to plot graphs and pandas to process the data.
 
+    The DataFrames are passed in memory from the test results through the limits and chart to the
+    Excel report. Writing them to the csv folder is an optional sink, done with the save() methods.
+
+    The charts are only saved to the images folder, hence the non-interactive Agg backend is selected
+    unless MPLBACKEND asks for another one. Plotting then needs neither a display nor the Qt backend,
+    and the module can be imported by headless runs.
+
 """
 
+import os
+
+import matplotlib
+
+if "MPLBACKEND" not in os.environ:
+    matplotlib.use("Agg")
+
 from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
@@ -16,22 +30,21 @@ class datatoCSV_Accuracy(object):
     """This class is used to preprocess the data collected for Voltage/Accuracy test and export CSV Files
 
     Attributes:
-        infoList: List containing information collected from Program
-        dataList List containing measured data collected from DUT
+        data: DataFrame containing the information collected from Program, the measured data
+            collected from DUT and their errors.
 
     """
 
-    def __init__(self, infoList, dataList, flag_VI):
+    def __init__(self, results, flag_VI):
         """This function initializes the preprocessing of data and generate CSV file
 
-            This function begins by extracting the list provided as an arguement into
-            multiple columns. The absolute and percentage error is then calculted using
-            the columns, the columns are then converted into dataframes which is then
-            all compiled into a csv file.
+            This function begins by taking the columns of the ResultBuffer provided as an
+            arguement, which are wrapped into Series without copying them. The absolute and
+            percentage error is then calculted using the columns, the columns are then converted
+            into dataframes which is then all compiled into the data DataFrame.
 
         Args:
-            infoList: List containing all the data that is sent from the program.
-            dataList: List containing all the data that is collected from the DUT.
+            results: ResultBuffer containing the data sent from the program and collected from the DUT.
             Vset: Column containing information regarding the Voltage Set.
             Iset: Column containing information regarding the Current Set.
             Key: Column containing key to differentiate different current iterations.
@@ -45,16 +58,16 @@ class datatoCSV_Accuracy(object):
 
         """
 
-        Vset = pd.Series(self.column(infoList, 0))
-        Iset = pd.Series(self.column(infoList, 1))
-        Key = pd.Series(self.column(infoList, 2))
-        Mode = pd.Series(self.column(infoList, 3))
-        VIfix = pd.Series(self.column(infoList, 4))
+        Vset = results.series("Vset")
+        Iset = results.series("Iset")
+        Key = results.series("key")
+        Mode = results.series("Mode")
+        VIfix = results.series("VIfix")
 
-        Vmeasured = pd.Series(self.column(dataList, 0))
-        Imeasured = pd.Series(self.column(dataList, 1))
-        Vreadback = pd.Series(self.column(dataList, 2))
-        Ireadback = pd.Series(self.column(dataList, 3))
+        Vmeasured = results.series("Vmeasured")
+        Imeasured = results.series("Imeasured")
+        Vreadback = results.series("Vreadback")
+        Ireadback = results.series("Ireadback")
 
         Vmeas_error = Vset - Vmeasured
         VPmeas_error = Vmeas_error / Vset * 100
@@ -94,39 +107,36 @@ class datatoCSV_Accuracy(object):
         Irdbk_errorF = Irdbk_error.to_frame(name="Curr Rdbk_Err")
         IPrdbk_errorF = IPrdbk_error.to_frame(name="Curr Rdbk_Err(%)")
 
-        CSV1 = pd.concat(
-            [
-                VsetF,
-                IsetF,
-                VIfixF,
-                modeF,
-                VreadbackF,
-                IreadbackF,
-                VmeasuredF,
-                ImeasuredF,
-                keyF,
-                Vrdbk_errorF,
-                VPrdbk_errorF,
-                Irdbk_errorF,
-                IPrdbk_errorF,
-                Vmeas_errorrF,
-                VPmeas_errorF,
-                Imeas_errorF,
-                IPmeas_errorF,
-            ],
-            axis=1,
-        )
-
-        CSV1.to_csv("csv/data.csv", index=False)
+        columns = [
+            VsetF,
+            IsetF,
+            VIfixF,
+            modeF,
+            VreadbackF,
+            IreadbackF,
+            VmeasuredF,
+            ImeasuredF,
+            keyF,
+            Vrdbk_errorF,
+            VPrdbk_errorF,
+            Irdbk_errorF,
+            IPrdbk_errorF,
+            Vmeas_errorrF,
+            VPmeas_errorF,
+            Imeas_errorF,
+            IPmeas_errorF,
+        ]
+        # Columns of the optional measurement modes are only exported when they were used
+        for name, label in [("Settle", "Settle Time (s)"), ("NPLC", "Deciding NPLC")]:
+            extra = results.series(name)
+            if extra.notna().any():
+                columns.append(extra.to_frame(name=label))
+
+        self.data = pd.concat(columns, axis=1)
+
+    def save(self, path="csv/data.csv"):
+        self.data.to_csv(path, index=False)
 
-    def column(self, matrix, i):
-        """Function to convert rows of data from list to a column
-
-        Args:
-            matrix: The 2D matrix to store the column data
-            i: to iterate through loop
-        """
-        return [row[i] for row in matrix]
 
 class datatoCSV_Regulation(object):
     def __init__(self, infoList, dataList):
@@ -135,7 +145,6 @@ class datatoCSV_Regulation(object):
         Prating = pd.Series(self.column(infoList, 2))
         Desired_Vreg = pd.Series(self.column(infoList, 3))
         I_eload = pd.Series(self.column(infoList, 4))
-        key = pd.Series(self.column(infoList, 5))
 
         Vdmm = pd.Series(self.column(dataList, 0))
         Calculated_Vreg = pd.Series(self.column(dataList, 1))
@@ -145,12 +154,11 @@ class datatoCSV_Regulation(object):
         PratingF = Prating.to_frame(name="Power Rating")
         Desired_VregF = Desired_Vreg.to_frame(name="Desired Volt Regulation")
         I_eloadF = I_eload.to_frame(name="Current Set(EL)")
-        keyF = key.to_frame(name="key")
 
         VdmmF = Vdmm.to_frame(name="Voltage Meas(DMM)")
         Calculated_VregF = Calculated_Vreg.to_frame(name="Cal Volt Regulation")
 
-        CSV1 = pd.concat(
+        self.data = pd.concat(
             [
                 VratingF,
                 IratingF,
@@ -162,7 +170,9 @@ class datatoCSV_Regulation(object):
             ],
             axis=1,
         )
-        CSV1.to_csv("csv/data.csv", index=False)
+
+    def save(self, path="csv/data.csv"):
+        self.data.to_csv(path, index=False)
 
     def column(self, matrix, i):
         """Function to convert rows of data from list to a column
@@ -176,15 +186,48 @@ class datatoCSV_Regulation(object):
 class datatoGraph(datatoCSV_Accuracy):
     """Child class of datatoCSV_Accuracy to plot the graph"""
 
-    def __init__(self, infoList, dataList, flag_VI):
-        super().__init__(infoList, dataList, flag_VI)
-        self.data = pd.read_csv("csv/data.csv")
+    def __init__(self, results, flag_VI):
+        super().__init__(results, flag_VI)
+        self.error = None
+
+    @staticmethod
+    def evaluateLimits(x, error, param1, param2):
+        """Function is used to evaluate the error boundaries and conditions of every point at once
+
+            The boundaries are computed from the specification for the whole column in one
+            vectorized operation, and every point whose percentage error falls outside of them
+            is marked "FAIL", the others "PASS". Points without data (NaN), e.g. the readback of a
+            sweep in list mode, were never measured and are marked "N/A".
+
+        Args:
+            x: Series or array containing the set values.
+            error: Series or array containing the percentage errors.
+            param1: float value of the gain of the specification.
+            param2: float value of the offset of the specification.
+
+        Returns:
+            Returns two numpy arrays, containing the upper error boundary and the condition of every point.
+        """
+        x = np.asarray(x, dtype=float)
+        error = np.asarray(error, dtype=float)
+
+        upper_error_limit = (param1 * x + param2) * 100
+        fail = (upper_error_limit < error) | (-upper_error_limit > error)
+
+        condition = np.where(fail, "FAIL", "PASS")
+        return upper_error_limit, np.where(np.isnan(error), "N/A", condition)
+
+    def plotCondition(self, x, x_err, condition, label):
+        """Function is used to plot a line of percentage error, with the failed points visibly red and larger"""
+        fail = condition == "FAIL"
+        plt.scatter(np.asarray(x)[fail], np.asarray(x_err)[fail], color="red", s=12)
+        plt.plot(x, x_err, label=label)
 
     def errorBoundary(self, param1, param2, UNIT, x, x_err, y):
         """Function is used to determine and plot the error boundaries of voltage/current accuracy
 
-            The function begins by defining certain parameters, it also extracts data from method
-            ScatterCompare() that has determined which points have passed or failed the given condition.
+            The function begins by evaluating the error boundaries and which points have passed or
+            failed the given condition with evaluateLimits().
 
             The valyes given will change how the points are plotted on the scatter plot.
             A scatter plot is then plotted on the same plane with the error boundary lines.
@@ -196,455 +239,177 @@ class datatoGraph(datatoCSV_Accuracy):
         Args:
             upper_error_limit: float value of the upper error boundary determined from specification.
             lower_error_limit: float value of the lower error boundary determined from specification.
-            condition1: Boolean which indicates if the absolute error is higher than upper error limit.
-            condition2: Boolean which indicates if the absolute error is lower than lower error limit.
-            boolList: List containing all the conditions of each point whether they passed or failed.
+            condition_series: Series containing the condition of each point whether they passed or failed.
 
         """
-        boolList = []
-
         if UNIT.upper() == "VOLTAGE":
-            upper_error_limit = (param1 * x + param2) * 100
-            lower_error_limit = -upper_error_limit
-            self.upper_error_limit = upper_error_limit
-            self.lower_error_limit = lower_error_limit
-
-            condition1 = upper_error_limit < x_err
-            condition2 = lower_error_limit > x_err
-
-            for i in range(condition1.count()):
-                if condition1.iloc[i] | condition2.iloc[i]:
-                    self.condition = "FAIL"
-                    boolList.append(self.condition)
-                else:
-                    self.condition = "PASS"
-                    boolList.append(self.condition)
-
-            self.condition_series = pd.Series(boolList)
-
-            self.upper_error_limitF = upper_error_limit.to_frame(
-                name="Upper Error Boundary (" + UNIT + " )"
-            )
-            self.lower_error_limitF = lower_error_limit.to_frame(
-                name="Lower Error Boundary (" + UNIT + " )"
-            )
-
-            self.conditionF = self.condition_series.to_frame(name="Condition ?")
-
-            self.z = self.condition_series.to_numpy()
-            self.colour_condition = np.where(self.z == "PASS", "black", "red")
-            self.size_condition = np.where(self.z == "PASS", 6, 12)
-            self.alpha_condition = np.where(self.z == "PASS", 0, 1)
-
-            plt.scatter(
-                x,
-                x_err,
-                color=self.colour_condition,
-                s=self.size_condition,
-                alpha=self.alpha_condition,
-            )
-
-            plt.plot(
-                x,
-                x_err,
-                label="Current = " + str(y.iloc[0]["Current Set (EL)"]),
-            )
-            # plt.legend(loc="upper left")
-            plt.title(UNIT)
-            plt.xlabel("Voltage (V)")
-            plt.ylabel("Percentage Error (%)")
+            upper_error_limit, condition = self.evaluateLimits(x, x_err, param1, param2)
+            label = "Current = " + str(y.iloc[0]["Current Set (EL)"])
+            xlabel = "Voltage (V)"
 
         elif UNIT.upper() == "CURRENT":
-            upper_error_limit = param1 * x + param2 * 100
-            lower_error_limit = -upper_error_limit
-            self.upper_error_limit = upper_error_limit
-            self.lower_error_limit = lower_error_limit
-
-            condition1 = upper_error_limit < x_err
-            condition2 = lower_error_limit > x_err
-
-            for i in range(condition1.count()):
-                if condition1.iloc[i] | condition2.iloc[i]:
-                    self.condition = "FAIL"
-                    boolList.append(self.condition)
-                else:
-                    self.condition = "PASS"
-                    boolList.append(self.condition)
-
-            self.condition_series = pd.Series(boolList)
-
-            self.upper_error_limitF = upper_error_limit.to_frame(
-                name="Upper Error Boundary (" + UNIT + " )"
-            )
-            self.lower_error_limitF = lower_error_limit.to_frame(
-                name="Lower Error Boundary (" + UNIT + " )"
-            )
+            # The offset of the current specification is already given in percent of the gain
+            upper_error_limit, condition = self.evaluateLimits(x, x_err, param1 / 100, param2)
+            label = "Voltage = " + str(y.iloc[0]["Voltage Set (EL)"])
+            xlabel = "Current (A)"
 
-            self.conditionF = self.condition_series.to_frame(name="Condition ?")
+        else:
+            return
 
-            self.z = self.condition_series.to_numpy()
-            self.colour_condition = np.where(self.z == "PASS", "black", "red")
-            self.size_condition = np.where(self.z == "PASS", 6, 12)
-            self.alpha_condition = np.where(self.z == "PASS", 0, 1)
+        index = getattr(x, "index", None)
+        self.upper_error_limit = pd.Series(upper_error_limit, index=index)
+        self.lower_error_limit = -self.upper_error_limit
+        self.condition_series = pd.Series(condition)
 
-            plt.scatter(
-                x,
-                x_err,
-                color=self.colour_condition,
-                s=self.size_condition,
-                alpha=self.alpha_condition,
-            )
-
-            plt.plot(
-                x,
-                x_err,
-                label="Voltage = " + str(y.iloc[0]["Voltage Set (EL)"]),
-            )
-            # plt.legend(loc="upper left")
-            plt.title(UNIT)
-            plt.xlabel("Current (A)")
-            plt.ylabel("Percentage Error (%)")
+        self.upper_error_limitF = self.upper_error_limit.to_frame(
+            name="Upper Error Boundary (" + UNIT + " )"
+        )
+        self.lower_error_limitF = self.lower_error_limit.to_frame(
+            name="Lower Error Boundary (" + UNIT + " )"
+        )
+        self.conditionF = self.condition_series.to_frame(name="Condition ?")
 
-    def scatterCompareVoltage(self, meas1, meas2, rdbk1, rdbk2):
-        """Function is used to determine and plot the error boundaries of voltage accuracy
-
-            The function begins by computing the error boundaries based on specifications.
-            The error boundaries are then compared using data extracted from parent class.
-            The boolList will collect information whether the accuracy at certain point has
-            been reached. The boolList will append a "PASS" if it does, else "FAIL".
-            A scatter plot is then plotted on the same plane with the error boundary lines.
-            For scatter points that do not meet the condition will appear visibly red and larger.
+        self.plotCondition(x, x_err, condition, label)
+        plt.title(UNIT)
+        plt.xlabel(xlabel)
+        plt.ylabel("Percentage Error (%)")
 
+    def scatterCompare(self, UNIT, x, legend, label, meas, rdbk, bound, meas1, meas2, rdbk1, rdbk2):
+        """Function is used to determine and plot the error boundaries of voltage/current accuracy
 
+            The error boundaries and conditions of the measured and readback values are evaluated
+            for the whole frame in a single vectorized pass. The frame is then grouped once by key,
+            and every group is plotted as one line with the failed points visibly red and larger.
+            The error boundary lines of the last group are plotted on the same plane.
+            The data with the boundary and condition columns is kept in the error DataFrame.
 
         Args:
-            upper_error_limit: float value of the upper error boundary determined from specification
-            lower_error_limit: float value of the lower error boundary determined from specification
-            condition1: Boolean which indicates if the absolute error is higher than upper error limit.
-            condition2: Boolean which indicates if the absolute error is lower than lower error limit.
-            boolList: List containing all the conditions of each point whether they passed or failed.
-
+            UNIT: String containing the quantity compared, "Voltage" or "Current".
+            x: String containing the column of the set value compared.
+            legend: String containing the column of the fixed set value of each key.
+            label: String containing the name of the fixed set value shown in the legend.
+            meas: String containing the column of the percentage error of the measured values.
+            rdbk: String containing the column of the percentage error of the readback values.
+            bound: String containing the prefix of the boundary columns, "+-V_Ebound" or "+-I_Ebound".
+            meas1, meas2: float values of the gain and offset of the programming specification.
+            rdbk1, rdbk2: float values of the gain and offset of the readback specification.
 
         """
-        ungrouped_df = pd.read_csv("csv/data.csv", index_col=False)
-        grouped_df = ungrouped_df.groupby(["key"])
-        [grouped_df.get_group(x) for x in grouped_df.groups]
-
-        upper_error_limitC_meas = pd.Series()
-        lower_error_limitC_meas = pd.Series()
-        conditionC_meas = pd.Series()
-        upper_error_limitC_rdbk = pd.Series()
-        lower_error_limitC_rdbk = pd.Series()
-        conditionC_rdbk = pd.Series()
-
-        for x in range(len(grouped_df)):
-            Vset = grouped_df.get_group(x)[["Voltage Set (PS)"]]
-            Iset = grouped_df.get_group(x)[["Current Set (EL)"]]
-            Vpercent_error_meas = grouped_df.get_group(x)[["Volt Meas_Err(%)"]]
-            Vpercent_error_rdbk = grouped_df.get_group(x)[["Volt Rdbk_Err(%)"]]
-
-            VsetS = Vset.squeeze()
-            Vpercent_errorS_meas = Vpercent_error_meas.squeeze()
-            Vpercent_errorS_rdbk = Vpercent_error_rdbk.squeeze()
-
-            boolList_meas = []
-            boolList_rdbk = []
-
-            upper_error_limit_meas = (meas1 * VsetS + meas2) * 100
-            lower_error_limit_meas = -upper_error_limit_meas
-            self.upper_error_limit_meas = upper_error_limit_meas
-            self.lower_error_limit_meas = lower_error_limit_meas
-
-            upper_error_limit_rdbk = (rdbk1 * VsetS + rdbk2) * 100
-            lower_error_limit_rdbk = -upper_error_limit_rdbk
-            self.upper_error_limit_rdbk = upper_error_limit_rdbk
-            self.lower_error_limit_rdbk = lower_error_limit_rdbk
-
-            condition1_meas = upper_error_limit_meas < Vpercent_errorS_meas
-            condition2_meas = lower_error_limit_meas > Vpercent_errorS_meas
-
-            condition1_rdbk = upper_error_limit_rdbk < Vpercent_errorS_rdbk
-            condition2_rdbk = lower_error_limit_rdbk > Vpercent_errorS_rdbk
-
-            for i in range(condition1_meas.count()):
-                if condition1_meas.iloc[i] | condition2_meas.iloc[i]:
-                    self.condition_meas = "FAIL"
-                    boolList_meas.append(self.condition_meas)
-                else:
-                    self.condition_meas = "PASS"
-                    boolList_meas.append(self.condition_meas)
-
-            for i in range(condition1_rdbk.count()):
-                if condition1_rdbk.iloc[i] | condition2_rdbk.iloc[i]:
-                    self.condition_rdbk = "FAIL"
-                    boolList_rdbk.append(self.condition_rdbk)
-                else:
-                    self.condition_rdbk = "PASS"
-                    boolList_rdbk.append(self.condition_rdbk)
-
-            self.condition_series_meas = pd.Series(boolList_meas)
-            self.condition_series_rdbk = pd.Series(boolList_rdbk)
-
-            self.upper_error_limitF_meas = upper_error_limit_meas.to_frame(
-                name="Upper Error Boundary ( Voltage )"
-            )
-            self.lower_error_limitF_meas = lower_error_limit_meas.to_frame(
-                name="Lower Error Boundary ( Voltage )"
-            )
-            self.upper_error_limitF_rdbk = upper_error_limit_rdbk.to_frame(
-                name="Upper Error Boundary ( Voltage )"
-            )
-            self.lower_error_limitF_rdbk = lower_error_limit_rdbk.to_frame(
-                name="Lower Error Boundary ( Voltage )"
-            )
+        ungrouped_df = self.data
+        plt.figure()
 
-            self.conditionF_meas = self.condition_series_meas.to_frame(name="Condition ?")
-            self.conditionF_rdbk = self.condition_series_rdbk.to_frame(name="Condition ?")
-
-            self.z_meas = self.condition_series_meas.to_numpy()
-            self.colour_condition_meas = np.where(self.z_meas == "PASS", "black", "red")
-            self.size_condition_meas = np.where(self.z_meas == "PASS", 6, 12)
-            self.alpha_condition_meas = np.where(self.z_meas == "PASS", 0, 1)
+        upper_error_limit_meas, condition_meas = self.evaluateLimits(
+            ungrouped_df[x], ungrouped_df[meas], meas1, meas2
+        )
+        upper_error_limit_rdbk, condition_rdbk = self.evaluateLimits(
+            ungrouped_df[x], ungrouped_df[rdbk], rdbk1, rdbk2
+        )
 
-            plt.scatter(
-                VsetS,
-                Vpercent_errorS_meas,
-                color=self.colour_condition_meas,
-                s=self.size_condition_meas,
-                alpha=self.alpha_condition_meas,
-            )
+        self.upper_error_limit_meas = pd.Series(upper_error_limit_meas, index=ungrouped_df.index)
+        self.lower_error_limit_meas = -self.upper_error_limit_meas
+        self.upper_error_limit_rdbk = pd.Series(upper_error_limit_rdbk, index=ungrouped_df.index)
+        self.lower_error_limit_rdbk = -self.upper_error_limit_rdbk
+
+        self.error = ungrouped_df.drop(columns=["key"]).assign(
+            **{
+                bound + "Meas": upper_error_limit_meas,
+                "Measure": condition_meas,
+                bound + "Rdbk": upper_error_limit_rdbk,
+                "Readback": condition_rdbk,
+            }
+        )
 
-            plt.plot(
-                VsetS,
-                Vpercent_errorS_meas,
-                label="Current = " + str(Iset.iloc[0]["Current Set (EL)"]),
+        x_values = ungrouped_df[x].to_numpy()
+        error_meas = ungrouped_df[meas].to_numpy()
+        legend_values = ungrouped_df[legend].to_numpy()
+
+        groups = ungrouped_df.groupby("key", sort=True).indices
+        if not groups:
+            # No point was measured, there is nothing to plot
+            plt.close()
+            return self.error
+
+        for key in sorted(groups):
+            rows = groups[key]
+            self.plotCondition(
+                x_values[rows],
+                error_meas[rows],
+                condition_meas[rows],
+                label + " = " + str(legend_values[rows[0]]),
             )
 
-            plt.title("Voltage")
-            plt.xlabel("Voltage (V)")
-            plt.ylabel("Percentage Error (%)")
-
-            upper_error_limitC_meas = pd.concat([upper_error_limitC_meas, self.upper_error_limit_meas])
-            lower_error_limitC_meas = pd.concat([lower_error_limitC_meas, self.lower_error_limit_meas])
-            conditionC_meas = pd.concat([conditionC_meas, self.condition_series_meas])
-            upper_error_limitC_rdbk = pd.concat([upper_error_limitC_rdbk, self.upper_error_limit_rdbk])
-            lower_error_limitC_rdbk = pd.concat([lower_error_limitC_rdbk, self.lower_error_limit_rdbk])
-            conditionC_rdbk = pd.concat([conditionC_rdbk, self.condition_series_rdbk])
+        plt.title(UNIT)
+        plt.xlabel("Voltage (V)" if UNIT == "Voltage" else "Current (A)")
+        plt.ylabel("Percentage Error (%)")
 
         plt.plot(
-            Vset,
-            self.upper_error_limit_meas,
+            x_values[rows],
+            upper_error_limit_meas[rows],
             label="Upper Bound",
             color="red",
             linewidth=1,
         )
         plt.plot(
-            Vset,
-            self.lower_error_limit_meas,
+            x_values[rows],
+            -upper_error_limit_meas[rows],
             label="Lower Bound",
             color="red",
             linewidth=1,
         )
 
-        conditionF_meas = conditionC_meas.to_frame(name="Measure")
-        conditionFF_meas = conditionF_meas.reset_index(drop=True)
-        conditionF_rdbk = conditionC_rdbk.to_frame(name="Readback")
-        conditionFF_rdbk = conditionF_rdbk.reset_index(drop=True)
-
-        upper_error_limitF_meas = pd.DataFrame(
-            upper_error_limitC_meas, columns=["+-V_EboundMeas"]
-        )
-        upper_error_limitF_rdbk = pd.DataFrame(
-            upper_error_limitC_rdbk, columns=["+-V_EboundRdbk"]
-        )
-
-        ungrouped_df.drop(columns=["key"], inplace=True)
-        self.CSV2 = pd.concat(
-            [
-                ungrouped_df,
-                upper_error_limitF_meas,
-                conditionFF_meas,
-                upper_error_limitF_rdbk,
-                conditionFF_rdbk,
-            ],
-            axis=1,
-        )
-
-        self.CSV2.to_csv("csv/error.csv", index=False)
-
         plt.legend(loc="lower left")
         plt.savefig("images/Chart.png")
+        plt.close()
 
-    def scatterCompareCurrent(self, meas1, meas2, rdbk1, rdbk2):
-        """Function is used to determine and plot the error boundaries of current accuracy
-
-            The function begins by computing the error boundaries based on specifications.
-            The error boundaries are then compared using data extracted from parent class.
-            The boolList will collect information whether the accuracy at certain point has
-            been reached. The boolList will append a "PASS" if it does, else "FAIL".
-            A scatter plot is then plotted on the same plane with the error boundary lines.
-            For scatter points that do not meet the condition will appear visibly red and larger.
+        return self.error
 
+    def saveError(self, path="csv/error.csv"):
+        self.error.to_csv(path, index=False)
 
+    def scatterCompareVoltage(self, meas1, meas2, rdbk1, rdbk2):
+        """Function is used to determine and plot the error boundaries of voltage accuracy
 
         Args:
-            upper_error_limit: float value of the upper error boundary determined from specification
-            lower_error_limit: float value of the lower error boundary determined from specification
-            condition1: Boolean which indicates if the absolute error is higher than upper error limit.
-            condition2: Boolean which indicates if the absolute error is lower than lower error limit.
-            boolList: List containing all the conditions of each point whether they passed or failed.
-
+            meas1, meas2: float values of the gain and offset of the programming specification.
+            rdbk1, rdbk2: float values of the gain and offset of the readback specification.
 
         """
-        ungrouped_df = pd.read_csv("csv/data.csv", index_col=False)
-        grouped_df = ungrouped_df.groupby(["key"])
-        [grouped_df.get_group(x) for x in grouped_df.groups]
-
-        upper_error_limitC_meas = pd.Series()
-        lower_error_limitC_meas = pd.Series()
-        conditionC_meas = pd.Series()
-        upper_error_limitC_rdbk = pd.Series()
-        lower_error_limitC_rdbk = pd.Series()
-        conditionC_rdbk = pd.Series()
-
-        for x in range(len(grouped_df)):
-            Vset = grouped_df.get_group(x)[["Voltage Set (EL)"]]
-            Iset = grouped_df.get_group(x)[["Current Set (PS)"]]
-            Ipercent_error_meas = grouped_df.get_group(x)[["Curr Meas_Err(%)"]]
-            Ipercent_error_rdbk = grouped_df.get_group(x)[["Curr Meas_Err(%)"]]
-
-            IsetS = Iset.squeeze()
-            Ipercent_errorS_meas = Ipercent_error_meas.squeeze()
-            Ipercent_errorS_rdbk = Ipercent_error_rdbk.squeeze()
-
-            boolList_meas = []
-            boolList_rdbk = []
-
-            upper_error_limit_meas = (meas1 * IsetS + meas2) * 100
-            lower_error_limit_meas = -upper_error_limit_meas
-            self.upper_error_limit_meas = upper_error_limit_meas
-            self.lower_error_limit_meas = lower_error_limit_meas
-
-            upper_error_limit_rdbk = (rdbk1 * IsetS + rdbk2) * 100
-            lower_error_limit_rdbk = -upper_error_limit_rdbk
-            self.upper_error_limit_rdbk = upper_error_limit_rdbk
-            self.lower_error_limit_rdbk = lower_error_limit_rdbk
-
-            condition1_meas = upper_error_limit_meas < Ipercent_errorS_meas
-            condition2_meas = lower_error_limit_meas > Ipercent_errorS_meas
-
-            condition1_rdbk = upper_error_limit_rdbk < Ipercent_errorS_rdbk
-            condition2_rdbk = lower_error_limit_rdbk > Ipercent_errorS_rdbk
-
-            for i in range(condition1_meas.count()):
-                if condition1_meas.iloc[i] | condition2_meas.iloc[i]:
-                    self.condition_meas = "FAIL"
-                    boolList_meas.append(self.condition_meas)
-                else:
-                    self.condition_meas = "PASS"
-                    boolList_meas.append(self.condition_meas)
-
-            for i in range(condition1_rdbk.count()):
-                if condition1_rdbk.iloc[i] | condition2_rdbk.iloc[i]:
-                    self.condition_rdbk = "FAIL"
-                    boolList_rdbk.append(self.condition_rdbk)
-                else:
-                    self.condition_rdbk = "PASS"
-                    boolList_rdbk.append(self.condition_rdbk)
-
-            self.condition_series_meas = pd.Series(boolList_meas)
-            self.condition_series_rdbk = pd.Series(boolList_rdbk)
-
-            self.upper_error_limitF_meas = upper_error_limit_meas.to_frame(
-                name="Upper Error Boundary ( Voltage )"
-            )
-            self.lower_error_limitF_meas = lower_error_limit_meas.to_frame(
-                name="Lower Error Boundary ( Voltage )"
-            )
-            self.upper_error_limitF_rdbk = upper_error_limit_rdbk.to_frame(
-                name="Upper Error Boundary ( Voltage )"
-            )
-            self.lower_error_limitF_rdbk = lower_error_limit_rdbk.to_frame(
-                name="Lower Error Boundary ( Voltage )"
-            )
-
-            self.conditionF_meas = self.condition_series_meas.to_frame(name="Condition ?")
-            self.conditionF_rdbk = self.condition_series_rdbk.to_frame(name="Condition ?")
-
-            self.z_meas = self.condition_series_meas.to_numpy()
-            self.colour_condition_meas = np.where(self.z_meas == "PASS", "black", "red")
-            self.size_condition_meas = np.where(self.z_meas == "PASS", 6, 12)
-            self.alpha_condition_meas = np.where(self.z_meas == "PASS", 0, 1)
-
-            plt.scatter(
-                IsetS,
-                Ipercent_errorS_meas,
-                color=self.colour_condition_meas,
-                s=self.size_condition_meas,
-                alpha=self.alpha_condition_meas,
-            )
-
-            plt.plot(
-                IsetS,
-                Ipercent_errorS_meas,
-                label="Voltage = " + str(Vset.iloc[0]["Voltage Set (EL)"]),
-            )
-
-            plt.title("Current")
-            plt.xlabel("Current (A)")
-            plt.ylabel("Percentage Error (%)")
-
-            upper_error_limitC_meas = pd.concat([upper_error_limitC_meas, self.upper_error_limit_meas])
-            lower_error_limitC_meas = pd.concat([lower_error_limitC_meas, self.lower_error_limit_meas])
-            conditionC_meas = pd.concat([conditionC_meas, self.condition_series_meas])
-            upper_error_limitC_rdbk = pd.concat([upper_error_limitC_rdbk, self.upper_error_limit_rdbk])
-            lower_error_limitC_rdbk = pd.concat([lower_error_limitC_rdbk, self.lower_error_limit_rdbk])
-            conditionC_rdbk = pd.concat([conditionC_rdbk, self.condition_series_rdbk])
-
-        plt.plot(
-            Iset,
-            self.upper_error_limit_meas,
-            label="Upper Bound",
-            color="red",
-            linewidth=1,
-        )
-        plt.plot(
-            Iset,
-            self.lower_error_limit_meas,
-            label="Lower Bound",
-            color="red",
-            linewidth=1,
+        return self.scatterCompare(
+            "Voltage",
+            "Voltage Set (PS)",
+            "Current Set (EL)",
+            "Current",
+            "Volt Meas_Err(%)",
+            "Volt Rdbk_Err(%)",
+            "+-V_Ebound",
+            meas1,
+            meas2,
+            rdbk1,
+            rdbk2,
         )
 
-        conditionF_meas = conditionC_meas.to_frame(name="Measure")
-        conditionFF_meas = conditionF_meas.reset_index(drop=True)
-        conditionF_rdbk = conditionC_rdbk.to_frame(name="Readback")
-        conditionFF_rdbk = conditionF_rdbk.reset_index(drop=True)
+    def scatterCompareCurrent(self, meas1, meas2, rdbk1, rdbk2):
+        """Function is used to determine and plot the error boundaries of current accuracy
 
-        upper_error_limitF_meas = pd.DataFrame(
-            upper_error_limitC_meas, columns=["+-I_EboundMeas"]
-        )
-        upper_error_limitF_rdbk = pd.DataFrame(
-            upper_error_limitC_rdbk, columns=["+-I_EboundRdbk"]
-        )
+        Args:
+            meas1, meas2: float values of the gain and offset of the programming specification.
+            rdbk1, rdbk2: float values of the gain and offset of the readback specification.
 
-        ungrouped_df.drop(columns=["key"], inplace=True)
-        self.CSV2 = pd.concat(
-            [
-                ungrouped_df,
-                upper_error_limitF_meas,
-                conditionFF_meas,
-                upper_error_limitF_rdbk,
-                conditionFF_rdbk,
-            ],
-            axis=1,
+        """
+        return self.scatterCompare(
+            "Current",
+            "Current Set (PS)",
+            "Voltage Set (EL)",
+            "Voltage",
+            "Curr Meas_Err(%)",
+            "Curr Rdbk_Err(%)",
+            "+-I_Ebound",
+            meas1,
+            meas2,
+            rdbk1,
+            rdbk2,
         )
 
-        self.CSV2.to_csv("csv/error.csv", index=False)
-
-        plt.legend(loc="lower left")
-        plt.savefig("images/Chart.png")
-
 
 class instrumentData(object):
     """This class stores and facilitates the collection of Instrument Data to be placed in Excel Report
@@ -653,6 +418,7 @@ class instrumentData(object):
         *args: arguements should contain strings of VISA Addresses of instruments used.
         instrumentIDN: List containing the Identification Name of the Instruments
         instrumentVersion: List containing the SCPI Version of the Instruments
+        data: DataFrame containing the Identification Name and SCPI Version of every Instrument
 
     """
 
@@ -667,9 +433,27 @@ class instrumentData(object):
         df1 = pd.DataFrame(instrumentIDN, columns=["Instruments Used: "])
         df2 = pd.DataFrame(instrumentVersion, columns=["SCPI Version"])
 
-        instrument = pd.concat([df1, df2], axis=1)
+        self.data = pd.concat([df1, df2], axis=1)
+
+    def save(self, path="csv/instrumentData.csv"):
+        self.data.to_csv(path, index=False)
+
+
+class configData(object):
+    """This class stores the parameters of the DUT Test to be placed in Excel Report
+
+    Attributes:
+        data: DataFrame containing one row for every parameter of the dictionary.
+
+    """
+
+    def __init__(self, dict):
+        self.data = pd.DataFrame(
+            [[key, value] for key, value in dict.items()], columns=["Parameter", "Value"]
+        )
 
-        instrument.to_csv("csv/instrumentData.csv", index=False)
+    def save(self, path="csv/config.csv"):
+        self.data.to_csv(path, index=False)
 
 
 class dictGenerator(object):
@@ -0,0 +1,222 @@
+""" Module containing the dry run estimating the duration of a DUT Test before it is started.
+
+    The duration of a test depends on its step sizes, the NPLC of Aperture, the SampleCount, the
+    synchronization and the settling of every point, which is hard to foresee from the dialog. The
+    DryRun below runs the test method itself against the simulated Instruments of library/Simulator.py,
+    in the virtual time of a VirtualClock: every transaction costs the latency of its command, every
+    reading its integration time and every wait of the host (CompletionWait, settling, the sleeps of the
+    tests) the time it would wait, without waiting for any of it. A dry run of a few thousand points
+    takes seconds and reports the estimated duration, the number of points and the commands sent.
+
+    The host side of the tests reads the time through the monotonic and sleep functions imported by the
+    modules of HOST, which are replaced by those of the VirtualClock for the duration of the dry run.
+    The SessionPool is swapped for a simulated one, so the Sessions of the real Instruments are kept.
+    The swap applies to the whole process, so a dry run must not be made while a test is running on
+    the real Instruments, which the GUI checks before estimating (TestWorker.anyRunning).
+
+    The latency model is calibrated from the Chrome traces (trace.json) written by the Tracer of
+    library/Tracing.py when a campaign is run with --trace. The cost of every command is the 10th
+    percentile of its recorded durations, which leaves out the time a query waited for the Instrument
+    since the simulation adds the time of the measurement itself:
+
+        python main_CLI.py --calibrate campaign_output/night/*/trace.json
+        python main_CLI.py campaign.json --dry-run
+
+    The calibration is saved in the format of the configuration file of the simulator (LATENCY), which
+    is used by every dry run once it exists.
+
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import types
+
+import numpy as np
+
+# Modules of the host side of the tests reading the time, in which the clock is replaced
+HOST = (
+    "src.sync",
+    "src.acquisition",
+    "src.settling",
+    "src.planner",
+    "src.progress",
+    "src.journal",
+    "src.DUT_Test",
+)
+
+
+class DryRun(object):
+    """Estimate the duration of DUT Tests by running them against simulated Instruments in virtual time
+
+    Attributes:
+        config: String containing the path of the configuration file of the simulator, e.g. LATENCY.
+        latency: Optional dictionary of the arguments of Simulator.Latency, overriding the configuration.
+
+    """
+
+    LATENCY = "results/latency.json"
+    # Percentile of the durations of a command taken as its cost
+    PERCENTILE = 10
+
+    def __init__(self, config=None, latency=None):
+        if config is None:
+            config = self.LATENCY if os.path.exists(self.LATENCY) else ""
+        self.config = config
+        self.latency = latency
+
+    @classmethod
+    def calibrate(cls, paths, output=LATENCY):
+        """Derive the latency model of the simulator from recorded Chrome traces
+
+        Args:
+            paths: List of the paths of the trace.json files written by Tracer.writeChromeTrace.
+            output: Optional string containing the path of the configuration file written, None to only
+                return the model.
+
+        Returns:
+            Returns the dictionary of the arguments of Simulator.Latency, the cost (s) of every header
+            together with the default cost of a write and of a query.
+        """
+        from library.Simulator import Instrument
+        from library.Tracing import Tracer
+
+        durations = {}
+        for path in paths:
+            with open(path) as file:
+                events = json.load(file)["traceEvents"]
+
+            for event in events:
+                kind = event.get("cat")
+                if event.get("ph") != "X" or kind not in ("write", "query", "query_binary_values", "read_stb"):
+                    continue
+
+                # Headers are given in the short form the simulated Instruments look them up with
+                command = "*STB?" if kind == "read_stb" else event["args"]["command"]
+                header = Instrument.parse(command)[0]
+                durations.setdefault((kind == "write", header), []).append(event["dur"] / 1e6)
+
+        if not durations:
+            raise ValueError("The traces do not contain any SCPI transaction")
+
+        costs = {
+            key: Tracer.percentile(sorted(values), cls.PERCENTILE) for key, values in durations.items()
+        }
+        writes = [cost for (write, _), cost in costs.items() if write]
+        queries = [cost for (write, _), cost in costs.items() if not write]
+        latency = {
+            "write": float(np.median(writes)) if writes else 0.0003,
+            "query": float(np.median(queries)) if queries else 0.0008,
+            "commands": {header: cost for (_, header), cost in sorted(costs.items())},
+        }
+
+        if output:
+            folder = os.path.dirname(output)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(output, "w") as file:
+                json.dump({"latency": latency}, file, indent=4)
+
+        return latency
+
+    @contextlib.contextmanager
+    def simulation(self, dict):
+        """Swap the SessionPool, clock and tracer of the process for those of a simulated bench
+
+        Yields:
+            Yields the VirtualClock and the simulated ResourceManager.
+        """
+        from library.AsyncSession import AsyncSession
+        from library.SessionPool import Session, SessionPool
+        from library.Simulator import Latency, ResourceManager, VirtualClock
+        from src.parallel import InstrumentExecutor
+
+        clock = VirtualClock()
+        rm = ResourceManager(self.config, clock=clock)
+        if self.latency is not None:
+            rm.latency = Latency(**self.latency)
+        rm.wire(dict)
+
+        modules = [importlib.import_module(name) for name in HOST]
+        saved = [
+            (module, name, getattr(module, name))
+            for module in modules
+            for name in ("monotonic", "sleep")
+            if hasattr(module, name)
+        ]
+
+        with SessionPool.lock:
+            pool = SessionPool.rm, SessionPool.sessions
+            SessionPool.rm, SessionPool.sessions = rm, {}
+            tracer, Session.tracer = Session.tracer, None
+            InstrumentExecutor.clock = AsyncSession.clock = clock
+            for module, name, _ in saved:
+                setattr(module, name, clock.now if name == "monotonic" else clock.sleep)
+        try:
+            yield clock, rm
+        finally:
+            with SessionPool.lock:
+                for module, name, function in saved:
+                    setattr(module, name, function)
+                InstrumentExecutor.clock = AsyncSession.clock = None
+                Session.tracer = tracer
+                SessionPool.rm, SessionPool.sessions = pool
+
+    def estimate(self, function, dict):
+        """Run a DUT Test in virtual time
+
+        Args:
+            function: The test method of DUT_Test.py, e.g. VoltageMeasurement.executeVoltageMeasurementA.
+            dict: Dictionary containing the parameters of the DUT Test.
+
+        Returns:
+            Returns a dictionary containing the estimated duration (s), the number of points, the number
+            of bus transactions and the number of commands sent for every header.
+        """
+        from library.Tracing import Tracer
+
+        # A dry run leaves no journal behind and never resumes one
+        dict = {key: value for key, value in dict.items() if key not in ("Journal", "Resume")}
+        with self.simulation(dict) as (clock, rm):
+            tracer = Tracer.start()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    # The test methods use self as a scratch namespace, the dialog in the GUI
+                    result = function(types.SimpleNamespace(infoList=[], dataList=[]), dict)
+            finally:
+                Tracer.stop()
+            duration = clock.now()
+            transactions = sum(instrument.transactions for instrument in rm.resources.values())
+
+        commands = {}
+        for (kind, header), histogram in tracer.histograms().items():
+            commands[header] = commands.get(header, 0) + histogram["count"]
+
+        points = len(result) if hasattr(result, "__len__") and not isinstance(result, tuple) else None
+        return {
+            "duration": duration,
+            "points": points,
+            "transactions": transactions,
+            "commands": commands,
+        }
+
+    @staticmethod
+    def format(estimate):
+        """Text summary of an estimate, e.g. "1 h 02 min 05 s for 400 points (12.3 s per point)" """
+        seconds = int(round(estimate["duration"]))
+        hours, minutes = divmod(seconds // 60, 60)
+        if hours:
+            text = f"{hours} h {minutes:02d} min {seconds % 60:02d} s"
+        elif minutes:
+            text = f"{minutes} min {seconds % 60:02d} s"
+        else:
+            text = f"{estimate['duration']:.1f} s"
+
+        if estimate["points"]:
+            text += (
+                f" for {estimate['points']} points"
+                f" ({estimate['duration'] / estimate['points']:.2f} s per point)"
+            )
+        return text + f", {estimate['transactions']} bus transactions"
@@ -0,0 +1,221 @@
+""" Module containing the crash-safe journal of the points of a DUT Test run.
+
+    The accuracy tests used to keep every point in memory until the sweep completed, so a VISA error
+    at point 900 of a 1000 points sweep lost the 899 points already measured and the run had to start
+    again from zero. The RunJournal below appends every completed point to a JSON lines file as soon
+    as it is measured:
+
+        {"test": "...", "total": 1000, "order": "raster", "config": {...}}      header
+        {"k": 0, "row": [5.0, 1.0, 0, "CV", 31.0, 4.998, ...]}                 one line per point
+        {"complete": true}                                                     once the sweep is done
+
+    Every line is flushed to the operating system when it is written, which survives a crash of the
+    process, and the file is synchronized to the disk (fsync) in batches, which bounds the points lost
+    on a power failure without paying a disk synchronization for every point.
+
+    In resume mode the journal of a run with the same parameters is reloaded into the ResultBuffer, a
+    torn last line is discarded, the shadow registers of the SessionPool are cleared so that the
+    setpoints of the next point are written again, and the sweep continues from the next unfinished
+    point. The Instruments are configured again by the initialization of the test before that, which
+    is only elided by a Session still open from the interrupted run, so the GUI clears the shadow
+    registers before resuming a run (a campaign reopens every Session after an error).
+
+    The journal is configured by the parameters of a DUT Test:
+        Journal: Optional string containing the path of the journal file, the journal is disabled if
+            it is not given.
+        Resume: Optional boolean continuing the run recorded in the journal instead of starting again.
+        JournalBatch: Optional integer containing the number of points between synchronizations, 10 by
+            default.
+        JournalInterval: Optional float containing the longest time (s) between synchronizations, 5 s
+            by default.
+
+"""
+
+import json
+import os
+from time import monotonic
+
+from library.SessionPool import SessionPool
+
+
+class RunJournal(object):
+    """Append-only journal of the points of one run
+
+    Attributes:
+        path: String containing the path of the journal file.
+        header: Dictionary identifying the run, compared against the journal when resuming.
+        batch: Integer containing the number of points between synchronizations.
+        interval: Float containing the longest time (s) between synchronizations.
+        pending: Integer counting the points written since the last synchronization.
+        resumed: Integer containing the number of points reloaded from the journal.
+
+    """
+
+    # Keys of the parameters which do not change the points of a run
+    IGNORED = ("Journal", "Resume", "JournalBatch", "JournalInterval", "Waveform")
+
+    def __init__(self, path, header, batch=10, interval=5.0):
+        self.path = path
+        self.header = header
+        self.batch = max(1, int(batch))
+        self.interval = float(interval)
+        self.pending = 0
+        self.synced = monotonic()
+        self.resumed = 0
+        self.file = None
+
+    @classmethod
+    def fromDict(cls, dict, test, total, order="raster"):
+        """Create the journal of a run if Journal is given in a DUT Test
+
+        Args:
+            dict: Dictionary containing the parameters of the DUT Test.
+            test: String containing the name of the test method.
+            total: Integer containing the number of points of the run.
+            order: String containing the order in which the points are measured.
+
+        Returns:
+            Returns a RunJournal, or None if the journal is not enabled.
+        """
+        if not dict.get("Journal"):
+            return None
+
+        header = {"test": test, "total": int(total), "order": order, "config": cls.config(dict)}
+        return cls(
+            dict["Journal"],
+            header,
+            batch=dict.get("JournalBatch", 10),
+            interval=dict.get("JournalInterval", 5.0),
+        )
+
+    @classmethod
+    def config(cls, dict):
+        """Parameters of a DUT Test as recorded in the header, without the keys of IGNORED"""
+        config = {key: value for key, value in dict.items() if key not in cls.IGNORED}
+        # Round trip so that the parameters compare equal to the ones read back from the file
+        return json.loads(json.dumps(config, default=str))
+
+    @classmethod
+    def unfinished(cls, dict):
+        """Number of points of an unfinished run with the same parameters in the Journal of a DUT Test
+
+        Returns:
+            Returns the number of points which would be reloaded in resume mode, 0 if there is no
+            journal, if its run completed or if it was recorded with different parameters.
+        """
+        path = dict.get("Journal")
+        if not path or not os.path.exists(path):
+            return 0
+
+        header, points, complete, _ = cls.read(path)
+        if header is None or complete or header.get("config") != cls.config(dict):
+            return 0
+        return len(points)
+
+    @staticmethod
+    def read(path):
+        """Read a journal, discarding a last line torn by a crash
+
+        Returns:
+            Returns the header, the list of the (k, row) of every point, whether the run completed and
+            the length in bytes of the header and points, without the completion mark.
+        """
+        header = None
+        points = []
+        complete = False
+        valid = 0
+        with open(path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+
+                if header is None:
+                    header = entry
+                elif entry.get("complete"):
+                    complete = True
+                    continue
+                else:
+                    points.append((entry["k"], entry["row"]))
+                valid += len(line)
+
+        return header, points, complete, valid
+
+    def open(self, results, resume=False):
+        """Open the journal, reloading the points of an unfinished run in resume mode
+
+        Args:
+            results: ResultBuffer the reloaded points are appended to, in the order they were measured.
+            resume: Boolean determining if the run recorded in the journal is continued.
+
+        Returns:
+            Returns the number of points reloaded, the sweep continues from this point.
+
+        Raises:
+            ValueError: The journal was recorded by a run with different parameters.
+        """
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        if resume and os.path.exists(self.path):
+            header, points, complete, valid = self.read(self.path)
+            if header is not None:
+                if header != self.header:
+                    raise ValueError(
+                        f"Journal {self.path} was recorded by a run with different parameters, "
+                        "it cannot be resumed"
+                    )
+
+                for k, row in points:
+                    if k != len(results):
+                        break
+                    results.append(*row)
+                self.resumed = len(results)
+
+                # Drop the torn line, and the completion mark which is written again at the end
+                with open(self.path, "r+b") as file:
+                    file.truncate(valid)
+                self.file = open(self.path, "a")
+                # The setpoints are written again, whatever the Instruments went through meanwhile
+                SessionPool.invalidate()
+                if self.resumed < self.header["total"]:
+                    print(f"Resuming {self.path} at point {self.resumed + 1} of {self.header['total']}")
+                else:
+                    print(f"Reloaded the {self.resumed} points of {self.path}")
+                return self.resumed
+
+        self.file = open(self.path, "w")
+        self.write(self.header)
+        self.sync()
+        return 0
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry, default=str) + "\n")
+        self.file.flush()
+
+    def record(self, k, results):
+        """Append the point k of the ResultBuffer, synchronizing the journal once a batch is complete"""
+        self.write({"k": int(k), "row": results.row(k)})
+        self.pending += 1
+        if self.pending >= self.batch or monotonic() - self.synced >= self.interval:
+            self.sync()
+
+    def sync(self):
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.synced = monotonic()
+
+    def close(self):
+        """Mark the run as complete and close the journal"""
+        self.write({"complete": True})
+        self.sync()
+        self.release()
+
+    def release(self):
+        """Close the journal without marking the run as complete, e.g. after an error, it can be resumed"""
+        if self.file is not None and not self.file.closed:
+            self.file.close()
@@ -0,0 +1,164 @@
+""" Module containing the hardware sequenced sweep that uses the List Subsystem of the PSU and ELoad.
+
+    Instead of programming, triggering and fetching every point from the program, the whole set of
+    setpoints is uploaded to the PSU and ELoad once. The PSU steps through its list on its own and emits
+    a trigger at the beginning of every step (BOST), which advances the list of the ELoad and triggers
+    both DMMs after the settling delay. The DMMs store every reading in their memory, and the readings
+    are retrieved in one transfer when the sequence has finished.
+
+    The trigger out pin of the PSU digital port has to be wired to the external trigger inputs of the
+    ELoad and both DMMs. List mode needs the list capability of the library of the Instrument parameter,
+    which the DriverRegistry only finds in the Keysight library.
+
+"""
+
+import numpy as np
+
+from library.Registry import DriverRegistry
+from library.SessionPool import SessionPool
+from src.acquisition import BufferedAcquisition
+from src.sync import CompletionWait
+
+
+class ListSweep(object):
+    """Class running a sweep of setpoints in hardware using the List Subsystem
+
+    Attributes:
+        dict: Dictionary containing the parameters of the DUT Test.
+        source_function: String determining the list function of the PSU, "VOLT" or "CURR".
+        load_function: String determining the list function of the ELoad, "VOLT" or "CURR".
+        settle: Float containing the delay (s) between the start of a step and the DMM trigger.
+        dwell: Float containing the time (s) the PSU stays on every step.
+        list_size: Integer containing the maximum number of steps the Instruments accept in one list.
+        pin: Integer containing the pin of the PSU digital port used as trigger out.
+
+    """
+
+    # Subsystem classes of the library used by the sweep, set as attributes of the same name
+    SUBSYSTEMS = ("Current", "Digital", "Fetch", "Format", "Initiate", "List", "Sample", "Trigger", "Voltage")
+
+    def __init__(self, dict, source_function, load_function):
+        self.dict = dict
+        # Subsystem classes of the library, loaded once by the DriverRegistry
+        driver = DriverRegistry.get(dict["Instrument"])
+        driver.require("list")
+        for name in self.SUBSYSTEMS:
+            setattr(self, name, driver.subsystem(name))
+        self.source_function = source_function.upper()
+        self.load_function = load_function.upper()
+
+        integration = float(dict["Aperture"]) / float(dict.get("LineFrequency", 50))
+        self.settle = float(dict["UpTime"]) / 1000
+        self.dwell = float(dict.get("Dwell", self.settle + integration + 0.01))
+        self.list_size = int(dict.get("ListSize", 512))
+        self.pin = int(dict.get("TriggerPin", 1))
+
+    def setMode(self, VISA_ADDRESS, function, mode, ChannelNumber):
+        if function == "VOLT":
+            self.Voltage(VISA_ADDRESS).setVoltageMode(mode, ChannelNumber)
+        else:
+            self.Current(VISA_ADDRESS).setCurrentMode(mode, ChannelNumber)
+
+    def setList(self, VISA_ADDRESS, function, values, ChannelNumber):
+        points = ",".join(str(value) for value in values)
+        if function == "VOLT":
+            self.List(VISA_ADDRESS).setVoltageList(points, ChannelNumber)
+        else:
+            self.List(VISA_ADDRESS).setCurrentList(points, ChannelNumber)
+
+    def armDMM(self, key, count):
+        """Arm the DMM to take one reading for every external trigger of the sequence"""
+        acquisition = BufferedAcquisition(
+            self.Trigger,
+            self.Sample,
+            self.Initiate,
+            self.Fetch,
+            self.dict[key],
+            samples=1,
+            triggers=count,
+            source="EXT",
+            wait=CompletionWait.fromDict(self.dict, key),
+            Format=self.Format if self.Format and self.dict.get("BinaryTransfer", False) else None,
+        )
+        self.Trigger(self.dict[key]).setTriggerDelay(self.settle)
+        acquisition.wait.delay = count * self.dwell
+        acquisition.wait.timeout = 2 * count * self.dwell + 10
+        return acquisition
+
+    def disarmDMM(self, VISA_ADDRESS):
+        """Return the DMM to the single reading, bus triggered settings used by the other tests"""
+        self.Trigger(VISA_ADDRESS).setSource("BUS")
+        self.Trigger(VISA_ADDRESS).setCount(1)
+
+    def run(self, source_values, load_values):
+        """Run the sweep, splitting it into several lists if it is longer than list_size
+
+        Args:
+            source_values: List containing the setpoint of the PSU for every point.
+            load_values: List containing the setpoint of the ELoad for every point.
+
+        Returns:
+            Returns two numpy arrays, containing the readings of DMM_V and DMM_I for every point.
+        """
+        readings_V = []
+        readings_I = []
+
+        for start in range(0, len(source_values), self.list_size):
+            stop = start + self.list_size
+            V, I = self.runList(source_values[start:stop], load_values[start:stop])
+            readings_V.append(V)
+            readings_I.append(I)
+
+        self.setMode(self.dict["PSU"], self.source_function, "FIX", self.dict["PSU_Channel"])
+        self.setMode(self.dict["ELoad"], self.load_function, "FIX", self.dict["ELoad_Channel"])
+        # The outputs are left at the last step of the lists, which the shadow registers never recorded
+        SessionPool.invalidate(self.dict["PSU"])
+        SessionPool.invalidate(self.dict["ELoad"])
+        self.disarmDMM(self.dict["DMM_V"])
+        self.disarmDMM(self.dict["DMM_I"])
+
+        return np.concatenate(readings_V), np.concatenate(readings_I)
+
+    def runList(self, source_values, load_values):
+        PSU = self.dict["PSU"]
+        ELoad = self.dict["ELoad"]
+        PSU_Channel = self.dict["PSU_Channel"]
+        ELoad_Channel = self.dict["ELoad_Channel"]
+        count = len(source_values)
+
+        # PSU steps on its own and emits a trigger at the beginning of every step
+        self.Digital(PSU).setPinFunction(self.pin, "TOUT")
+        self.setMode(PSU, self.source_function, "LIST", PSU_Channel)
+        self.setList(PSU, self.source_function, source_values, PSU_Channel)
+        self.List(PSU).setDwellList(self.dwell, PSU_Channel)
+        self.List(PSU).setTriggerOutBOST("ON", PSU_Channel)
+        self.List(PSU).setStepMode("AUTO", PSU_Channel)
+        self.List(PSU).setListCount(1, PSU_Channel)
+        self.List(PSU).setTerminateLast("ON", PSU_Channel)
+        self.Trigger(PSU).setTransientSource("BUS", PSU_Channel)
+
+        # ELoad advances one step for every trigger received from the PSU
+        self.setMode(ELoad, self.load_function, "LIST", ELoad_Channel)
+        self.setList(ELoad, self.load_function, load_values, ELoad_Channel)
+        self.List(ELoad).setStepMode("ONCE", ELoad_Channel)
+        self.List(ELoad).setListCount(1, ELoad_Channel)
+        self.List(ELoad).setTerminateLast("ON", ELoad_Channel)
+        self.Trigger(ELoad).setTransientSource("EXT", ELoad_Channel)
+
+        # Both DMMs are waiting for the triggers of the PSU before the sequence is started
+        acq_V = self.armDMM("DMM_V", count)
+        acq_I = self.armDMM("DMM_I", count)
+        acq_V.start()
+        acq_I.start()
+
+        self.Initiate(ELoad).initiateTransient(ELoad_Channel)
+        self.Initiate(PSU).initiateTransient(PSU_Channel)
+        self.Trigger(PSU).triggerTransient(PSU_Channel)
+
+        # Every reading of the sequence is retrieved in a single transfer
+        V = acq_V.finish()
+        I = acq_I.finish()
+        acq_V.release()
+        acq_I.release()
+
+        return V, I
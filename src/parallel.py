@@ -0,0 +1,79 @@
+""" Module containing the concurrent execution layer used to communicate with independent Instruments at once.
+
+    Each Instrument has its own VISA Session in the SessionPool, hence commands sent to different
+    Instruments do not have to wait for each other. The InstrumentExecutor runs one task per Instrument
+    on a shared thread pool so that the time spent on a measurement point approaches the time of the
+    slowest Instrument instead of the sum of all of them.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+
+class InstrumentExecutor(object):
+    """Thread pool issuing the tasks of independent Instruments in parallel
+
+    A task is a callable that only communicates with a single Instrument. Two tasks passed to the same
+    call of run() must never use the same VISA Address, since a session cannot serve two transactions
+    at the same time.
+
+    Attributes:
+        enabled: Boolean determining if the tasks are run in parallel or one after another.
+        max_workers: Integer containing the number of threads in the pool.
+        clock: VirtualClock of a dry run (see src/estimate.py) running the tasks one after another in
+            simulated time, None when the Instruments are real.
+
+    """
+
+    enabled = True
+    max_workers = 8
+    clock = None
+    pool = None
+    lock = threading.Lock()
+
+    @classmethod
+    def executor(cls):
+        """Return the shared thread pool, creating it on first use"""
+        with cls.lock:
+            if cls.pool is None:
+                cls.pool = ThreadPoolExecutor(
+                    max_workers=cls.max_workers, thread_name_prefix="instrument"
+                )
+
+            return cls.pool
+
+    @classmethod
+    def run(cls, *tasks):
+        """Run the tasks in parallel and wait for all of them to finish
+
+        Args:
+            *tasks: Callables taking no arguments, each one communicating with a different Instrument.
+
+        Returns:
+            Returns a list containing the value returned by every task, in the order they were given.
+
+        Raises:
+            Exception: The first exception raised by any of the tasks is raised again once every task
+                has finished.
+        """
+        if cls.clock is not None:
+            return cls.clock.parallel(tasks)
+
+        if not cls.enabled or len(tasks) < 2:
+            return [task() for task in tasks]
+
+        futures = [cls.executor().submit(task) for task in tasks]
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+        return [future.result() for future in futures]
+
+    @classmethod
+    def shutdown(cls):
+        with cls.lock:
+            if cls.pool is not None:
+                cls.pool.shutdown()
+                cls.pool = None
@@ -0,0 +1,223 @@
+""" Module containing the planner of the order in which the points of a step sweep are measured.
+
+    The accuracy tests used to sweep the inner setpoint (the PSU voltage of Voltage Accuracy, the PSU
+    current of Current Accuracy) from its minimum to its maximum for every outer setpoint (the ELoad),
+    jumping back to the minimum at the start of every group. Every large downward step pays the down
+    programming time of the PSU and a full settling. The SweepPlanner below generates the sequence of
+    points instead, in one of the orders:
+
+        raster      the original order, the inner setpoint always increasing
+        serpentine  the inner setpoint alternately increasing and decreasing from one group to the next
+        minstep     greedy nearest point first, minimizing the predicted time of every step
+        range       grouped by the DMM range of the inner setpoint, serpentine within every range, so
+                    that an auto ranging DMM changes range as rarely as possible
+
+    Every point keeps the index of its outer setpoint as key, and the ResultBuffer is put back into
+    raster order once the sweep is complete, so the analysis and the report are unchanged.
+
+    The time of every step is predicted from the slew rates of the setpoints, and of every change of
+    the DMM range when it is auto ranging. The predicted time saved against the raster order and the
+    actual duration of the sweep are reported once the sweep is complete.
+
+    The planner is configured by the parameters of a DUT Test:
+        SweepOrder: Optional string containing one of the orders above, "raster" by default.
+        SlewUp: Optional float containing the up programming rate of the inner setpoint (unit/s).
+        SlewDown: Optional float containing the down programming rate of the inner setpoint (unit/s).
+        SlewOuter: Optional float containing the programming rate of the outer setpoint (unit/s).
+        RangeChange: Optional float containing the time (s) taken by a change of the DMM range.
+
+"""
+
+from time import monotonic
+
+import numpy as np
+
+
+class SweepPlanner(object):
+    """Order the points of a two dimensional step sweep
+
+    Attributes:
+        outer: List containing the outer setpoints, the key of a point is the index of its outer setpoint.
+        inner: List containing the inner setpoints swept for every outer setpoint.
+        strategy: String containing the order of the points, one of STRATEGIES.
+        slew_up: Float containing the up programming rate of the inner setpoint (unit/s).
+        slew_down: Float containing the down programming rate of the inner setpoint (unit/s).
+        slew_outer: Float containing the programming rate of the outer setpoint (unit/s).
+        range_change: Float containing the time (s) taken by a change of the DMM range.
+        scale: Float converting the inner setpoint to the quantity measured by the DMM.
+        autorange: Boolean determining if the DMM changes range with the inner setpoint.
+        order: List containing the (outer index, inner index) of every point in the order measured.
+
+    """
+
+    STRATEGIES = ("raster", "serpentine", "minstep", "range")
+    # DMM ranges are decades with 20 % overrange (100 mV, 1 V, 10 V... or 100 mA, 1 A, 10 A...)
+    OVERRANGE = 1.2
+
+    def __init__(
+        self,
+        outer,
+        inner,
+        strategy="raster",
+        slew_up=1000.0,
+        slew_down=100.0,
+        slew_outer=1000.0,
+        range_change=0.01,
+        scale=1.0,
+        autorange=True,
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown sweep order {strategy}, expected one of {self.STRATEGIES}")
+
+        self.outer = list(outer)
+        self.inner = list(inner)
+        self.strategy = strategy
+        self.slew_up = float(slew_up)
+        self.slew_down = float(slew_down)
+        self.slew_outer = float(slew_outer)
+        self.range_change = float(range_change)
+        self.scale = float(scale)
+        self.autorange = autorange
+        self.order = getattr(self, strategy)()
+        self.started = None
+        self.elapsed = None
+
+    @classmethod
+    def fromDict(cls, dict, outer, inner, scale=1.0):
+        """Create the planner of a sweep using the parameters of a DUT Test
+
+        Args:
+            dict: Dictionary containing the parameters of the DUT Test.
+            outer: List containing the outer setpoints.
+            inner: List containing the inner setpoints.
+            scale: Float converting the inner setpoint to the quantity measured by the DMM.
+        """
+        return cls(
+            outer,
+            inner,
+            strategy=str(dict.get("SweepOrder", "raster")).lower(),
+            slew_up=dict.get("SlewUp", 1000.0),
+            slew_down=dict.get("SlewDown", 100.0),
+            slew_outer=dict.get("SlewOuter", 1000.0),
+            range_change=dict.get("RangeChange", 0.01),
+            scale=scale,
+            autorange=dict.get("Range", "Auto") == "Auto",
+        )
+
+    @staticmethod
+    def values(start, step, iterations):
+        """Setpoints of one axis, accumulated the same way as the former while loops
+
+        Args:
+            start: Float containing the first setpoint.
+            step: Float containing the step size.
+            iterations: Float containing the number of iterations, the last one may be partial.
+        """
+        values = []
+        value = float(start)
+        for _ in range(int(np.ceil(iterations))):
+            values.append(value)
+            value += float(step)
+        return values
+
+    def raster(self):
+        return [(i, j) for i in range(len(self.outer)) for j in range(len(self.inner))]
+
+    def serpentine(self):
+        inner = list(range(len(self.inner)))
+        return [(i, j) for i in range(len(self.outer)) for j in (inner if i % 2 == 0 else inner[::-1])]
+
+    def range(self):
+        ranges = self.ranges(np.array(self.inner))
+        order = []
+        reverse = False
+        for value in np.unique(ranges):
+            inner = [j for j in range(len(self.inner)) if ranges[j] == value]
+            for i in range(len(self.outer)):
+                order.extend((i, j) for j in (inner[::-1] if reverse else inner))
+                reverse = not reverse
+        return order
+
+    def minstep(self):
+        """Greedy order, the next point is always the remaining point reached in the shortest time"""
+        points = np.array(self.raster())
+        if len(points) == 0:
+            return []
+
+        outer = np.array(self.outer, dtype=float)[points[:, 0]]
+        inner = np.array(self.inner, dtype=float)[points[:, 1]]
+        ranges = self.ranges(inner)
+        remaining = np.ones(len(points), dtype=bool)
+        current = 0
+        order = []
+        for _ in range(len(points)):
+            remaining[current] = False
+            order.append(tuple(int(index) for index in points[current]))
+            if not remaining.any():
+                break
+            cost = self.stepTime(
+                outer[current], inner[current], ranges[current], outer, inner, ranges
+            )
+            cost[~remaining] = np.inf
+            current = int(np.argmin(cost))
+        return order
+
+    def ranges(self, inner):
+        """Decade of the DMM range of every inner setpoint"""
+        measured = np.maximum(np.abs(np.asarray(inner, dtype=float) * self.scale), 1e-12)
+        return np.ceil(np.log10(measured / self.OVERRANGE)).astype(int)
+
+    def stepTime(self, outer0, inner0, range0, outer, inner, ranges):
+        """Predicted time (s) of the steps from one point to other points
+
+        The inner and outer setpoints are programmed at the same time, so the step takes as long as
+        the slower of them, plus the time of a change of range of an auto ranging DMM.
+        """
+        delta = np.asarray(inner, dtype=float) - inner0
+        slew = np.where(delta >= 0, delta / self.slew_up, -delta / self.slew_down)
+        time = np.maximum(slew, np.abs(np.asarray(outer, dtype=float) - outer0) / self.slew_outer)
+        if self.autorange:
+            time = time + np.where(np.asarray(ranges) != range0, self.range_change, 0.0)
+        return time
+
+    def predict(self, order=None):
+        """Predicted time (s) of all the steps of an order, the planned order by default"""
+        order = self.order if order is None else order
+        if len(order) < 2:
+            return 0.0
+
+        index = np.array(order)
+        outer = np.array(self.outer, dtype=float)[index[:, 0]]
+        inner = np.array(self.inner, dtype=float)[index[:, 1]]
+        ranges = self.ranges(inner)
+        return float(
+            np.sum(self.stepTime(outer[:-1], inner[:-1], ranges[:-1], outer[1:], inner[1:], ranges[1:]))
+        )
+
+    def canonical(self):
+        """Permutation putting the points measured in the planned order back into raster order"""
+        return np.argsort([i * len(self.inner) + j for i, j in self.order], kind="stable")
+
+    def start(self):
+        self.started = monotonic()
+
+    def finish(self):
+        self.elapsed = monotonic() - self.started
+
+    def summary(self, settle=None):
+        """Predicted time saved against the raster order, and the actual duration of the sweep
+
+        Args:
+            settle: Optional array containing the measured settle time (s) of every point.
+        """
+        raster = self.predict(self.raster())
+        planned = self.predict()
+        text = (
+            f"Sweep order {self.strategy}: predicted step time {planned:.3f} s instead of {raster:.3f} s "
+            f"in raster order ({raster - planned:.3f} s saved)"
+        )
+        if self.elapsed is not None:
+            text += f", sweep took {self.elapsed:.2f} s"
+        if settle is not None and np.isfinite(settle).any():
+            text += f", measured settle time {np.nansum(settle):.3f} s"
+        return text
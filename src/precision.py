@@ -0,0 +1,181 @@
+""" Module containing the adaptive precision measurement of the Voltage / Current Accuracy tests.
+
+    The accuracy tests used to measure every point at the NPLC of Aperture, so a 100 NPLC run spends
+    seconds on every point even when the point is far inside the limits of the specification. The
+    AdaptivePrecision class below first screens every point at a low NPLC, with a small block of
+    readings whose spread gives the uncertainty of the screening. A point whose error, widened by that
+    uncertainty, is entirely inside or entirely outside the limits is decided by the screening. Only
+    ambiguous points, whose limit lies within the uncertainty, are measured again at the NPLC of
+    Aperture. The NPLC deciding every point is recorded in the NPLC column of the ResultBuffer.
+
+    The limits are computed by datatoGraph.evaluateLimits with the gain and offset passed to
+    scatterCompareVoltage / Current by the report, so that the verdict of the screening is the verdict
+    of the report.
+
+    Adaptive precision is enabled by the ScreenNPLC parameter of a DUT Test:
+        ScreenNPLC: Float containing the NPLC of the screening.
+        ScreenSamples: Optional integer containing the number of readings of the screening, 4 by default.
+        CoverageFactor: Optional float multiplying the standard error of the screening, 3 by default.
+        ScreenUncertainty: Optional float containing the smallest uncertainty of the screening, in the
+            unit of the measured quantity, 0 by default.
+
+"""
+
+import numpy as np
+
+from src.parallel import InstrumentExecutor
+
+
+class AdaptivePrecision(object):
+    """Screen the points at a low NPLC and confirm the ambiguous ones at the NPLC of Aperture
+
+    The Subsystem classes are passed in so that the measurement works with the library chosen by
+    the DriverRegistry of library/Registry.py. Every DMM of the point is switched together, since they
+    are read in parallel and the point takes as long as the slowest of them.
+
+    Attributes:
+        acquisitions: List of the BufferedAcquisition of every DMM read at every point.
+        judged: Integer containing the index in acquisitions of the DMM compared against the limits.
+        gain: Float containing the gain of the specification, as passed to evaluateLimits.
+        offset: Float containing the offset of the specification, as passed to evaluateLimits.
+        scale: Float converting the readings of the judged DMM to the unit of the setpoint.
+        screen: Float containing the NPLC of the screening.
+        precision: Float containing the NPLC of the confirmation.
+        screen_samples: Integer containing the number of readings of the screening.
+        coverage: Float multiplying the standard error of the screening.
+        floor: Float containing the smallest uncertainty of the screening.
+        confirmed: Integer counting the points measured again at the NPLC of the confirmation.
+        points: Integer counting the points measured.
+
+    """
+
+    def __init__(
+        self,
+        Measurand,
+        Sample,
+        acquisitions,
+        gain,
+        offset,
+        screen,
+        precision,
+        judged=0,
+        scale=1.0,
+        screen_samples=4,
+        coverage=3.0,
+        floor=0.0,
+        line_frequency=50,
+    ):
+        self.Measurand = Measurand
+        self.Sample = Sample
+        self.acquisitions = acquisitions
+        self.judged = judged
+        self.gain = float(gain)
+        self.offset = float(offset)
+        self.scale = float(scale)
+        self.screen = float(screen)
+        self.precision = float(precision)
+        self.screen_samples = max(2, int(screen_samples))
+        self.coverage = float(coverage)
+        self.floor = float(floor)
+        self.line_frequency = float(line_frequency)
+        # The confirmation uses the sample count the acquisitions were created with
+        self.samples = [acquisition.samples for acquisition in acquisitions]
+        self.confirmed = 0
+        self.points = 0
+
+    @classmethod
+    def fromDict(cls, dict, Measurand, Sample, acquisitions, gain, offset, judged=0, scale=1.0):
+        """Create the adaptive precision of the acquisitions if ScreenNPLC is given in a DUT Test
+
+        Args:
+            dict: Dictionary containing the parameters of the DUT Test.
+            Measurand: Subsystem class setting the NPLC of the measured function (Voltage or Current).
+            Sample: Sample Subsystem class of the library used.
+            acquisitions: List of the BufferedAcquisition of every DMM read at every point.
+            gain: Float containing the gain of the specification, as passed to evaluateLimits.
+            offset: Float containing the offset of the specification, as passed to evaluateLimits.
+            judged: Integer containing the index in acquisitions of the DMM compared against the limits.
+            scale: Float converting the readings of the judged DMM to the unit of the setpoint.
+
+        Returns:
+            Returns an AdaptivePrecision, or None if adaptive precision is not enabled.
+        """
+        if not dict.get("ScreenNPLC"):
+            return None
+
+        return cls(
+            Measurand,
+            Sample,
+            acquisitions,
+            gain,
+            offset,
+            dict["ScreenNPLC"],
+            dict["Aperture"],
+            judged=judged,
+            scale=scale,
+            screen_samples=dict.get("ScreenSamples", 4),
+            coverage=dict.get("CoverageFactor", 3.0),
+            floor=dict.get("ScreenUncertainty", 0.0),
+            line_frequency=dict.get("LineFrequency", 50),
+        )
+
+    def configure(self, nplc, samples):
+        """Set the NPLC and sample count of every DMM, unchanged settings are elided by the Session"""
+        integration = nplc / self.line_frequency
+        for acquisition, count in zip(self.acquisitions, samples):
+            self.Measurand(acquisition.VISA_ADDRESS).setNPLC(nplc)
+            self.Sample(acquisition.VISA_ADDRESS).setSampleCount(count)
+            acquisition.samples = count
+            acquisition.integration = integration
+            acquisition.wait.delay = count * acquisition.triggers * integration
+
+    def measure(self, setpoint, *tasks):
+        """Measure a point, screening it first and confirming it if its verdict is ambiguous
+
+        Args:
+            setpoint: Float containing the set value the judged reading is compared against.
+            *tasks: Callables of other Instruments (e.g. the PSU readback) run with the screening.
+
+        Returns:
+            Returns the list of the reading of every acquisition followed by the value of every task,
+            and the NPLC which decided the point.
+        """
+        self.points += 1
+        self.configure(self.screen, [self.screen_samples] * len(self.acquisitions))
+        values = InstrumentExecutor.run(*[acquisition.read for acquisition in self.acquisitions], *tasks)
+
+        judged = self.acquisitions[self.judged]
+        if not self.ambiguous(setpoint, values[self.judged] * self.scale, self.uncertainty(judged.last)):
+            return values, self.screen
+
+        self.confirmed += 1
+        self.configure(self.precision, self.samples)
+        readings = InstrumentExecutor.run(*[acquisition.read for acquisition in self.acquisitions])
+        return readings + values[len(self.acquisitions) :], self.precision
+
+    def uncertainty(self, readings):
+        """Uncertainty of the mean of the screening readings, in the unit of the setpoint"""
+        readings = np.asarray(readings, dtype=float) * self.scale
+        spread = readings.std(ddof=1) / np.sqrt(readings.size) if readings.size > 1 else 0.0
+        return max(self.coverage * spread, self.floor)
+
+    def ambiguous(self, setpoint, measured, uncertainty):
+        """Whether the limit of the specification lies within the uncertainty of the measured value
+
+        The limit of the percentage error is the one of datatoGraph.evaluateLimits.
+        """
+        from src.data import datatoGraph
+
+        if setpoint == 0:
+            return True
+
+        error = abs((setpoint - measured) / setpoint * 100)
+        limit = datatoGraph.evaluateLimits([setpoint], [error], self.gain, self.offset)[0][0]
+        margin = abs(uncertainty / setpoint * 100)
+        return error - margin <= limit <= error + margin
+
+    def summary(self):
+        return (
+            f"Adaptive precision: {self.points - self.confirmed} of {self.points} points decided at "
+            f"{self.screen:g} NPLC, {self.confirmed} confirmed at {self.precision:g} NPLC"
+        )
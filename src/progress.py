@@ -0,0 +1,90 @@
+""" Module containing the progress reporting of the DUT Tests.
+
+    The DUT Tests call their progress argument once for every completed point. Progress turns these
+    calls into the index of the point, its PASS / FAIL verdict against the specification and the
+    estimated time left, which are handed to a callback, e.g. the signal of the TestWorker in worker.py.
+    Once cancelled, the next call raises Cancelled, which stops the test between two points.
+
+"""
+
+from time import monotonic
+
+
+class Cancelled(Exception):
+    """Raised by Progress after the point completed when the test was cancelled"""
+
+
+class Progress(object):
+    """Callable reporting every completed point of a DUT Test
+
+    Attributes:
+        callback: Callable receiving index, total, info, data, verdict and eta of every point.
+        judge: Optional callable returning "PASS" or "FAIL" for the info and data of a point.
+        started: Float containing the time the test was started.
+        failures: Integer counting the points judged as "FAIL".
+        cancelled: Boolean determining if the test stops after the current point.
+
+    """
+
+    def __init__(self, callback, judge=None):
+        self.callback = callback
+        self.judge = judge
+        self.started = monotonic()
+        self.failures = 0
+        self.cancelled = False
+        # Points completed before the first report, e.g. reloaded from the journal of a resumed run
+        self.skipped = None
+
+    def __call__(self, index, total, info, data):
+        """Report the completion of a point
+
+        Args:
+            index: Integer containing the number of points completed so far.
+            total: Integer containing the number of points in the test.
+            info: List containing the programmed data of the point.
+            data: List containing the measured data of the point.
+
+        Raises:
+            Cancelled: The test was cancelled, the point has been reported.
+        """
+        if self.skipped is None:
+            self.skipped = index - 1
+        elapsed = monotonic() - self.started
+        eta = elapsed / (index - self.skipped) * (total - index)
+
+        verdict = ""
+        if self.judge is not None:
+            verdict = self.judge(info, data)
+            if verdict == "FAIL":
+                self.failures += 1
+
+        self.callback(index, total, info, data, verdict, eta)
+        if self.cancelled:
+            raise Cancelled(f"Test cancelled after point {index} of {total}")
+
+    def cancel(self):
+        self.cancelled = True
+
+    @staticmethod
+    def accuracy(gain, offset, column):
+        """Return a judge comparing the percentage error of a point against the specification
+
+        The verdict is the one of datatoGraph.evaluateLimits, used by scatterCompareVoltage / Current.
+
+        Args:
+            gain: Float containing the gain of the Programming Accuracy Specification.
+            offset: Float containing the offset of the Programming Accuracy Specification.
+            column: Integer containing the column of the set value in info and measured value in data,
+                0 for voltage and 1 for current.
+        """
+
+        def judge(info, data):
+            from src.data import datatoGraph
+
+            setpoint = float(info[column])
+            if setpoint == 0:
+                return ""
+            error = (setpoint - float(data[column])) / setpoint * 100
+            return str(datatoGraph.evaluateLimits([setpoint], [error], gain, offset)[1][0])
+
+        return judge
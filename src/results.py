@@ -0,0 +1,92 @@
+""" Module containing the result buffer of the Voltage / Current Accuracy tests.
+
+    The tests used to append a Python list for every point to infoList and dataList, which data.py then
+    transposed back into columns. The ResultBuffer instead preallocates one typed numpy array per column
+    from the number of points in the sweep. The test loops write every value straight into its column,
+    and data.py wraps the filled part of each column in a pandas Series without copying it.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ResultBuffer(object):
+    """Preallocated columnar store of the programmed and measured data of an accuracy test
+
+    Attributes:
+        capacity: Integer containing the number of points the buffer can hold.
+        size: Integer containing the number of points written so far.
+        columns: Dictionary mapping every column of SCHEMA to its numpy array.
+
+    """
+
+    # Programmed data (formerly infoList) followed by measured data (formerly dataList)
+    INFO = [("Vset", "f8"), ("Iset", "f8"), ("key", "i4"), ("Mode", "U7"), ("VIfix", "f8")]
+    DATA = [("Vmeasured", "f8"), ("Imeasured", "f8"), ("Vreadback", "f8"), ("Ireadback", "f8")]
+    # Settle time (s) of every point, NaN unless settling detection (settling.py) is enabled, and NPLC
+    # deciding every point, NaN unless adaptive precision (precision.py) is enabled
+    EXTRA = [("Settle", "f8"), ("NPLC", "f8")]
+    SCHEMA = INFO + DATA + EXTRA
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.size = 0
+        self.columns = {}
+        for name, dtype in self.SCHEMA:
+            if dtype == "f8":
+                self.columns[name] = np.full(self.capacity, np.nan)
+            else:
+                self.columns[name] = np.zeros(self.capacity, dtype=dtype)
+
+    @classmethod
+    def fromLists(cls, infoList, dataList):
+        """Create a buffer from the infoList / dataList rows used by the older scripts"""
+        results = cls(len(infoList))
+        for info, data in zip(infoList, dataList):
+            results.append(*info, *data)
+
+        return results
+
+    def append(self, *values):
+        """Write the next point, the values are given in the order of SCHEMA
+
+        Missing trailing values (e.g. readback of tests that do not measure it) are left as NaN.
+        """
+        if self.size >= self.capacity:
+            raise IndexError(f"ResultBuffer is full ({self.capacity} points)")
+
+        for (name, _), value in zip(self.SCHEMA, values):
+            self.columns[name][self.size] = value
+        self.size += 1
+
+    def set(self, k, **values):
+        """Write some columns of the point k"""
+        for name, value in values.items():
+            self.columns[name][k] = value
+
+    def reorder(self, order):
+        """Permute the points written so far, point n becomes the point order[n]"""
+        order = np.asarray(order)
+        for name, column in self.columns.items():
+            column[: self.size] = column[: self.size][order]
+
+    def column(self, name):
+        """Return the filled part of a column as a view, without copying it"""
+        return self.columns[name][: self.size]
+
+    def series(self, name):
+        return pd.Series(self.column(name), copy=False)
+
+    def info(self, k):
+        return [self.columns[name][k].item() for name, _ in self.INFO]
+
+    def data(self, k):
+        return [self.columns[name][k].item() for name, _ in self.DATA]
+
+    def row(self, k):
+        """Return every value of the point k in the order of SCHEMA, as taken by append"""
+        return [self.columns[name][k].item() for name, _ in self.SCHEMA]
+
+    def __len__(self):
+        return self.size
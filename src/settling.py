@@ -0,0 +1,196 @@
+""" Module containing the adaptive settling detection of the DUT output after a setpoint change.
+
+    The sweep loops used to rely on UpTime / DownTime, which only set the VISA timeout of the PSU and
+    do not wait at all, so an unsettled output had to be covered by a higher NPLC or extra sleeps at
+    every point. The Settling class below instead switches the DMM to a low NPLC and takes blocks of
+    quick readings right after the setpoint change, until the last readings agree within a tolerance
+    band. The DMM is then returned to its precision settings and the point is measured. A point that
+    settles quickly only pays for one block of quick readings, and the settle time of every point is
+    recorded in the Settle column of the ResultBuffer.
+
+    Settling is enabled by the SettlingBand parameter of a DUT Test:
+        SettlingBand: Float containing the tolerance band, in the unit of the measured quantity.
+        SettlingNPLC: Optional float containing the NPLC of the quick readings, 0.02 by default.
+        SettlingWindow: Optional integer containing the number of consecutive readings which have to
+            be within the band, 3 by default.
+        SettlingTimeout: Optional float containing the longest time (s) waited for a point, 1 s by default.
+
+"""
+
+from time import monotonic
+
+import numpy as np
+
+from library.IEEEStandard import TRG
+from src.sync import CompletionWait
+
+
+class Settling(object):
+    """Wait for the quantity measured by one DMM to settle within a band
+
+    The Subsystem classes are passed in so that the detection works with the library chosen by
+    the DriverRegistry of library/Registry.py.
+
+    Attributes:
+        VISA_ADDRESS: String containing the VISA Address of the DMM.
+        band: Float containing the largest spread of the last window readings of a settled output.
+        nplc: Float containing the NPLC of the quick readings.
+        precision: String or float containing the NPLC of the measurement, restored after settling.
+        window: Integer containing the number of readings within the band, also taken per trigger.
+        timeout: Float containing the longest time (s) waited for a single point.
+        scale: Float converting the readings to the unit of the band, e.g. 1 / shunt resistance.
+        samples: Integer containing the sample count of the measurement, restored after settling.
+        triggers: Integer containing the trigger count of the measurement, restored after settling.
+        binary: Boolean determining if the readings are transferred as REAL,64 binary blocks.
+        wait: CompletionWait used to detect that a block of quick readings has been acquired.
+        times: List containing the settle time (s) of every point.
+        unsettled: Integer counting the points which did not settle before the timeout.
+
+    """
+
+    def __init__(
+        self,
+        Measurand,
+        Trigger,
+        Sample,
+        Initiate,
+        Fetch,
+        VISA_ADDRESS,
+        band,
+        nplc=0.02,
+        precision=1,
+        window=3,
+        timeout=1.0,
+        scale=1.0,
+        samples=1,
+        triggers=1,
+        binary=False,
+        line_frequency=50,
+        wait=None,
+    ):
+        self.Measurand = Measurand
+        self.Trigger = Trigger
+        self.Sample = Sample
+        self.Initiate = Initiate
+        self.Fetch = Fetch
+        self.VISA_ADDRESS = VISA_ADDRESS
+        self.band = float(band)
+        self.nplc = float(nplc)
+        self.precision = precision
+        self.window = max(2, int(window))
+        self.timeout = float(timeout)
+        self.scale = float(scale)
+        self.samples = int(samples)
+        self.triggers = int(triggers)
+        self.binary = binary
+        self.integration = self.nplc / float(line_frequency)
+        self.wait = wait or CompletionWait(VISA_ADDRESS)
+        self.times = []
+        self.unsettled = 0
+
+    @classmethod
+    def fromDict(cls, dict, key, Measurand, Trigger, Sample, Initiate, Fetch, scale=1.0, acquisition=None):
+        """Create the settling detection of the DMM dict[key] if SettlingBand is given in a DUT Test
+
+        Args:
+            dict: Dictionary containing the parameters of the DUT Test.
+            key: String containing the key of the VISA Address of the DMM (e.g. "DMM_V").
+            Measurand: Subsystem class setting the NPLC of the measured function (Voltage or Current).
+            Trigger, Sample, Initiate, Fetch: Subsystem classes of the library used.
+            scale: Float converting the readings to the unit of SettlingBand.
+            acquisition: Optional BufferedAcquisition of the DMM, whose completion wait, sample count,
+                trigger count and transfer format are shared.
+
+        Returns:
+            Returns a Settling, or None if settling detection is not enabled.
+        """
+        if not dict.get("SettlingBand"):
+            return None
+
+        if acquisition is not None:
+            options = {
+                "samples": acquisition.samples,
+                "triggers": acquisition.triggers,
+                "binary": acquisition.binary,
+                "wait": acquisition.wait,
+            }
+        else:
+            options = {"wait": CompletionWait.fromDict(dict, key)}
+
+        return cls(
+            Measurand,
+            Trigger,
+            Sample,
+            Initiate,
+            Fetch,
+            dict[key],
+            dict["SettlingBand"],
+            nplc=dict.get("SettlingNPLC", 0.02),
+            precision=dict["Aperture"],
+            window=dict.get("SettlingWindow", 3),
+            timeout=dict.get("SettlingTimeout", 1.0),
+            scale=scale,
+            line_frequency=dict.get("LineFrequency", 50),
+            **options,
+        )
+
+    def settle(self):
+        """Take blocks of quick readings until the last window readings are within the band
+
+        The DMM is returned to the precision NPLC, sample count and trigger count afterwards, even if
+        the output did not settle before the timeout.
+
+        Returns:
+            Returns the settle time (s) of the point.
+        """
+        start = monotonic()
+        delay = self.wait.delay
+        history = np.empty(0)
+        settled = False
+
+        self.configure(self.nplc, self.window, 1)
+        self.wait.delay = self.window * self.integration
+        try:
+            while not settled and monotonic() - start < self.timeout:
+                history = np.append(history, self.acquire() * self.scale)[-self.window :]
+                settled = history.size == self.window and np.ptp(history) <= self.band
+        finally:
+            self.configure(self.precision, self.samples, self.triggers)
+            self.wait.delay = delay
+
+        elapsed = monotonic() - start
+        self.times.append(elapsed)
+        if not settled:
+            self.unsettled += 1
+            print(f"Output not settled within {self.band} after {elapsed:.3f} s: ", history)
+
+        return elapsed
+
+    def configure(self, nplc, samples, triggers):
+        self.Measurand(self.VISA_ADDRESS).setNPLC(nplc)
+        self.Sample(self.VISA_ADDRESS).setSampleCount(samples)
+        if self.triggers != 1:
+            self.Trigger(self.VISA_ADDRESS).setCount(triggers)
+
+    def acquire(self):
+        """Take one block of window quick readings"""
+        self.Initiate(self.VISA_ADDRESS).initiate()
+        self.wait.start()
+        TRG(self.VISA_ADDRESS)
+        self.wait.wait()
+
+        if self.binary:
+            return self.Fetch(self.VISA_ADDRESS).queryBinary("d", is_big_endian=True)
+
+        return np.array(self.Fetch(self.VISA_ADDRESS).query().split(","), dtype=float)
+
+    def summary(self):
+        """Text summary of the settle times of the points measured so far"""
+        if not self.times:
+            return "No point settled"
+
+        times = np.array(self.times)
+        return (
+            f"Settle time: mean {times.mean() * 1000:.1f} ms, max {times.max() * 1000:.1f} ms, "
+            f"total {times.sum():.2f} s, {self.unsettled} of {times.size} points not settled"
+        )
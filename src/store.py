@@ -0,0 +1,250 @@
+""" Module containing the local database of the results of every DUT Test run.
+
+    The csv files and Chart.png are overwritten by every run, and only the timestamped Excel report
+    survives. The ResultStore keeps every run in a SQLite database instead: one row per run in the
+    runs table, holding the DUT serial, test type, station, time, parameters, Instrument IDNs and the
+    pass/fail summary, and the points of the run in one points table per test type.
+
+    The runs table is indexed by DUT serial, test type and station together with the time, and the
+    points tables by run, so the query methods return DataFrames of thousands of runs in milliseconds.
+
+"""
+
+import datetime
+import json
+import os
+import re
+import socket
+import sqlite3
+
+import pandas as pd
+
+
+class ResultStore(object):
+    """SQLite database storing the points, parameters and summary of every DUT Test run
+
+    Attributes:
+        path: String containing the path of the database file.
+        connection: sqlite3 Connection to the database.
+
+    """
+
+    PATH = "results/results.db"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            time TEXT NOT NULL,
+            dut_serial TEXT,
+            test_type TEXT NOT NULL,
+            station TEXT,
+            points INTEGER,
+            failures INTEGER,
+            verdict TEXT,
+            config TEXT,
+            instruments TEXT
+        );
+        CREATE INDEX IF NOT EXISTS runs_serial ON runs (dut_serial, time);
+        CREATE INDEX IF NOT EXISTS runs_test_type ON runs (test_type, time);
+        CREATE INDEX IF NOT EXISTS runs_station ON runs (station, time);
+        CREATE INDEX IF NOT EXISTS runs_time ON runs (time);
+    """
+
+    # Columns containing the "PASS" / "FAIL" condition of the points
+    CONDITIONS = ("Measure", "Readback")
+
+    def __init__(self, path=PATH):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def table(test_type):
+        """Return the name of the points table of a test type, e.g. points_voltage_accuracy"""
+        return "points_" + re.sub(r"\W+", "_", test_type.lower()).strip("_")
+
+    @staticmethod
+    def serial(instruments):
+        """Return the serial number in the IDN of the first Instrument, which is the DUT"""
+        if instruments is None or len(instruments) == 0:
+            return None
+
+        fields = str(instruments.iloc[0, 0]).split(",")
+        return fields[2].strip() if len(fields) > 2 else None
+
+    @classmethod
+    def summary(cls, data):
+        """Count the failed points of a run
+
+        Conditions of points which were not measured ("N/A") neither fail nor pass a run.
+
+        Returns:
+            Returns the number of points with a "FAIL" condition and the verdict of the run, which is
+            empty if the data has no condition column or no point was judged.
+        """
+        columns = [column for column in cls.CONDITIONS if column in data.columns]
+        if not columns or not data[columns].isin(["PASS", "FAIL"]).any(axis=None):
+            return 0, ""
+
+        failures = int((data[columns] == "FAIL").any(axis=1).sum())
+        return failures, "FAIL" if failures else "PASS"
+
+    def record(self, test_type, data, config, instruments=None, serial=None, station=None, time=None):
+        """Store a run and its points
+
+        Args:
+            test_type: String containing the type of the DUT Test, e.g. "Voltage Accuracy".
+            data: DataFrame containing the points of the run.
+            config: Dictionary containing the parameters of the DUT Test.
+            instruments: Optional DataFrame containing the Instrument Data (instrumentData.data).
+            serial: String containing the serial number of the DUT, taken from config["DUT_Serial"]
+                or the IDN of the first Instrument if not given.
+            station: String containing the test station, taken from config["Station"] or the host name
+                if not given.
+            time: Optional datetime of the run, defaults to now.
+
+        Returns:
+            Returns the run_id of the stored run.
+        """
+        serial = serial or config.get("DUT_Serial") or self.serial(instruments)
+        station = station or config.get("Station") or socket.gethostname()
+        time = (time or datetime.datetime.now()).isoformat(sep=" ", timespec="seconds")
+        failures, verdict = self.summary(data)
+        idn = [] if instruments is None else instruments.iloc[:, 0].astype(str).tolist()
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (time, dut_serial, test_type, station, points, failures, verdict,"
+                " config, instruments) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time,
+                    serial,
+                    test_type,
+                    station,
+                    len(data),
+                    failures,
+                    verdict,
+                    json.dumps(config, default=str),
+                    json.dumps(idn),
+                ),
+            )
+            run_id = cursor.lastrowid
+
+            points = data.reset_index(drop=True)
+            points.insert(0, "point", points.index)
+            points.insert(0, "run_id", run_id)
+            self.appendPoints(self.table(test_type), points)
+
+        return run_id
+
+    def columns(self, table):
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info("{table}")')]
+
+    def exists(self, table):
+        return bool(self.columns(table))
+
+    def appendPoints(self, table, points):
+        """Append the points to their table, creating it or adding the columns it does not have yet"""
+        existing = self.columns(table)
+
+        if existing:
+            for column in points.columns:
+                if column not in existing:
+                    self.connection.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}"')
+            points.to_sql(table, self.connection, if_exists="append", index=False)
+        else:
+            points.to_sql(table, self.connection, index=False)
+            self.connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table}_run" ON "{table}" (run_id, point)'
+            )
+
+    def where(self, serial=None, test_type=None, station=None, since=None, until=None, verdict=None):
+        """Build the WHERE clause selecting runs, times are datetimes or "YYYY-MM-DD HH:MM:SS" strings"""
+        clauses = []
+        params = []
+        for column, operator, value in [
+            ("dut_serial", "=", serial),
+            ("test_type", "=", test_type),
+            ("station", "=", station),
+            ("time", ">=", since),
+            ("time", "<", until),
+            ("verdict", "=", verdict),
+        ]:
+            if value is not None:
+                if isinstance(value, datetime.datetime):
+                    value = value.isoformat(sep=" ", timespec="seconds")
+                clauses.append(f"runs.{column} {operator} ?")
+                params.append(value)
+
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def runs(self, **filters):
+        """Return the summary of the runs matching the filters of where(), ordered by time
+
+        The config and instruments columns are JSON strings, config(run_id) decodes them.
+        """
+        clause, params = self.where(**filters)
+        return pd.read_sql_query(
+            "SELECT * FROM runs" + clause + " ORDER BY time", self.connection, params=params
+        )
+
+    def points(self, run_id):
+        """Return the points of one run, or of a list of runs, together with their run_id"""
+        run_ids = [run_id] if isinstance(run_id, int) else list(run_id)
+        if not run_ids:
+            return pd.DataFrame()
+
+        marks = ",".join("?" * len(run_ids))
+        test_types = self.connection.execute(
+            f"SELECT DISTINCT test_type FROM runs WHERE run_id IN ({marks})", run_ids
+        ).fetchall()
+
+        frames = [
+            pd.read_sql_query(
+                f'SELECT * FROM "{self.table(test_type)}" WHERE run_id IN ({marks})'
+                " ORDER BY run_id, point",
+                self.connection,
+                params=run_ids,
+            )
+            for (test_type,) in test_types
+        ]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def trend(self, test_type, **filters):
+        """Return the points of every run of a test type matching the filters, with the serial,
+        station and time of their run, for trend and comparison between runs"""
+        if not self.exists(self.table(test_type)):
+            return pd.DataFrame()
+
+        clause, params = self.where(test_type=test_type, **filters)
+        return pd.read_sql_query(
+            "SELECT runs.dut_serial, runs.station, runs.time, points.*"
+            f' FROM runs JOIN "{self.table(test_type)}" AS points ON points.run_id = runs.run_id'
+            + clause
+            + " ORDER BY runs.time, points.point",
+            self.connection,
+            params=params,
+        )
+
+    def config(self, run_id):
+        """Return the parameters and Instrument IDNs of a run"""
+        row = self.connection.execute(
+            "SELECT config, instruments FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No run with run_id {run_id}")
+
+        return json.loads(row[0]), json.loads(row[1])
@@ -0,0 +1,107 @@
+""" Module containing the worker thread that runs the DUT Tests off the Qt event loop.
+
+    The DUT Tests block until every point has been measured, which used to freeze the GUI for the whole
+    sweep. The TestWorker runs a test in a QThread and streams each completed point back to the dialog
+    through Qt signals, which are delivered on the GUI thread.
+
+    A test can be cancelled, it then stops after the point being measured (see Progress) and the
+    outputs of the PSU and ELoad are switched off. Tests reporting no points run to the end.
+
+"""
+
+import weakref
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.progress import Cancelled, Progress
+
+
+class TestWorker(QThread):
+    """Thread executing a single DUT Test
+
+    Attributes:
+        function: The test method of DUT_Test.py, e.g. VoltageMeasurement.executeVoltageMeasurementA.
+        dialog: The dialog passed as self to the test method.
+        dict: Dictionary containing the parameters of the DUT Test.
+        progress: Progress called by the test after every point, or None if the test reports no points.
+
+    Signals:
+        point: Emitted for every point with index, total, info, data, verdict and eta (s).
+        completed: Emitted with the value returned by the test.
+        failed: Emitted with the error message if the test raised an exception.
+        cancelled: Emitted with a message once a cancelled test has stopped.
+
+    """
+
+    point = pyqtSignal(int, int, list, list, str, float)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal(str)
+    # Every worker created by the process, e.g. by the dialogs
+    workers = weakref.WeakSet()
+    # Keys of the VISA Addresses of the Instruments in the dictionary of a test
+    INSTRUMENTS = ("PSU", "ELoad", "DMM", "DMM_V", "DMM_I", "OSC")
+
+    def __init__(self, function, dialog, dict, judge=None, progress=True):
+        super().__init__()
+        self.function = function
+        self.dialog = dialog
+        self.dict = dict
+        self.progress = Progress(self.emitPoint, judge) if progress else None
+        self.workers.add(self)
+
+    @classmethod
+    def anyRunning(cls):
+        """Whether a test of any dialog is running, even of a dialog that was closed"""
+        return any(worker.isRunning() for worker in list(cls.workers))
+
+    def emitPoint(self, index, total, info, data, verdict, eta):
+        self.point.emit(index, total, list(info), list(data), verdict, eta)
+
+    def cancel(self):
+        """Stop the test after the current point, returns whether the test can be stopped before its end"""
+        if self.progress is None:
+            return False
+
+        self.progress.cancel()
+        return True
+
+    def outputsOff(self):
+        """Switch off the outputs left on by a test stopped in the middle of its sweep"""
+        from library.Registry import DriverRegistry
+
+        Output = DriverRegistry.get(self.dict["Instrument"]).get("Output")
+        try:
+            Output(self.dict["PSU"]).setOutputState("OFF")
+            Output(self.dict["ELoad"]).setOutputStateC("OFF", self.dict["ELoad_Channel"])
+        except Exception as e:
+            print(e)
+
+    def run(self):
+        try:
+            if self.progress is None:
+                result = self.function(self.dialog, self.dict)
+            else:
+                result = self.function(self.dialog, self.dict, progress=self.progress)
+        except Cancelled as e:
+            self.outputsOff()
+            self.cancelled.emit(str(e))
+            return
+        except Exception as e:
+            print(e)
+            self.failed.emit(str(e))
+            return
+        finally:
+            self.shutdown()
+
+        self.completed.emit(result)
+
+    def shutdown(self):
+        """Stop the threads the AsyncSession started for the Instruments of this test
+
+        Only the Instruments of this test are concerned, the test of another dialog may be initializing
+        its own Instruments at the same time.
+        """
+        from library.AsyncSession import AsyncSession
+
+        AsyncSession.shutdown(*(self.dict[key] for key in self.INSTRUMENTS if key in self.dict))
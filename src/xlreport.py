@@ -1,14 +1,28 @@
+""" Module generating the Excel reports of the DUT Tests.
+
+    The reports are written with an openpyxl write-only workbook: the rows of the worksheet are
+    streamed to the file as they are generated instead of being kept as cell objects, the cells share
+    named styles registered once in the workbook, and column widths and conditional formatting are
+    applied to whole ranges. The time taken therefore scales with the size of the data written.
+
+"""
+
+import math
+
 import openpyxl
-from openpyxl.styles import Alignment, PatternFill, Font
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.compat.numbers import NUMERIC_TYPES
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
 from openpyxl.formatting.rule import FormulaRule
-import pandas as pd
+from openpyxl.utils import get_column_letter
 import datetime
 
 
-class xlreport(object):
-    """The class is used to generate the excel report for programming voltage and
-    current accuracy tests.
+class xlstream(object):
+    """Base class of the Excel reports, streaming blocks of DataFrames into a worksheet
 
+    A block is a DataFrame placed with its header at (startrow, startcol), counted from 0 like
+    DataFrame.to_excel, and written with one of the named styles registered by styles().
 
     """
 
@@ -34,210 +48,192 @@ class xlreport(object):
             + ".xlsx"
         )
 
-    def adjustcolumnWidth(self, worksheet, value):
-        """To adjust the column width from column A to I
+    def styles(self, wb):
+        """Register the named styles shared by every cell of the report"""
+        thin = Side(style="thin")
+        header = NamedStyle(name="header")
+        header.font = Font(bold=True)
+        header.alignment = Alignment(horizontal="center")
+        header.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+        for style in [
+            header,
+            NamedStyle(name="center", alignment=Alignment(horizontal="center")),
+            NamedStyle(name="left", alignment=Alignment(horizontal="left")),
+        ]:
+            wb.add_named_style(style)
+
+    def value(self, value):
+        """Convert a value of a DataFrame to a value accepted by an Excel cell, like DataFrame.to_excel"""
+        if isinstance(value, float):
+            if math.isnan(value):
+                return None
+            if math.isinf(value):
+                return "inf" if value > 0 else "-inf"
+        elif value is not None and not isinstance(value, (str, datetime.datetime) + NUMERIC_TYPES):
+            return str(value)
+        return value
+
+    def blockRows(self, startrow, startcol, df, style):
+        """Yield (row, column, values, style) for the header and every row of a block, 1-based"""
+        yield startrow + 1, startcol + 1, list(df.columns), "header"
+        for row, values in enumerate(df.itertuples(index=False, name=None), startrow + 2):
+            yield row, startcol + 1, [self.value(value) for value in values], style
+
+    def rows(self, ws, blocks, cells):
+        """Yield the rows of the worksheet, merging the blocks and the single cells row by row
 
         Args:
-            worksheet: string specifying which worksheet the column width to be changed.
-            value: integer specifiying the width value to be changed to.
+            ws: Write-only worksheet the cells are created for.
+            blocks: List of (startrow, startcol, DataFrame, style).
+            cells: Dictionary mapping (row, column), 1-based, to a value written without style.
         """
-        for x in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K","L","M","N","O","P","Q","R","S","T","U","V", "W", "X", "Y", "Z"]:
-            worksheet.column_dimensions[x].width = value
+        pending = {}
+        for block in blocks:
+            for row, column, values, style in self.blockRows(*block):
+                pending.setdefault(row, []).append((column, values, style))
+        for (row, column), value in cells.items():
+            pending.setdefault(row, []).append((column, [value], None))
+
+        # The named style is resolved once, and its style array shared by every cell using it since
+        # write-only cells are serialized as soon as their row is appended
+        shared = {}
+        for name in ["header", "center", "left"]:
+            template = WriteOnlyCell(ws)
+            template.style = name
+            shared[name] = template._style
+
+        for row in range(1, max(pending, default=0) + 1):
+            line = []
+            for column, values, style in sorted(pending.pop(row, []), key=lambda part: part[0]):
+                line.extend([None] * (column - 1 - len(line)))
+                if style is None:
+                    line.extend(values)
+                    continue
+
+                for value in values:
+                    if value is None:
+                        line.append(value)
+                    else:
+                        cell = WriteOnlyCell(ws, value)
+                        cell._style = shared[style]
+                        line.append(cell)
+            yield line
+
+    def highlight(self, ws, cellref):
+        """Conditional Formatting to set Font and Colour of the range depending on the condition"""
+        ws.conditional_formatting.add(
+            cellref,
+            FormulaRule(
+                formula=[f'NOT(ISERROR(SEARCH("PASS",{cellref})))'],
+                stopIfTrue=True,
+                fill=self.green_fill,
+                font=self.green_font,
+            ),
+        )
+        ws.conditional_formatting.add(
+            cellref,
+            FormulaRule(
+                formula=[f'NOT(ISERROR(SEARCH("FAIL",{cellref})))'],
+                stopIfTrue=True,
+                fill=self.red_fill,
+                font=self.red_font,
+            ),
+        )
 
-    def alignCell(self, worksheet, row_number, column_number, style):
-        """To change the alignment in cells
+    def write(self, blocks, cells, width, columns, conditions=(), image=None):
+        """Stream the blocks into the Data worksheet and save the workbook
 
         Args:
-            worksheet: string specifying the worksheet where the cells will be aligned.
-            row_number: integer specifying the row in the worksheet the cell to be aligned is in.
-            column_number: integer specifying the column in the worksheet the cell to be aligned is in.
-            style: string specifying the type of alignment the cell should be in.
+            blocks: List of (startrow, startcol, DataFrame, style).
+            cells: Dictionary mapping (row, column) to a single value.
+            width: Integer containing the width of the columns.
+            columns: Integer containing the number of columns from A whose width is set.
+            conditions: List of (startrow, startcol, DataFrame, column) whose column contains a condition.
+            image: Optional path of an image anchored at X1, or right of the widest block if it is wider.
         """
-        currentCell = worksheet.cell(row=row_number, column=column_number)
-        currentCell.alignment = Alignment(horizontal=style)
-
-    def alignAll(self, worksheet, start_row, end_row, start_col, end_col, style):
-
-        for row in range(start_row, end_row + 1):
-            for col in range(start_col, end_col + 1):
-                currentCell = worksheet.cell(row=row, column=col)
-                currentCell.alignment = Alignment(horizontal=style)
-
-    def run(self):
-        """Function to execute the generate of the excel sheet
-
-        The function begins by improrting dataframes from csv files generated from
-        data.py. These dataframes will be labeled and placed at a specific position in the
-        excel report. The graph generated will also be imported into the excel report
-
-
-        """
-        with pd.ExcelWriter(self.path, engine="openpyxl") as writer:
-            df1 = pd.read_csv("csv/error.csv", index_col=False)
-            df2 = pd.read_csv(
-                "csv/instrumentData.csv",
-                index_col=False,
-            )
-
-            df4 = pd.read_csv("csv/config.csv")
-            df1.to_excel(writer, sheet_name="Data", index=False, startrow=7, startcol=3)
-            df2.to_excel(writer, sheet_name="Data", index=False)
-            df4.to_excel(writer, sheet_name="Data", index=False, startrow=7)
-            wb = writer.book
-            ws = wb["Data"]
-            cellref = "U9:U" + str(ws.max_row)
-            cellref2 = "W9:W" + str(ws.max_row)
-
-            # Conditional Formatting to set Font and Colour of Cell depending on boolList
-            ws.conditional_formatting.add(
-                cellref,
-                FormulaRule(
-                    formula=[f'NOT(ISERROR(SEARCH("PASS",{cellref})))'],
-                    stopIfTrue=True,
-                    fill=self.green_fill,
-                    font=self.green_font,
-                ),
-            )
-            ws.conditional_formatting.add(
-                cellref,
-                FormulaRule(
-                    formula=[f'NOT(ISERROR(SEARCH("FAIL",{cellref})))'],
-                    stopIfTrue=True,
-                    fill=self.red_fill,
-                    font=self.red_font,
-                ),
-            )
-            ws.conditional_formatting.add(
-                cellref2,
-                FormulaRule(
-                    formula=[f'NOT(ISERROR(SEARCH("PASS",{cellref2})))'],
-                    stopIfTrue=True,
-                    fill=self.green_fill,
-                    font=self.green_font,
-                ),
-            )
-            ws.conditional_formatting.add(
-                cellref2,
-                FormulaRule(
-                    formula=[f'NOT(ISERROR(SEARCH("FAIL",{cellref2})))'],
-                    stopIfTrue=True,
-                    fill=self.red_fill,
-                    font=self.red_font,
-                ),
-            )
-
-            self.adjustcolumnWidth(ws, 16)
-            self.alignCell(ws, 1, 1, "left")
-            self.alignCell(ws, 2, 1, "left")
-            self.alignCell(ws, 3, 1, "left")
-            self.alignCell(ws, 4, 1, "left")
-
-            self.alignAll(ws, 8, 200, 4, 200, "center")
-
-            ws.cell(row=7, column=4).value = "Time Generated: "
-            ws.cell(row=7, column=5).value = datetime.datetime.now().strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
-
-            # Inserting graph of test into excel report
-            img = openpyxl.drawing.image.Image("images/Chart.png")
-            img.anchor = "X1"
+        wb = openpyxl.Workbook(write_only=True)
+        self.styles(wb)
+        ws = wb.create_sheet("Data")
+
+        # Column widths and conditional formatting have to be set before the rows are streamed
+        for column in range(1, columns + 1):
+            ws.column_dimensions[get_column_letter(column)].width = width
+
+        for startrow, startcol, df, column in conditions:
+            if column in df.columns and len(df):
+                letter = get_column_letter(startcol + 1 + df.columns.get_loc(column))
+                self.highlight(ws, f"{letter}{startrow + 2}:{letter}{startrow + 1 + len(df)}")
+
+        if image is not None:
+            img = openpyxl.drawing.image.Image(image)
+            last = max(startcol + len(df.columns) for startrow, startcol, df, style in blocks)
+            img.anchor = get_column_letter(max(24, last + 1)) + "1"
             ws.add_image(img)
 
-            wb.save(self.path)
+        for line in self.rows(ws, blocks, cells):
+            ws.append(line)
 
+        wb.save(self.path)
 
-class xlreport_Regulation(object):
-    """The class is used to generate the excel report for load regulation tests.
+
+class xlreport(xlstream):
+    """The class is used to generate the excel report for programming voltage and
+    current accuracy tests.
 
 
     """
 
-    def __init__(self):
-        """ "Initialize certain parameter for the excel sheet such as font, colour
-        fill, the path where the excel path is also generated here.
+    def run(self, df1, df2, df4):
+        """Function to execute the generate of the excel sheet
 
-        Excel files are generated in excel_output Folder in this repository.
+        The function takes the dataframes generated by data.py. These dataframes will be
+        labeled and placed at a specific position in the excel report. The graph generated
+        will also be imported into the excel report
 
+        Args:
+            df1: DataFrame containing the data and conditions of the test (datatoGraph.error).
+            df2: DataFrame containing the Instrument Data (instrumentData.data).
+            df4: DataFrame containing the parameters of the test (configData.data).
 
         """
-        self.red_font = Font(size=14, bold=True, color="ffffff")
-        self.red_fill = PatternFill(
-            start_color="ffcccc", end_color="ffcccc", fill_type="solid"
+        self.write(
+            blocks=[(7, 3, df1, "center"), (0, 0, df2, "left"), (7, 0, df4, None)],
+            cells={
+                (7, 4): "Time Generated: ",
+                (7, 5): datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            },
+            width=16,
+            columns=26,
+            conditions=[(7, 3, df1, "Measure"), (7, 3, df1, "Readback")],
+            image="images/Chart.png",
         )
-        self.green_font = Font(size=14, bold=True, color="013220")
-        self.green_fill = PatternFill(
-            start_color="FFAAFF00", end_color="FFAAFF00", fill_type="solid"
-        )
-        self.path = (
-            r"excel_output//"
-            + datetime.datetime.now().strftime("%Y-%m-%d--%H-%M-%S")
-            + ".xlsx"
-        )
-    
-    def adjustcolumnWidth(self, worksheet, value):
-        """To adjust the column width from column A to I
 
-        Args:
-            worksheet: string specifying which worksheet the column width to be changed.
-            value: integer specifiying the width value to be changed to.
-        """
-        for x in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M"]:
-            worksheet.column_dimensions[x].width = value
 
-    def alignCell(self, worksheet, row_number, column_number, style):
-        """To change the alignment in cells
+class xlreport_Regulation(xlstream):
+    """The class is used to generate the excel report for load regulation tests.
 
-        Args:
-            worksheet: string specifying the worksheet where the cells will be aligned.
-            row_number: integer specifying the row in the worksheet the cell to be aligned is in.
-            column_number: integer specifying the column in the worksheet the cell to be aligned is in.
-            style: string specifying the type of alignment the cell should be in.
-        """
-        currentCell = worksheet.cell(row=row_number, column=column_number)
-        currentCell.alignment = Alignment(horizontal=style)
 
-    def alignAll(self, worksheet, start_row, end_row, start_col, end_col, style):
-            
-            for row in range(start_row, end_row + 1):
-                for col in range(start_col, end_col + 1):
-                    currentCell = worksheet.cell(row=row, column=col)
-                    currentCell.alignment = Alignment(horizontal=style)
+    """
 
-    def run(self):
+    def run(self, df1, df2, df4):
         """Function to execute the generate of the excel sheet
 
-        The function begins by improrting dataframes from csv files generated from
-        data.py. These dataframes will be labeled and placed at a specific position in the
-        excel report. The graph generated will also be imported into the excel report
+        The function takes the dataframes generated by data.py. These dataframes will be
+        labeled and placed at a specific position in the excel report.
 
+        Args:
+            df1: DataFrame containing the data of the test (datatoCSV_Regulation.data).
+            df2: DataFrame containing the Instrument Data (instrumentData.data).
+            df4: DataFrame containing the parameters of the test (configData.data).
 
         """
-        with pd.ExcelWriter(self.path, engine="openpyxl") as writer:
-            df1 = pd.read_csv("csv/data.csv", index_col=False)
-            df2 = pd.read_csv(
-                "csv/instrumentData.csv",
-                index_col=False,
-            )
-
-            df4 = pd.read_csv("csv/config.csv")
-            df1.to_excel(writer, sheet_name="Data", index=False, startrow=7, startcol=3)
-            df2.to_excel(writer, sheet_name="Data", index=False)
-            df4.to_excel(writer, sheet_name="Data", index=False, startrow=7)
-            wb = writer.book
-            ws = wb["Data"]
-
-            self.adjustcolumnWidth(ws, 20)
-            self.alignCell(ws, 1, 1, "left")
-            self.alignCell(ws, 2, 1, "left")
-            self.alignCell(ws, 3, 1, "left")
-            self.alignCell(ws, 4, 1, "left")
-
-            self.alignAll(ws, 8, 200, 4, 200, "center")
-
-            ws.cell(row=7, column=4).value = "Time Generated: "
-            ws.cell(row=7, column=5).value = datetime.datetime.now().strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
-
-            wb.save(self.path)
+        self.write(
+            blocks=[(7, 3, df1, "center"), (0, 0, df2, "left"), (7, 0, df4, None)],
+            cells={
+                (7, 4): "Time Generated: ",
+                (7, 5): datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            },
+            width=20,
+            columns=13,
+        )
@@ -0,0 +1,9 @@
+"""Configuration of the pytest tests, which run against the simulated Instruments of library/Simulator.py"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Scripts for the real Instruments, which are run by hand
+collect_ignore = ["test.py", "test_script.py"]
@@ -0,0 +1,142 @@
+"""Tests of the shadow register of the Sessions of library/SessionPool.py against the simulated Instruments"""
+
+import pyvisa
+import pytest
+
+from library.SessionPool import SessionPool
+
+BENCH = {
+    "Instrument": "Keysight",
+    "PSU": "USB0::PSU::INSTR",
+    "ELoad": "USB0::LOAD::INSTR",
+    "DMM_V": "USB0::DMMV::INSTR",
+    "DMM_I": "USB0::DMMI::INSTR",
+    "PSU_Channel": 1,
+    "ELoad_Channel": 1,
+    "shuntResistance": 0.01,
+}
+
+
+@pytest.fixture
+def bench():
+    SessionPool.closeAll()
+    SessionPool.visa_library = "@simulator"
+    SessionPool.resourceManager().wire(BENCH)
+    yield BENCH
+    SessionPool.closeAll()
+    SessionPool.visa_library = ""
+
+
+def sent(instr, *commands):
+    """Number of the commands which reached the simulated Instrument"""
+    before = instr.resource.transactions
+    for command in commands:
+        instr.write(command)
+    return instr.resource.transactions - before
+
+
+def test_repeated_setting_is_elided(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    assert sent(dmm, "VOLT:NPLC 10", "VOLT:NPLC 10") == 1
+    assert dmm.elided == 1
+    assert sent(dmm, "VOLT:NPLC 1") == 1
+
+
+def test_commands_without_value_are_always_sent(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    assert sent(dmm, "INIT", "INIT", "*TRG", "*TRG") == 4
+
+
+def test_aliases_share_a_key(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    assert sent(dmm, "SENS:VOLT:DC:NPLC 10", "VOLT:NPLC 10") == 1
+
+
+def test_fixed_range_forgets_auto_range(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    # Range=Auto run, fixed range run, Range=Auto run on the same Session
+    assert sent(dmm, "CONF:VOLT:DC", "VOLT:RANG:AUTO ON") == 2
+    assert sent(dmm, "CONF:VOLT:DC", "VOLT:RANG 10") == 1
+    assert sent(dmm, "CONF:VOLT:DC", "VOLT:RANG:AUTO ON") == 1
+    assert sent(dmm, "VOLT:RANG 10") == 1
+
+
+def test_aperture_forgets_nplc(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    assert sent(dmm, "VOLT:NPLC 10", "VOLT:APER 0.1", "VOLT:NPLC 10") == 3
+
+
+def test_changed_configure_clears_the_shadow(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    assert sent(dmm, "CONF:VOLT:DC", "VOLT:NPLC 10", "CONF:VOLT:DC") == 2
+    assert sent(dmm, "CONF:CURR:DC", "VOLT:NPLC 10") == 2
+
+
+@pytest.mark.parametrize("reset", ["*RST", "*RCL 1", "SYST:PRES"])
+def test_reset_clears_the_shadow(bench, reset):
+    psu = SessionPool.open(bench["PSU"])
+    assert sent(psu, "VOLT 5,(@1)", reset, "VOLT 5,(@1)") == 3
+
+
+def test_apply_shadows_voltage_and_current(bench):
+    psu = SessionPool.open(bench["PSU"])
+    assert sent(psu, "APPL CH1,5,1", "APPL CH1,5,1", "VOLT 5,(@1)") == 1
+    assert sent(psu, "APPL CH1,6,1") == 1
+
+
+def test_measure_keeps_the_setpoints(bench):
+    psu = SessionPool.open(bench["PSU"])
+    sent(psu, "VOLT 5", "VOLT:RANG 10")
+    psu.query("MEAS:VOLT?")
+    # The setpoint stays shadowed, the measurement settings of the function are forgotten
+    assert sent(psu, "VOLT 5") == 0
+    assert sent(psu, "VOLT:RANG 10") == 1
+
+
+def test_visa_error_clears_the_shadow(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    sent(dmm, "VOLT:NPLC 10")
+    with pytest.raises(pyvisa.Error):
+        dmm.query("NOT:A:HEADER?")
+    assert sent(dmm, "VOLT:NPLC 10") == 1
+
+
+def test_invalidate_clears_one_instrument(bench):
+    dmm = SessionPool.open(bench["DMM_V"])
+    psu = SessionPool.open(bench["PSU"])
+    sent(dmm, "VOLT:NPLC 10")
+    sent(psu, "VOLT 5,(@1)")
+    SessionPool.invalidate(bench["DMM_V"])
+    assert sent(dmm, "VOLT:NPLC 10") == 1
+    assert sent(psu, "VOLT 5,(@1)") == 0
+
+
+def test_every_test_starts_with_an_empty_shadow(bench):
+    from src.DUT_Test import VisaResourceManager
+
+    psu = SessionPool.open(bench["PSU"])
+    sent(psu, "VOLT 5,(@1)")
+    VisaResourceManager().openRM(bench["PSU"])
+    assert sent(psu, "VOLT 5,(@1)") == 1
+
+
+def test_list_sweep_clears_the_shadow(bench):
+    from src.listsweep import ListSweep
+
+    dict = {**bench, "Aperture": "0.02", "UpTime": "1"}
+    psu = SessionPool.open(bench["PSU"])
+    load = SessionPool.open(bench["ELoad"])
+    sent(psu, "VOLT 1,(@1)")
+    sent(load, "CURR 0.5,(@1)")
+    ListSweep(dict, "VOLT", "CURR").run([1.0, 2.0], [0.5, 0.5])
+    # The outputs are left at the last step of the lists, the setpoints are written again
+    assert sent(psu, "VOLT 1,(@1)") == 1
+    assert sent(load, "CURR 0.5,(@1)") == 1
+
+
+def test_shadowing_can_be_disabled(bench, monkeypatch):
+    from library.SessionPool import Session
+
+    monkeypatch.setattr(Session, "shadowing", False)
+    dmm = SessionPool.open(bench["DMM_V"])
+    assert sent(dmm, "VOLT:NPLC 10", "VOLT:NPLC 10") == 2